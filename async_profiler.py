@@ -0,0 +1,311 @@
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Label of the row being worked on, copied into to_thread calls by asyncio
+_label = contextvars.ContextVar("profile_label", default=None)
+
+
+def _is_idle(frame) -> bool:
+    """True when the loop thread is parked in the selector waiting for I/O."""
+    code = frame.f_code
+    return code.co_name in ("select", "poll", "control") and code.co_filename.endswith("selectors.py")
+
+
+class _LabelingExecutor(ThreadPoolExecutor):
+    """Default executor that records which row each worker thread serves."""
+
+    def __init__(self, profiler, **kwargs):
+        super().__init__(**kwargs)
+        self._profiler = profiler
+
+    def submit(self, fn, /, *args, **kwargs):
+        label = _label.get()
+        threads = self._profiler.thread_labels
+
+        def run():
+            ident = threading.get_ident()
+            threads[ident] = label or "worker threads"
+            cpu = time.thread_time()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                threads.pop(ident, None)
+                self._profiler.add_thread_cpu(label or "worker threads", time.thread_time() - cpu)
+
+        return super().submit(run)
+
+
+class AsyncProfiler:
+    """Sampling profiler for the scraper's event loop.
+
+    A background thread samples the loop thread and the executor threads
+    every ``interval`` seconds. Each sample is charged to the row whose
+    coroutine (or ``to_thread`` call) was running, set with :meth:`label`.
+    Loop samples are CPU (or blocking I/O) on the event loop. Thread CPU is
+    measured exactly around every ``to_thread`` call, and wall time per row
+    comes from :meth:`row_done`. A heartbeat coroutine detects loop stalls
+    longer than ``stall_threshold`` and keeps the stack that was blocking.
+    :meth:`write` saves a speedscope file with one flamegraph per row plus a
+    JSON list of the stalls.
+    """
+
+    def __init__(self, interval: float = 0.005, stall_threshold: float = 0.1):
+        self.interval = interval
+        self.stall_threshold = stall_threshold
+        self.thread_labels = {}
+        self.task_labels = {}
+        self.walls = {}
+        self.thread_cpu = Counter()
+        self._lock = threading.Lock()
+        self.stalls = []
+        self._frames = []
+        self._frame_index = {}
+        self._samples = defaultdict(Counter)
+        self._loop_seconds = Counter()
+        self._thread_seconds = Counter()
+        self._stop = threading.Event()
+        self._pending_stall = None
+        self._beat = None
+        self._loop = None
+        self._loop_thread = None
+        self._sampler = None
+        self._executor = None
+        self._previous_executor = None
+        self._heartbeat_task = None
+        self._started = None
+        self._cpu_started = None
+        self.duration = 0.0
+        self.cpu_time = 0.0
+
+    # -- control ---------------------------------------------------------
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        # asyncio has no getter; the loop creates its executor lazily (None)
+        self._previous_executor = getattr(self._loop, "_default_executor", None)
+        self._executor = _LabelingExecutor(self)
+        self._loop.set_default_executor(self._executor)
+        self._loop.set_task_factory(self._task_factory)
+        self._started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self._beat = time.perf_counter()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._sampler = threading.Thread(target=self._sample_loop, name="async-profiler", daemon=True)
+        self._sampler.start()
+
+    async def stop(self) -> None:
+        self._loop.set_task_factory(None)
+        if self._executor is not None and self._loop._default_executor is self._executor:
+            # Later runs on this loop (daemon mode) must not report to this profiler
+            self._loop._default_executor = self._previous_executor
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._stop.set()
+        if self._heartbeat_task:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+        if self._sampler:
+            self._sampler.join()
+        self.duration = time.perf_counter() - self._started
+        self.cpu_time = time.process_time() - self._cpu_started
+
+    def label(self, text: str) -> None:
+        """Charge the current task (and its to_thread calls) to ``text``."""
+        _label.set(text)
+        task = asyncio.current_task()
+        if task is not None:
+            self.task_labels[task] = text
+
+    def _task_factory(self, loop, coro, **kwargs):
+        # Tasks spawned by a row (e.g. by asyncio.wait_for) inherit its label
+        task = asyncio.Task(coro, loop=loop, **kwargs)
+        label = _label.get()
+        if label:
+            self.task_labels[task] = label
+            task.add_done_callback(lambda t: self.task_labels.pop(t, None))
+        return task
+
+    def row_done(self, text: str, wall: float) -> None:
+        self.walls[text] = self.walls.get(text, 0.0) + wall
+
+    def add_thread_cpu(self, text: str, seconds: float) -> None:
+        with self._lock:
+            self.thread_cpu[text] += seconds
+
+    # -- sampling --------------------------------------------------------
+    async def _heartbeat(self) -> None:
+        tick = 0.02
+        while True:
+            self._beat = time.perf_counter()
+            await asyncio.sleep(tick)
+            lag = time.perf_counter() - self._beat - tick
+            if lag >= self.stall_threshold:
+                self._finish_stall(lag)
+
+    def _finish_stall(self, lag: float) -> None:
+        pending, self._pending_stall = self._pending_stall, None
+        stack, label = pending if pending else ([], None)
+        blocker = self._blocking_site(stack)
+        self.stalls.append(
+            {
+                "seconds": round(lag, 4),
+                "row": label,
+                "blocking": blocker,
+                "stack": [self._describe(i) for i in stack],
+            }
+        )
+        logger.warning(
+            "🐢 Event loop blocked for %.0f ms in %s (%s)",
+            lag * 1000,
+            blocker or "unknown code",
+            label or "no row",
+        )
+
+    def _sample_loop(self) -> None:
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            weight, last = now - last, now
+            frames = sys._current_frames()
+            loop_frame = frames.get(self._loop_thread)
+            if loop_frame is not None and not _is_idle(loop_frame):
+                task = asyncio.current_task(self._loop)
+                label = self.task_labels.get(task) or "event loop"
+                stack = self._stack(loop_frame)
+                self._samples[label][stack] += weight
+                self._loop_seconds[label] += weight
+                stalled = now - self._beat > 0.02 + self.stall_threshold
+                if stalled and self._pending_stall is None:
+                    self._pending_stall = (stack, label)
+            for ident, label in list(self.thread_labels.items()):
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = self._stack(frame)
+                self._samples[f"{label} [threads]"][stack] += weight
+                self._thread_seconds[label] += weight
+
+    def _stack(self, frame) -> tuple:
+        """Return the frame indices of a stack, outermost first."""
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            key = (code.co_name, code.co_filename, code.co_firstlineno)
+            index = self._frame_index.get(key)
+            if index is None:
+                index = self._frame_index[key] = len(self._frames)
+                self._frames.append(key)
+            stack.append(index)
+            frame = frame.f_back
+        return tuple(reversed(stack))
+
+    def _describe(self, index: int) -> str:
+        name, filename, line = self._frames[index]
+        return f"{name} ({os.path.basename(filename)}:{line})"
+
+    def _blocking_site(self, stack) -> Optional[str]:
+        """Innermost project frame of the running callback, i.e. the call that blocked."""
+        start = 0
+        for pos, index in enumerate(stack):
+            name, filename, _ = self._frames[index]
+            if name == "_run" and filename.endswith(os.path.join("asyncio", "events.py")):
+                start = pos + 1
+        callback = stack[start:]
+        for index in reversed(callback):
+            _, filename, _ = self._frames[index]
+            if filename.startswith(PROJECT_DIR) and "site-packages" not in filename:
+                return self._describe(index)
+        return self._describe(callback[-1]) if callback else None
+
+    # -- reporting -------------------------------------------------------
+    def speedscope(self, name: str) -> dict:
+        profiles = []
+        for label, stacks in sorted(self._samples.items()):
+            total = sum(stacks.values())
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": label,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": total,
+                    "samples": [list(stack) for stack in stacks],
+                    "weights": list(stacks.values()),
+                }
+            )
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": name,
+            "exporter": "async_profiler.py",
+            "activeProfileIndex": 0,
+            "shared": {
+                "frames": [
+                    {"name": n, "file": f, "line": line} for n, f, line in self._frames
+                ]
+            },
+            "profiles": profiles,
+        }
+
+    def write(self, path: str) -> str:
+        """Write ``path`` (speedscope) and ``<path>.stalls.json``; returns ``path``."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump(self.speedscope(os.path.basename(path)), fh)
+        with open(f"{path}.stalls.json", "w", encoding="utf-8") as fh:
+            json.dump(
+                {"summary": self.summary(), "stalls": self.stalls},
+                fh,
+                indent=1,
+            )
+        return path
+
+    def summary(self, top: int = 10) -> dict:
+        rows = sorted(
+            set(self.walls) | set(self._loop_seconds) | set(self._thread_seconds),
+            key=lambda label: self._loop_seconds[label] + self._thread_seconds[label],
+            reverse=True,
+        )
+        blockers = Counter()
+        for stall in self.stalls:
+            blockers[stall["blocking"] or "unknown"] += stall["seconds"]
+        return {
+            "duration": round(self.duration, 3),
+            "cpu_time": round(self.cpu_time, 3),
+            "loop_busy": round(sum(self._loop_seconds.values()), 3),
+            "stall_count": len(self.stalls),
+            "stall_seconds": round(sum(s["seconds"] for s in self.stalls), 3),
+            "top_rows": [
+                {
+                    "row": label,
+                    "wall": round(self.walls.get(label, 0.0), 3),
+                    "loop": round(self._loop_seconds[label], 3),
+                    "threads": round(self._thread_seconds[label], 3),
+                    "thread_cpu": round(self.thread_cpu[label], 3),
+                }
+                for label in rows[:top]
+            ],
+            "top_blockers": [
+                {"site": site, "seconds": round(seconds, 3)}
+                for site, seconds in blockers.most_common(top)
+            ],
+        }
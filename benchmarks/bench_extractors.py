@@ -0,0 +1,416 @@
+"""Offline benchmarks for the pure-HTML price extractors.
+
+Every extractor listed in ``fixtures/manifest.json`` is run against its saved
+vendor pages and against "rendered" copies of those pages inflated to a few
+megabytes. For each pair the benchmark records throughput, peak and retained
+memory and whether the expected price was returned. ``--allocations`` adds a
+separate tracemalloc pass, after the timings, that counts live allocation
+blocks near the peak and names the lines allocating the most. Reports are
+JSON files keyed by git commit so runs can be compared across changes.
+
+Usage::
+
+    python benchmarks/bench_extractors.py run [--large-mb 2,8] [--compare OLD.json] [--allocations]
+    python benchmarks/bench_extractors.py compare OLD.json NEW.json
+    python benchmarks/bench_extractors.py record URL --expected 24.99 --extractor menards_price_from_html
+
+Only ``record`` touches the network; ``run`` and ``compare`` refuse any
+outgoing connection.
+"""
+
+import argparse
+import datetime
+import gzip
+import importlib.util
+import json
+import logging
+import platform
+import re
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from urllib.parse import urlparse
+
+BENCH_DIR = Path(__file__).resolve().parent
+ROOT = BENCH_DIR.parent
+FIXTURES_DIR = BENCH_DIR / "fixtures"
+MANIFEST = FIXTURES_DIR / "manifest.json"
+RESULTS_DIR = BENCH_DIR / "results"
+
+sys.path.insert(0, str(ROOT))
+
+
+def load_scraper():
+    """Import scraper-v1.0.py, whose file name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location("scraper_v1", ROOT / "scraper-v1.0.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_extractors():
+    """Return a mapping of extractor name to a callable taking raw page text."""
+    scraper = load_scraper()
+    import northern_tool_scraper
+    import selenium_scrapy_grainger
+
+    extractors = {
+        name: getattr(scraper, name)
+        for name in (
+            "menards_price_from_html",
+            "zoro_price_from_html",
+            "grainger_price_from_html",
+            "msc_price_from_html",
+            "caster_depot_price_from_html",
+            "script_price_scan",
+            "initial_state_price_scan",
+            "bs_price_scan",
+        )
+    }
+    # The Northern Tool parser works on the decoded XHR body, so decoding is
+    # part of the measured work just as ``resp.json()`` is in production.
+    extractors["northern_tool_scraper.parse_price"] = (
+        lambda text: northern_tool_scraper.parse_price(json.loads(text))
+    )
+    extractors["selenium_scrapy_grainger.extract_price"] = selenium_scrapy_grainger.extract_price
+    # The scraper configures INFO logging on import; keep benchmark output clean.
+    logging.getLogger().setLevel(logging.WARNING)
+    return extractors
+
+
+# === FIXTURES ===
+def read_fixture(path):
+    """Return the text of a fixture, transparently decompressing ``.gz`` files."""
+    if path.suffix == ".gz":
+        with gzip.open(path, "rt", encoding="utf-8") as fh:
+            return fh.read()
+    return path.read_text(encoding="utf-8")
+
+
+def load_manifest():
+    with open(MANIFEST, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _filler_block(i):
+    """Return one chunk of markup typical of a fully rendered product page."""
+    return (
+        f'<li class="mega-menu-item"><a href="/c/category-{i}">Category {i}</a>'
+        f'<ul><li><a href="/c/category-{i}/sub-{i % 7}">Subcategory {i % 7}</a></li>'
+        f'<li><a href="/c/category-{i}/sub-{i % 11}">Subcategory {i % 11}</a></li></ul></li>'
+        f'<div class="rec-card" data-sku="SKU{i:06d}"><img src="/img/{i}.jpg" alt="Item {i}">'
+        f'<span class="rec-title">Related caster {i}</span>'
+        f'<span class="rec-rating" aria-label="{i % 5}.{i % 10} out of 5"></span></div>'
+        f'<script>window.__analytics = window.__analytics || [];'
+        f'window.__analytics.push({{"slot": {i}, "impression": "rec-{i}", "v": {i % 97}}});</script>\n'
+    )
+
+
+def inflate(html, target_bytes):
+    """Pad ``html`` with rendered-page markup after the product content."""
+    if len(html) >= target_bytes:
+        return html
+    blocks = []
+    size = len(html)
+    i = 0
+    while size < target_bytes:
+        block = _filler_block(i)
+        blocks.append(block)
+        size += len(block)
+        i += 1
+    filler = '<section class="rendered-chrome"><ul>' + "".join(blocks) + "</ul></section>"
+    idx = html.rfind("</body>")
+    if idx == -1:
+        return html + filler
+    return html[:idx] + filler + html[idx:]
+
+
+def iter_cases(manifest, large_sizes):
+    """Yield ``(fixture_label, extractor_name, text, expected)`` tuples."""
+    for entry in manifest:
+        path = FIXTURES_DIR / entry["file"]
+        text = read_fixture(path)
+        variants = [(entry["file"], text)]
+        if path.name.endswith((".html", ".html.gz")):
+            for mb in large_sizes:
+                variants.append((f"{entry['file']}@{mb:g}MB", inflate(text, int(mb * 1024 * 1024))))
+        for label, body in variants:
+            for name in entry["extractors"]:
+                yield label, name, body, entry["expected"]
+
+
+# === MEASUREMENT ===
+def block_network():
+    """Make any attempt to open a network connection fail loudly."""
+
+    def refuse(*args, **kwargs):
+        raise RuntimeError("network access is disabled while benchmarking")
+
+    socket.socket.connect = refuse
+    socket.socket.connect_ex = refuse
+    socket.getaddrinfo = refuse
+    socket.create_connection = refuse
+
+
+def price_value(text):
+    """Return the numeric value of a price string such as ``$1,234.56``."""
+    if text is None:
+        return None
+    digits = re.sub(r"[^\d.,]", "", str(text))
+    if "," in digits and "." not in digits and len(digits.rsplit(",", 1)[1]) == 2:
+        digits = digits.replace(",", ".")
+    digits = digits.replace(",", "")
+    try:
+        return Decimal(digits)
+    except InvalidOperation:
+        return None
+
+
+def measure(fn, text, min_time, min_iterations):
+    """Return timing and memory figures for ``fn(text)``."""
+    result = fn(text)  # warm-up; also primes regex and parser caches
+
+    iterations = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while iterations < min_iterations or elapsed < min_time:
+        fn(text)
+        iterations += 1
+        elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    fn(text)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "result": result,
+        "iterations": iterations,
+        "pages_per_s": iterations / elapsed,
+        "mean_ms": elapsed / iterations * 1000,
+        "peak_kib": (peak - before) / 1024,
+        "retained_kib": (after - before) / 1024,
+    }
+
+
+def allocation_stats(fn, text, top=3):
+    """Return live allocation blocks near the peak of ``fn(text)`` and the top sites.
+
+    A profile hook snapshots traced memory whenever it reaches a new high at a
+    function return, so this slows the call down a lot and is kept out of
+    :func:`measure`.
+    """
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ]
+    tracemalloc.start()
+    baseline = tracemalloc.take_snapshot()
+    high = {"size": 0, "snapshot": None}
+
+    def on_return(frame, event, arg):
+        if event != "return":
+            return
+        current, _ = tracemalloc.get_traced_memory()
+        # Only a clearly higher mark is worth another snapshot
+        if current > high["size"] * 1.1 + 65536:
+            high["size"] = current
+            high["snapshot"] = tracemalloc.take_snapshot()
+
+    sys.setprofile(on_return)
+    try:
+        fn(text)
+    finally:
+        sys.setprofile(None)
+    final = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    diff = (high["snapshot"] or final).filter_traces(ignore).compare_to(baseline, "lineno")
+    sites = sorted((s for s in diff if s.size_diff > 0), key=lambda s: s.size_diff, reverse=True)
+    return {
+        "blocks_at_peak": sum(s.count_diff for s in diff if s.count_diff > 0),
+        "top_allocations": [
+            {
+                "site": f"{Path(s.traceback[0].filename).name}:{s.traceback[0].lineno}",
+                "kib": s.size_diff / 1024,
+                "blocks": s.count_diff,
+            }
+            for s in sites[:top]
+        ],
+    }
+
+
+def git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def run_benchmarks(large_sizes, min_time, min_iterations, only=None, allocations=False):
+    """Run every manifest case and return the report dictionary."""
+    extractors = load_extractors()
+    block_network()
+    results = []
+    for label, name, text, expected in iter_cases(load_manifest(), large_sizes):
+        if only and not re.search(only, f"{name} {label}"):
+            continue
+        stats = measure(extractors[name], text, min_time, min_iterations)
+        if allocations:
+            stats.update(allocation_stats(extractors[name], text))
+        ok = price_value(stats["result"]) == price_value(expected)
+        results.append(
+            {
+                "extractor": name,
+                "fixture": label,
+                "bytes": len(text.encode("utf-8")),
+                "expected": expected,
+                "got": stats.pop("result"),
+                "ok": ok,
+                **stats,
+            }
+        )
+        print(
+            f"{'ok  ' if ok else 'FAIL'} {name:40} {label:48} "
+            f"{results[-1]['pages_per_s']:10.1f} pages/s "
+            f"{results[-1]['peak_kib']:10.1f} KiB peak"
+            + (f" {results[-1]['blocks_at_peak']:9d} blocks" if allocations else "")
+        )
+    return {
+        "commit": git_commit(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+
+
+# === REPORTS ===
+def compare_reports(old, new, threshold):
+    """Print a comparison table and return the number of regressions."""
+    old_index = {(r["extractor"], r["fixture"]): r for r in old["results"]}
+    regressions = 0
+    print(f"{'extractor':40} {'fixture':48} {'pages/s':>22} {'peak KiB':>22}")
+    for row in new["results"]:
+        key = (row["extractor"], row["fixture"])
+        base = old_index.get(key)
+        if not base:
+            print(f"{key[0]:40} {key[1]:48} {'(new)':>22}")
+            continue
+        speed = row["pages_per_s"] / base["pages_per_s"] - 1
+        mem = (row["peak_kib"] - base["peak_kib"]) / max(base["peak_kib"], 1)
+        flags = []
+        if speed < -threshold:
+            flags.append("SLOWER")
+        if mem > threshold:
+            flags.append("MORE-MEMORY")
+        if base["ok"] and not row["ok"]:
+            flags.append("WRONG-PRICE")
+        regressions += bool(flags)
+        print(
+            f"{key[0]:40} {key[1]:48} "
+            f"{base['pages_per_s']:9.1f} -> {row['pages_per_s']:9.1f} "
+            f"{base['peak_kib']:9.1f} -> {row['peak_kib']:9.1f} "
+            f"{speed:+7.1%} {' '.join(flags)}"
+        )
+    print(f"\n{old['commit']} -> {new['commit']}: {regressions} regression(s)")
+    return regressions
+
+
+def record_fixture(url, expected, extractors, name=None):
+    """Save a live page as a gzip fixture and register it in the manifest."""
+    import requests
+
+    resp = requests.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=30)
+    resp.raise_for_status()
+    domain = urlparse(url).netloc.lower().removeprefix("www.").split(".")[0]
+    slug = name or re.sub(r"[^a-z0-9]+", "-", urlparse(url).path.lower()).strip("-")[-60:]
+    rel = f"{domain}/{slug}.html.gz"
+    path = FIXTURES_DIR / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as fh:
+        fh.write(resp.text)
+    manifest = load_manifest()
+    manifest = [e for e in manifest if e["file"] != rel]
+    manifest.append({"file": rel, "expected": expected, "extractors": extractors})
+    with open(MANIFEST, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2)
+        fh.write("\n")
+    print(f"Recorded {url} -> {rel} ({len(resp.content)} bytes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the HTML price extractors")
+    sub = parser.add_subparsers(dest="command")
+
+    run = sub.add_parser("run", help="Run the benchmark suite (default)")
+    run.add_argument("--large-mb", default="2", help="Comma-separated sizes of inflated rendered pages")
+    run.add_argument("--min-time", type=float, default=0.5, help="Minimum seconds timed per case")
+    run.add_argument("--min-iterations", type=int, default=1, help="Minimum timed calls per case")
+    run.add_argument("--only", help="Regex filter on 'extractor fixture'")
+    run.add_argument("--output", help="Report path (default benchmarks/results/<commit>.json)")
+    run.add_argument("--compare", help="Baseline report to compare against")
+    run.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    run.add_argument(
+        "--allocations",
+        action="store_true",
+        help="Also count allocation blocks and top allocating lines (separate, slow pass)",
+    )
+
+    cmp_ = sub.add_parser("compare", help="Compare two saved reports")
+    cmp_.add_argument("old")
+    cmp_.add_argument("new")
+    cmp_.add_argument("--threshold", type=float, default=0.10)
+
+    rec = sub.add_parser("record", help="Save a live page as a new fixture")
+    rec.add_argument("url")
+    rec.add_argument("--expected", required=True, help="Price the extractors should return")
+    rec.add_argument("--extractor", action="append", required=True, dest="extractors")
+    rec.add_argument("--name", help="Fixture file name (without extension)")
+
+    args = parser.parse_args(sys.argv[1:] or ["run"])
+
+    if args.command == "record":
+        record_fixture(args.url, args.expected, args.extractors, args.name)
+        return 0
+
+    if args.command == "compare":
+        with open(args.old, encoding="utf-8") as fh:
+            old = json.load(fh)
+        with open(args.new, encoding="utf-8") as fh:
+            new = json.load(fh)
+        return 1 if compare_reports(old, new, args.threshold) else 0
+
+    large_sizes = [float(s) for s in args.large_mb.split(",") if s.strip()]
+    report = run_benchmarks(
+        large_sizes, args.min_time, args.min_iterations, args.only, args.allocations
+    )
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nReport written to {output}")
+
+    failures = sum(not r["ok"] for r in report["results"])
+    status = 1 if failures else 0
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            status |= 1 if compare_reports(json.load(fh), report, args.threshold) else 0
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
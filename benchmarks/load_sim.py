@@ -0,0 +1,838 @@
+"""End-to-end load simulator for ``scrape_all``.
+
+A synthetic Caster Links sheet of any size is scraped by the real scraper
+against local mock vendor sites, at increasing concurrency levels. The mock
+sites serve the saved pages from ``fixtures/`` with a per-product price, so
+the real handlers run unchanged: the Menards ``#itemFinalPrice`` element,
+WooCommerce amounts and the Store API catalog, the Magento price-box, the
+Northern Tool WCS price XHR and the Harbor Freight DY JSON. Latency, error
+and block rates are configurable. ScraperAPI and Apify are mocked as proxy
+providers, and a fake Sheets backend stands in for Google Sheets.
+
+Each level runs in a fresh worker process with its own strategy memo. Both
+the browser (``BROWSER_PROXY``) and ``requests`` (``HTTP_PROXY``) talk to
+the mock server as a forward proxy. Hosts get a ``.loadsim.test`` suffix so
+nothing can leak to the real sites. The report gives rows per minute,
+accuracy, peak memory of the worker and its browser, and event-loop lag.
+
+Usage::
+
+    python benchmarks/load_sim.py run --rows 500 --concurrency 2,4,8,16
+    python benchmarks/load_sim.py run --rows 5000 --latency 0.3 --block-rate 0.05
+    python benchmarks/load_sim.py serve --port 8899 --rows 500
+    python benchmarks/load_sim.py sheet --rows 500 --output sheet.csv
+"""
+
+import argparse
+import asyncio
+import csv
+import datetime
+import json
+import logging
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from bench_extractors import (
+    FIXTURES_DIR,
+    RESULTS_DIR,
+    git_commit,
+    load_scraper,
+    price_value,
+    read_fixture,
+)
+
+SUFFIX = ".loadsim.test"
+GENERIC_SHOPS = 20
+DEFAULT_MIX = (
+    "menards=2,grainger=1,zoro=1,msc=1,casterdepot=1,"
+    "castercity=1,northerntool=1,harborfreight=1,generic=2"
+)
+
+# vendor -> (host, URL path for a product id, regex recovering the id)
+VENDORS = {
+    "menards": ("www.menards.com", "/main/hardware/casters/sim-caster/p-{id}.htm", r"/p-(\d+)\.htm"),
+    "grainger": ("www.grainger.com", "/product/SIM-{id}", r"/product/SIM-(\d+)"),
+    "zoro": ("www.zoro.com", "/sim-caster/i/G{id}/", r"/i/G(\d+)"),
+    "msc": ("www.mscdirect.com", "/product/details/{id}", r"/product/details/(\d+)"),
+    "casterdepot": ("www.casterdepot.com", "/sim-caster-{id}.html", r"/sim-caster-(\d+)\.html"),
+    "castercity": ("castercity.com", "/product/sim-caster-{id}/", r"/product/sim-caster-(\d+)"),
+    "northerntool": ("www.northerntool.com", "/products/sim-caster-{part}", r"/products/sim-caster-(\d{7})"),
+    "harborfreight": ("www.harborfreight.com", "/sim-caster-{id}.html", r"/sim-caster-(\d+)\.html"),
+    "generic": ("shop{shop}", "/products/{id}", r"/products/(\d+)"),
+}
+HOST_VENDORS = {host: vendor for vendor, (host, _, _) in VENDORS.items()}
+
+# Saved page per vendor and the price strings in it that get replaced
+TEMPLATES = {
+    "menards": ("menards/pneumatic-swivel-caster.html", ["24.99"]),
+    "grainger": ("grainger/bulk-container.html", ["312.85"]),
+    "zoro": ("zoro/casters-swivel-plate.html", ["58.47"]),
+    "msc": ("msc/rigid-caster.html", ["41.17"]),
+    "casterdepot": ("casterdepot/polyurethane-swivel.html", ["86.50", '"86.5"']),
+    "castercity": ("castercity/8-swivel-pneumatic.html", ["32.95"]),
+    "generic": ("generic/shop-product.html", ["19.45"]),
+}
+NT_PRICE_TEMPLATE = "northerntool/wcs-price.json"
+NT_PART_BASE = 1000000
+NT_PAGE = """<!DOCTYPE html>
+<html><head><title>Sim Caster {part} | Northern Tool</title></head>
+<body><h1>Sim Caster {part}</h1><div class="price" id="price"></div>
+<script>
+fetch("/wcs/resources/store/6970/price?q=byPartNumbers&profileName=IBM_Store_EntitledPrice_RangePrice_All&currency=USD&partNumber={part}")
+  .then(function (r) {{ return r.json(); }})
+  .then(function (d) {{
+    var p = d.EntitledPrice[0].UnitPrice[0].price.value;
+    document.getElementById("price").textContent = "$" + p;
+  }});
+</script></body></html>
+"""
+BLOCK_PAGE = """<!DOCTYPE html>
+<html><head><title>Just a moment...</title></head>
+<body><div id="challenge-running">Checking if the site connection is secure</div>
+<div class="cf-browser-verification">Enable JavaScript and cookies to continue</div>
+<script src="/cdn-cgi/challenge-platform/h/g/orchestrate/jsch/v1"></script>
+</body></html>
+"""
+
+# Mock scraping services: host -> provider name
+PROVIDERS = {"api.scraperapi.com": "scraperapi", "proxy.apify.com": "apify"}
+# Real hosts the scraper reaches through module constants, mapped to mocks
+DY_HOST = "st.dynamicyield.com"
+
+
+def sim_host(host):
+    return f"{host}{SUFFIX}"
+
+
+def sim_price(product_id):
+    """Deterministic price for a product id, shared by the mocks and the grader."""
+    cents = 500 + (product_id * 7919) % 99500
+    return f"{cents // 100}.{cents % 100:02d}"
+
+
+def product_url(vendor, product_id):
+    host, path, _ = VENDORS[vendor]
+    host = host.format(shop=product_id % GENERIC_SHOPS)
+    path = path.format(id=product_id, part=NT_PART_BASE + product_id)
+    return f"http://{sim_host(host)}{path}"
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in VENDORS:
+            raise ValueError(f"Unknown vendor {name!r}; choose from {', '.join(VENDORS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# === SYNTHETIC SHEETS ===
+def synthetic_rows(count, mix, duplicates=0.0, seed=0):
+    """Return ``(rows, expected)`` for a Caster Links sheet of ``count`` rows.
+
+    Rows are ``[vendor, url, selector, notes]``. A ``duplicates`` fraction
+    repeats an earlier product, sometimes with a tracking parameter, so the
+    single-flight path is exercised as it would be on a real sheet.
+    """
+    rng = random.Random(seed)
+    vendors = list(mix)
+    weights = [mix[v] for v in vendors]
+    rows, expected = [], []
+    for idx in range(count):
+        if rows and rng.random() < duplicates:
+            source = rng.randrange(len(rows))
+            vendor, url = rows[source][0], rows[source][1]
+            if "?" not in url and rng.random() < 0.5:
+                url += "?utm_source=sheet"
+            rows.append([vendor, url, "", ""])
+            expected.append(expected[source])
+            continue
+        vendor = rng.choices(vendors, weights)[0]
+        product_id = idx + 1
+        rows.append([vendor, product_url(vendor, product_id), "", ""])
+        expected.append(f"${sim_price(product_id)}")
+    return rows, expected
+
+
+class FakeSheets:
+    """In-memory stand-in for the Sheets v4 client used by the scraper.
+
+    Supports the ``spreadsheets().values().get/update/append().execute()``
+    calls with simple A1 ranges. Every call sleeps ``latency`` seconds.
+    """
+
+    def __init__(self, tabs, latency=0.0):
+        self.tabs = tabs
+        self.latency = latency
+        self.calls = Counter()
+
+    def spreadsheets(self):
+        return self
+
+    def values(self):
+        return self
+
+    def get(self, spreadsheetId, range):
+        return _SheetCall(self, "get", range)
+
+    def update(self, spreadsheetId, range, valueInputOption, body):
+        return _SheetCall(self, "update", range, body["values"])
+
+    def append(self, spreadsheetId, range, valueInputOption, insertDataOption, body):
+        return _SheetCall(self, "append", range, body["values"])
+
+    @staticmethod
+    def _column(letters, default):
+        if not letters:
+            return default
+        col = 0
+        for ch in letters:
+            col = col * 26 + ord(ch) - 64
+        return col - 1
+
+    def _range(self, a1):
+        if "!" not in a1:
+            a1 += "!A1"  # a bare tab name covers the whole tab
+        tab, _, cells = a1.rpartition("!")
+        match = re.fullmatch(r"([A-Z]*)(\d*)(?::([A-Z]*)(\d*))?", cells)
+        c1, r1, c2, r2 = match.groups()
+        return (
+            self.tabs.setdefault(tab, []),
+            int(r1 or 1) - 1,
+            None if r2 is None or r2 == "" else int(r2) - 1,
+            self._column(c1, 0),
+            None if c2 is None else self._column(c2, None),
+        )
+
+    def execute(self, op, a1, values):
+        time.sleep(self.latency)
+        self.calls[op] += 1
+        grid, r1, r2, c1, c2 = self._range(a1)
+        if op == "get":
+            rows = [
+                row[c1 : None if c2 is None else c2 + 1]
+                for row in grid[r1 : None if r2 is None else r2 + 1]
+            ]
+            while rows and not any(rows[-1]):
+                rows.pop()
+            return {"values": rows} if rows else {}
+        if op == "append":
+            grid.extend(list(row) for row in values)
+            return {}
+        for offset, row in enumerate(values):
+            while len(grid) <= r1 + offset:
+                grid.append([])
+            target = grid[r1 + offset]
+            target.extend([""] * (c1 + len(row) - len(target)))
+            target[c1 : c1 + len(row)] = row
+        return {}
+
+
+class _SheetCall:
+    def __init__(self, sheets, op, a1, values=None):
+        self._args = (sheets, op, a1, values)
+
+    def execute(self):
+        sheets, op, a1, values = self._args
+        return sheets.execute(op, a1, values)
+
+
+def sheet_tabs(rows, links_tab, error_tab):
+    """Return fake Sheets tabs holding ``rows`` in columns B:E."""
+    header = ["", "Vendor", "URL", "Selector", "Notes"]
+    return {links_tab: [header] + [[""] + row for row in rows], error_tab: []}
+
+
+# === MOCK SERVERS ===
+class MockWeb:
+    """Responses of every mock site, with injected latency, errors and blocks."""
+
+    def __init__(self, latency=0.2, error_rate=0.0, block_rate=0.0,
+                 proxy_latency=0.5, proxy_error_rate=0.0, catalog_size=1000, seed=0,
+                 provider_concurrency=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.block_rate = block_rate
+        self.proxy_latency = proxy_latency
+        self.proxy_error_rate = proxy_error_rate
+        self.provider_concurrency = provider_concurrency
+        self.in_flight = Counter()
+        self.catalog_size = catalog_size
+        self.stats = Counter()
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._pages = {}
+        for vendor, (fixture, tokens) in TEMPLATES.items():
+            self._pages[vendor] = (read_fixture(FIXTURES_DIR / fixture), tokens)
+        self._nt_price = read_fixture(FIXTURES_DIR / NT_PRICE_TEMPLATE)
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def reset_stats(self):
+        with self._lock:
+            stats, self.stats = dict(self.stats), Counter()
+        return stats
+
+    def _roll(self):
+        with self._lock:
+            return self._rng.random()
+
+    def _sleep(self, mean):
+        if mean > 0:
+            time.sleep(mean * (0.5 + self._roll()))
+
+    def respond(self, url):
+        """Return ``(status, content_type, body, headers)`` for ``url``."""
+        parts = urlsplit(url)
+        host = (parts.hostname or "").lower()
+        if host in PROVIDERS:
+            return self._provider(PROVIDERS[host], parts)
+        if not host.endswith(SUFFIX):
+            self.count("refused")
+            return 502, "text/plain", "load simulator only serves *.loadsim.test hosts", {}
+        host = host[: -len(SUFFIX)]
+        vendor = HOST_VENDORS.get(host) or ("generic" if host.startswith("shop") else None)
+        if host == DY_HOST:
+            vendor = "harborfreight"
+        self._sleep(self.latency)
+        roll = self._roll()
+        if roll < self.block_rate:
+            self.count(f"{vendor}:blocked")
+            return 403, "text/html", BLOCK_PAGE, {"Server": "cloudflare", "cf-mitigated": "challenge"}
+        if roll < self.block_rate + self.error_rate:
+            self.count(f"{vendor}:error")
+            return 503, "text/html", "<h1>503 Service Unavailable</h1>", {}
+        body = self._vendor(vendor, host, parts)
+        if body is None:
+            self.count(f"{vendor}:404")
+            return 404, "text/html", "<h1>Not found</h1>", {}
+        self.count(f"{vendor}:ok")
+        return body
+
+    def _vendor(self, vendor, host, parts):
+        path = parts.path
+        if host == DY_HOST:
+            ctx = json.loads(unquote(parse_qs(parts.query).get("ctx", ["{}"])[0]) or "{}")
+            ids = ctx.get("data") or []
+            if not ids or not ids[0].isdigit():
+                return None
+            data = {"feedProperties": {"price": sim_price(int(ids[0]))}}
+            return 200, "application/json", json.dumps(data), {}
+        if vendor == "northerntool" and path.startswith("/wcs/resources/store/6970/price"):
+            part = parse_qs(parts.query).get("partNumber", [""])[0]
+            if not part.isdigit():
+                return None
+            body = self._nt_price.replace("89.99", sim_price(int(part) - NT_PART_BASE))
+            return 200, "application/json", body.replace("4863671", part), {}
+        if vendor == "castercity" and path.startswith("/wp-json/wc/store/v1/products"):
+            return self._store_api(parse_qs(parts.query))
+        if vendor is None:
+            return None
+        match = re.search(VENDORS[vendor][2], path)
+        if not match:
+            return None
+        if vendor == "northerntool":
+            return 200, "text/html", NT_PAGE.format(part=match.group(1)), {}
+        if vendor == "harborfreight":
+            return 200, "text/html", f"<html><body><h1>Sim caster {match.group(1)}</h1></body></html>", {}
+        page, tokens = self._pages[vendor]
+        price = sim_price(int(match.group(1)))
+        for token in tokens:
+            page = page.replace(token, f'"{price}"' if token.startswith('"') else price)
+        return 200, "text/html", page, {}
+
+    def _store_api(self, query):
+        per_page = int(query.get("per_page", ["10"])[0])
+        page = int(query.get("page", ["1"])[0])
+        pages = max(1, -(-self.catalog_size // per_page))
+        first = (page - 1) * per_page + 1
+        items = [
+            {
+                "id": product_id,
+                "slug": f"sim-caster-{product_id}",
+                "permalink": product_url("castercity", product_id),
+                "prices": {
+                    "price": sim_price(product_id).replace(".", ""),
+                    "currency_minor_unit": 2,
+                    "currency_prefix": "$",
+                },
+            }
+            for product_id in range(first, min(first + per_page, self.catalog_size + 1))
+        ]
+        return 200, "application/json", json.dumps(items), {"X-WP-TotalPages": str(pages)}
+
+    def _provider(self, name, parts):
+        query = parse_qs(parts.query)
+        target = query.get("url", [""])[0]
+        render = query.get("render", ["false"])[0] == "true"
+        with self._lock:
+            # Plan limit on concurrent requests, enforced like the real APIs
+            if self.provider_concurrency and self.in_flight[name] >= self.provider_concurrency:
+                self.stats[f"{name}:429"] += 1
+                return 429, "text/plain", "Too many concurrent requests", {"Retry-After": "1"}
+            self.in_flight[name] += 1
+        try:
+            # Rendering costs the provider a browser session
+            self._sleep(self.proxy_latency * (3 if render else 1))
+            if self._roll() < self.proxy_error_rate:
+                self.count(f"{name}:error")
+                return 500, "text/plain", "Request failed, please retry", {}
+            self.count(f"{name}:{'render' if render else 'plain'}")
+            return self.respond(target)
+        finally:
+            with self._lock:
+                self.in_flight[name] -= 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Forward-proxy style handler; absolute request URLs pick the mock site."""
+
+    protocol_version = "HTTP/1.1"
+    web = None
+
+    def do_GET(self):
+        url = self.path
+        if not urlsplit(url).netloc:
+            url = f"http://{self.headers.get('Host', '')}{url}"
+        status, content_type, body, headers = self.web.respond(url)
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_CONNECT(self):
+        # No TLS tunnels: every simulated URL is plain HTTP
+        self.web.count("refused")
+        self.send_response(502)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Every browser page and worker thread may connect at once
+    request_queue_size = 512
+
+
+class MockServer:
+    """Run :class:`MockWeb` on a local port in background threads."""
+
+    def __init__(self, web, port=0):
+        handler = type("Handler", (_Handler,), {"web": web})
+        self.web = web
+        self.httpd = _Server(("127.0.0.1", port), handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# === MEASUREMENT ===
+def _rss_bytes(pid):
+    try:
+        with open(f"/proc/{pid}/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def tree_rss(pid):
+    """Resident memory of ``pid`` and its descendants (Linux ``/proc`` only)."""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as fh:
+                ppid = int(fh.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+    total, stack = 0, list(children.get(pid, []))
+    while stack:
+        child = stack.pop()
+        total += _rss_bytes(child)
+        stack.extend(children.get(child, []))
+    return _rss_bytes(pid), total
+
+
+class MemorySampler(threading.Thread):
+    """Track peak memory of this process and of its children (the browser)."""
+
+    def __init__(self, interval=0.5):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak_self = 0
+        self.peak_children = 0
+        self.peak_total = 0
+        self.available = os.path.isdir("/proc")
+        self._halt = threading.Event()
+
+    def run(self):
+        while self.available and not self._halt.wait(self.interval):
+            own, children = tree_rss(os.getpid())
+            self.peak_self = max(self.peak_self, own)
+            self.peak_children = max(self.peak_children, children)
+            self.peak_total = max(self.peak_total, own + children)
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+
+
+async def loop_lag(samples, tick=0.05):
+    """Record how late each ``tick`` sleep wakes up, until cancelled."""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(tick)
+        samples.append(time.perf_counter() - start - tick)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+# === WORKER ===
+def worker_env(proxy, state_dir, concurrency):
+    """Environment that points every network path of the scraper at the mocks."""
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key.upper()
+        not in (
+            "SCRAPINGBEE_KEY", "SCRAPEDO_KEY", "ZYTE_API_KEY",
+            "BRIGHTDATA_BROWSER_URL", "BRIGHTDATA_API_TOKEN",
+            "NO_PROXY", "ALL_PROXY", "GOOGLE_APPLICATION_CREDENTIALS",
+        )
+    }
+    env.update(
+        HTTP_PROXY=proxy,
+        HTTPS_PROXY=proxy,
+        http_proxy=proxy,
+        https_proxy=proxy,
+        BROWSER_PROXY=proxy,
+        SCRAPERAPI_KEY="loadsim",
+        APIFY_TOKEN="loadsim",
+        SCRAPER_STATE_DIR=state_dir,
+        SCRAPER_CONCURRENCY=str(concurrency),
+        CASTER_CITY_BASE_URL=f"http://{sim_host('castercity.com')}",
+        HARVEST_LISTINGS_FILE=os.path.join(state_dir, "no-listings.json"),
+        SCRAPY_ENGINE="false",
+    )
+    return env
+
+
+def patch_scraper(scraper):
+    """Point hard-coded vendor endpoints at the mocks and disable Node fallbacks.
+
+    The Node.js fallbacks start their own browser, which would ignore
+    ``BROWSER_PROXY``, so they report a skip instead of leaving the mock network.
+    """
+    import harbor_freight_scraper
+    import northern_tool_scraper
+
+    harbor_freight_scraper.DY_ENDPOINT = f"http://{sim_host(DY_HOST)}/spa/json"
+    nt_template = northern_tool_scraper.JSON_TEMPLATE.replace(
+        "https://www.northerntool.com", f"http://{sim_host('www.northerntool.com')}"
+    )
+    northern_tool_scraper.JSON_TEMPLATE = nt_template
+    scraper.NT_JSON_TEMPLATE = nt_template
+    scraper.node_fallback_price = lambda url, deadline=None: "node-skipped: load simulation"
+    scraper.puppeteer_grainger_fallback = lambda url, deadline=None: "Fallback skipped: load simulation"
+
+
+async def _run_level(scraper, sheets, concurrency, row_budget, run_budget):
+    lag = []
+    monitor = asyncio.create_task(loop_lag(lag))
+    memory = MemorySampler()
+    memory.start()
+    started = time.perf_counter()
+    try:
+        rows = await asyncio.to_thread(scraper.get_links_from_sheet, sheets)
+        col_letter = await asyncio.to_thread(scraper.get_next_col_letter, sheets)
+        prices, errors = await scraper.scrape_all(
+            rows, concurrency=concurrency, row_budget=row_budget, run_budget=run_budget
+        )
+        scrape_seconds = time.perf_counter() - started
+        await asyncio.to_thread(scraper.write_prices, sheets, col_letter, prices)
+        await asyncio.to_thread(scraper.write_timestamp_header, sheets, col_letter)
+        await asyncio.to_thread(scraper.log_errors, sheets, errors)
+    finally:
+        monitor.cancel()
+        memory.stop()
+    return {
+        "rows": len(rows),
+        "col_letter": col_letter,
+        "errors": len(errors),
+        "methods": Counter(error[4] for error in errors),
+        "scrape_seconds": scrape_seconds,
+        "total_seconds": time.perf_counter() - started,
+        "lag": lag,
+        "memory": memory,
+    }
+
+
+def grade(sheets, links_tab, col_letter, expected):
+    """Compare the price column the scraper wrote with the expected prices."""
+    col = FakeSheets._column(col_letter, 0)
+    grid = sheets.tabs[links_tab][1:]
+    counts = Counter()
+    for row, want in zip(grid, expected):
+        got = row[col] if len(row) > col else ""
+        if not price_value(got):
+            counts["missing"] += 1
+        elif price_value(got) == price_value(want):
+            counts["correct"] += 1
+        else:
+            counts["wrong"] += 1
+    return counts
+
+
+def run_worker(args):
+    """Scrape the sheet in ``args.sheet`` once and write a JSON result."""
+    scraper = load_scraper()
+    patch_scraper(scraper)
+    logging.getLogger().setLevel(getattr(logging, args.log_level))
+    with open(args.sheet, encoding="utf-8") as fh:
+        spec = json.load(fh)
+    sheets = FakeSheets(
+        sheet_tabs(spec["rows"], scraper.LINKS_TAB, scraper.ERROR_TAB),
+        latency=args.sheets_latency,
+    )
+    level = asyncio.run(
+        _run_level(scraper, sheets, args.concurrency, args.row_budget, args.run_budget)
+    )
+    counts = grade(sheets, scraper.LINKS_TAB, level["col_letter"], spec["expected"])
+    lag = level["lag"]
+    memory = level["memory"]
+    mib = 1024 * 1024
+    result = {
+        "concurrency": args.concurrency,
+        "rows": level["rows"],
+        "scrape_seconds": round(level["scrape_seconds"], 2),
+        "total_seconds": round(level["total_seconds"], 2),
+        "rows_per_min": round(level["rows"] / level["scrape_seconds"] * 60, 1),
+        "correct": counts["correct"],
+        "wrong": counts["wrong"],
+        "missing": counts["missing"],
+        "error_methods": dict(level["methods"].most_common()),
+        "sheets_calls": dict(sheets.calls),
+        "lag_p50_ms": round(statistics.median(lag) * 1000, 1) if lag else 0.0,
+        "lag_p99_ms": round(percentile(lag, 0.99) * 1000, 1),
+        "lag_max_ms": round(max(lag, default=0.0) * 1000, 1),
+        "rss_python_mib": round(memory.peak_self / mib, 1) if memory.available else None,
+        "rss_browser_mib": round(memory.peak_children / mib, 1) if memory.available else None,
+        "rss_total_mib": round(memory.peak_total / mib, 1) if memory.available else None,
+    }
+    with open(args.result, "w", encoding="utf-8") as fh:
+        json.dump(result, fh, indent=2)
+    return 0
+
+
+# === DRIVER ===
+def web_from_args(args, catalog_size):
+    return MockWeb(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        block_rate=args.block_rate,
+        proxy_latency=args.proxy_latency,
+        proxy_error_rate=args.proxy_error_rate,
+        provider_concurrency=args.provider_concurrency,
+        catalog_size=catalog_size,
+        seed=args.seed,
+    )
+
+
+def run_levels(args):
+    """Run one worker per concurrency level and return the report dictionary."""
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    rows, expected = synthetic_rows(args.rows, parse_mix(args.mix), args.duplicates, args.seed)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="loadsim-") as tmp, \
+            MockServer(web_from_args(args, args.rows)) as server:
+        sheet = os.path.join(tmp, "sheet.json")
+        with open(sheet, "w", encoding="utf-8") as fh:
+            json.dump({"rows": rows, "expected": expected}, fh)
+        print(
+            f"{'conc':>4} {'rows/min':>9} {'secs':>8} {'correct':>8} {'wrong':>6} "
+            f"{'missing':>8} {'lag p50':>8} {'p99':>7} {'max':>7} {'py MiB':>7} {'browser MiB':>12}"
+        )
+        for concurrency in levels:
+            state_dir = os.path.join(tmp, f"state-{concurrency}")
+            out = os.path.join(tmp, f"result-{concurrency}.json")
+            cmd = [
+                sys.executable, __file__, "worker",
+                "--sheet", sheet,
+                "--result", out,
+                "--concurrency", str(concurrency),
+                "--row-budget", str(args.row_budget),
+                "--run-budget", str(args.run_budget),
+                "--sheets-latency", str(args.sheets_latency),
+                "--log-level", args.log_level,
+            ]
+            env = worker_env(server.url, state_dir, concurrency)
+            proc = subprocess.run(cmd, env=env)
+            traffic = server.web.reset_stats()
+            if proc.returncode != 0 or not os.path.exists(out):
+                print(f"{concurrency:>4} worker failed with exit code {proc.returncode}")
+                results.append({"concurrency": concurrency, "failed": proc.returncode, "traffic": traffic})
+                continue
+            with open(out, encoding="utf-8") as fh:
+                result = json.load(fh)
+            result["traffic"] = traffic
+            results.append(result)
+            print(
+                f"{concurrency:>4} {result['rows_per_min']:>9.1f} {result['scrape_seconds']:>8.1f} "
+                f"{result['correct']:>8} {result['wrong']:>6} {result['missing']:>8} "
+                f"{result['lag_p50_ms']:>7.1f}ms {result['lag_p99_ms']:>5.0f}ms {result['lag_max_ms']:>5.0f}ms "
+                f"{result['rss_python_mib'] or 0:>7.0f} {result['rss_browser_mib'] or 0:>12.0f}"
+            )
+    return {
+        "commit": git_commit(),
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "settings": {
+            key: getattr(args, key)
+            for key in (
+                "rows", "mix", "duplicates", "latency", "error_rate", "block_rate",
+                "proxy_latency", "proxy_error_rate", "provider_concurrency",
+                "sheets_latency", "row_budget",
+                "run_budget", "seed",
+            )
+        },
+        "results": results,
+    }
+
+
+def write_sheet_file(args):
+    """Write a synthetic sheet as CSV for ``scraper-v1.0.py --input``."""
+    rows, expected = synthetic_rows(args.rows, parse_mix(args.mix), args.duplicates, args.seed)
+    fh = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        writer = csv.writer(fh)
+        writer.writerow(["vendor", "url", "selector", "notes", "expected"])
+        for row, price in zip(rows, expected):
+            writer.writerow(row + [price])
+    finally:
+        if fh is not sys.stdout:
+            fh.close()
+    return 0
+
+
+def serve(args):
+    """Run the mock sites in the foreground for manual runs of the scraper."""
+    with MockServer(web_from_args(args, args.rows), args.port) as server:
+        print(f"Mock vendors listening on {server.url}; point the scraper at them with:")
+        print(f"  export HTTP_PROXY={server.url} HTTPS_PROXY={server.url} BROWSER_PROXY={server.url}")
+        print(f"  export CASTER_CITY_BASE_URL=http://{sim_host('castercity.com')}")
+        print("Press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(10)
+                print(json.dumps(server.web.reset_stats(), sort_keys=True))
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def add_sheet_args(parser):
+    parser.add_argument("--rows", type=int, default=500, help="Rows in the synthetic sheet")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Vendor weights, e.g. menards=2,generic=1")
+    parser.add_argument("--duplicates", type=float, default=0.05, help="Fraction of rows repeating a product")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def add_mock_args(parser):
+    parser.add_argument("--latency", type=float, default=0.2, help="Mean vendor response time in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Share of vendor responses that are 503s")
+    parser.add_argument("--block-rate", type=float, default=0.03, help="Share of vendor responses that are 403 challenges")
+    parser.add_argument("--proxy-latency", type=float, default=0.5, help="Mean scraping-service overhead in seconds")
+    parser.add_argument("--proxy-error-rate", type=float, default=0.05, help="Share of scraping-service calls that fail")
+    parser.add_argument(
+        "--provider-concurrency", type=int, default=0,
+        help="Concurrent requests each scraping service allows before answering 429 (0 for no limit)",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test scrape_all against mock vendor sites")
+    sub = parser.add_subparsers(dest="command")
+
+    run = sub.add_parser("run", help="Scrape a synthetic sheet at several concurrency levels (default)")
+    add_sheet_args(run)
+    add_mock_args(run)
+    run.add_argument("--concurrency", default="2,4,8", help="Comma-separated concurrency levels")
+    run.add_argument("--sheets-latency", type=float, default=0.3, help="Seconds per fake Sheets API call")
+    run.add_argument("--row-budget", type=float, default=60, help="Row time budget in seconds")
+    run.add_argument("--run-budget", type=float, default=0, help="Run time budget in seconds (0 for none)")
+    run.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    run.add_argument("--output", help="Report path (default benchmarks/results/loadsim-<commit>.json)")
+
+    srv = sub.add_parser("serve", help="Only run the mock vendor sites")
+    add_sheet_args(srv)
+    add_mock_args(srv)
+    srv.add_argument("--port", type=int, default=8899)
+
+    sheet = sub.add_parser("sheet", help="Write a synthetic sheet as CSV")
+    add_sheet_args(sheet)
+    sheet.add_argument("--output", default="-", help="CSV path (- for stdout)")
+
+    worker = sub.add_parser("worker", help=argparse.SUPPRESS)
+    worker.add_argument("--sheet", required=True)
+    worker.add_argument("--result", required=True)
+    worker.add_argument("--concurrency", type=int, required=True)
+    worker.add_argument("--row-budget", type=float, default=60)
+    worker.add_argument("--run-budget", type=float, default=0)
+    worker.add_argument("--sheets-latency", type=float, default=0.0)
+    worker.add_argument("--log-level", default="WARNING")
+
+    args = parser.parse_args(sys.argv[1:] or ["run"])
+
+    if args.command == "worker":
+        return run_worker(args)
+    if args.command == "serve":
+        return serve(args)
+    if args.command == "sheet":
+        return write_sheet_file(args)
+
+    report = run_levels(args)
+    output = Path(args.output) if args.output else RESULTS_DIR / f"loadsim-{report['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nReport written to {output}")
+    return 1 if any("failed" in r for r in report["results"]) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import re
+from typing import Mapping, Optional
+
+# Markup that only appears on challenge or block pages, as (kind, signature).
+# Signatures are lowercase and matched against the start of the page.
+MARKUP_SIGNATURES = [
+    ("cloudflare", "<title>just a moment...</title>"),
+    ("cloudflare", "cf-browser-verification"),
+    ("cloudflare", "_cf_chl_opt"),
+    ("cloudflare", "attention required! | cloudflare"),
+    ("datadome", "captcha-delivery.com"),
+    ("perimeterx", "px-captcha"),
+    ("perimeterx", "access to this page has been denied"),
+    ("imperva", "incapsula incident id"),
+    ("imperva", "pardon our interruption"),
+    ("akamai", "errors.edgesuite.net"),
+    ("akamai", "/_sec/cp_challenge/"),
+]
+# Scripts the CDN also injects into normal pages of the sites it fronts. They
+# only count on an error status, a small page or a challenge title.
+INJECTED_SIGNATURES = [
+    ("cloudflare", "/cdn-cgi/challenge-platform/h/"),
+    ("imperva", "_incapsula_resource"),
+]
+# CAPTCHA widgets also show up on login forms, so they only count on small pages
+CAPTCHA_SIGNATURES = ["g-recaptcha", "h-captcha", "hcaptcha.com/1/api.js", "cf-turnstile"]
+SMALL_PAGE = 20000
+SCAN_CHARS = 65536
+CHALLENGE_TITLES = (
+    "just a moment",
+    "attention required",
+    "access denied",
+    "access to this page has been denied",
+    "pardon our interruption",
+    "are you a robot",
+    "robot or human",
+    "security check",
+)
+TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title>", re.DOTALL)
+BLOCK_SERVERS = {"cloudflare": "cloudflare", "akamaighost": "akamai", "datadome": "datadome"}
+
+
+class Blocked(Exception):
+    """Raised by a tier that was served a block page instead of the product.
+
+    ``html`` is the block page when the tier had it, for the Error Log.
+    """
+
+    def __init__(self, kind: str, status: Optional[int] = None, html: Optional[str] = None):
+        super().__init__(f"blocked by {kind}")
+        self.kind = kind
+        self.status = status
+        self.html = html
+
+
+def is_challenge_title(title: Optional[str]) -> bool:
+    title = (title or "").strip().lower()
+    return any(title.startswith(prefix) for prefix in CHALLENGE_TITLES)
+
+
+def detect_block(
+    status: Optional[int] = None,
+    headers: Optional[Mapping[str, str]] = None,
+    html: Optional[str] = None,
+) -> Optional[str]:
+    """Return the kind of block (``"cloudflare"``, ``"rate-limit"``, ...) or None.
+
+    Headers are checked first, then known challenge markup, then the status
+    code alone: 429 is ``rate-limit`` and an unexplained 403 is ``http-403``.
+    A 200 product page carrying a CDN's injected scripts is not a block.
+    """
+    headers = {k.lower(): str(v).lower() for k, v in (headers or {}).items()}
+    if headers.get("cf-mitigated") == "challenge":
+        return "cloudflare"
+    if html:
+        head = html[:SCAN_CHARS].lower()
+        for kind, signature in MARKUP_SIGNATURES:
+            if signature in head:
+                return kind
+        small = len(html) < SMALL_PAGE
+        title = TITLE_RE.search(head)
+        if (status or 0) >= 400 or small or (title and is_challenge_title(title.group(1))):
+            for kind, signature in INJECTED_SIGNATURES:
+                if signature in head:
+                    return kind
+        if small and any(s in head for s in CAPTCHA_SIGNATURES):
+            return "captcha"
+    if status == 403:
+        server = headers.get("server", "")
+        for name, kind in BLOCK_SERVERS.items():
+            if name in server:
+                return kind
+        if "x-datadome" in headers:
+            return "datadome"
+        return "http-403"
+    if status == 429:
+        return "rate-limit"
+    return None
@@ -0,0 +1,102 @@
+import csv
+import json
+import sys
+from typing import List
+from urllib.parse import urlparse
+
+# Columns written for each result, in CSV order
+RESULT_FIELDS = [
+    "row",
+    "vendor",
+    "url",
+    "selector",
+    "price",
+    "method",
+    "status",
+    "error",
+    "snippet",
+    "elapsed",
+    "attempts",
+]
+
+
+def _open_input(path: str):
+    if path == "-":
+        return sys.stdin
+    return open(path, newline="", encoding="utf-8")
+
+
+def read_rows(path: str) -> List[list]:
+    """Read URLs from a file (``-`` for stdin) as scraper rows.
+
+    Each line is ``url[,selector[,notes]]``; tabs work as separators too.
+    A header row naming a ``url`` column may add ``vendor``, ``selector``
+    and ``notes`` columns in any order. Blank lines and lines starting with
+    ``#`` are skipped. Rows come back as ``[vendor, url, selector, notes]``
+    like the Caster Links sheet, with the vendor defaulting to the domain.
+    """
+    fh = _open_input(path)
+    try:
+        lines = [line for line in fh if line.strip() and not line.lstrip().startswith("#")]
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+    if not lines:
+        return []
+    delimiter = "\t" if "\t" in lines[0] else ","
+    records = list(csv.reader(lines, delimiter=delimiter))
+    header = [cell.strip().lower() for cell in records[0]]
+    if "url" in header:
+        columns = {name: header.index(name) for name in ("vendor", "url", "selector", "notes") if name in header}
+        records = records[1:]
+    else:
+        columns = {"url": 0, "selector": 1, "notes": 2}
+
+    rows = []
+    for record in records:
+        def cell(name):
+            pos = columns.get(name)
+            return record[pos].strip() if pos is not None and pos < len(record) else ""
+
+        url = cell("url")
+        vendor = cell("vendor") or urlparse(url).netloc.lower()
+        rows.append([vendor, url, cell("selector"), cell("notes")])
+    return rows
+
+
+class ResultWriter:
+    """Write result records as JSONL or CSV, flushing after every record.
+
+    The format follows the file extension (``.csv`` for CSV, anything else
+    for JSONL). ``-`` writes JSONL to stdout.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        if path == "-":
+            self._fh = sys.stdout
+        else:
+            self._fh = open(path, "w", newline="", encoding="utf-8")
+        self._csv = None
+        if path.lower().endswith(".csv"):
+            self._csv = csv.DictWriter(self._fh, fieldnames=RESULT_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def write(self, record: dict) -> None:
+        if self._csv:
+            self._csv.writerow(record)
+        else:
+            self._fh.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._fh.flush()
+        self.count += 1
+
+    def close(self) -> None:
+        if self._fh is not sys.stdout:
+            self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,10 +1,118 @@
 import asyncio
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qs, urlparse
+
+import requests
 from playwright.async_api import async_playwright
 
+logger = logging.getLogger(__name__)
+
 URL = "https://castercity.com/product/8-swivel-pneumatic-caster-black/"
 WRAPPER = ".summaryfull.entry-summaryfull"
 SELECTOR = ".woocommerce-Price-amount.amount"
 
+BASE_URL = "https://castercity.com"
+STORE_API_PATH = "/wp-json/wc/store/v1/products"
+
+
+def product_key(url: str) -> str:
+    """Return the product slug (or numeric ID) a Caster City URL points to."""
+    parsed = urlparse(url)
+    match = re.search(r"/product/([^/?#]+)", parsed.path)
+    if match:
+        return match.group(1).lower()
+    query = parse_qs(parsed.query)
+    for key in ("p", "product_id", "add-to-cart"):
+        if query.get(key, [""])[0].isdigit():
+            return query[key][0]
+    return ""
+
+
+def format_store_price(prices: dict) -> Optional[str]:
+    """Convert Store API minor-unit prices (``"3295"``) to ``"$32.95"``."""
+    raw = str(prices.get("price") or "")
+    if not raw.isdigit():
+        return None
+    minor = int(prices.get("currency_minor_unit", 2))
+    value = Decimal(raw).scaleb(-minor)
+    if value == 0:
+        # Same rule as the page scraper, which ignores "$0.00" amounts
+        return None
+    symbol = prices.get("currency_prefix") or prices.get("currency_symbol") or "$"
+    return f"{symbol}{value:,.{minor}f}"
+
+
+def fetch_catalog_prices(
+    base_url: str = BASE_URL,
+    per_page: int = 100,
+    max_pages: int = 100,
+    workers: int = 4,
+    timeout: float = 30,
+    session: Optional[requests.Session] = None,
+) -> Dict[str, str]:
+    """Return ``{slug or id: price}`` for the whole catalog via the Store API.
+
+    The first page reports ``X-WP-TotalPages``; the remaining pages are then
+    fetched concurrently. A later page that fails is logged and skipped, so
+    its products fall back to the per-row scrape while the rest are kept.
+    """
+    session = session or requests.Session()
+    endpoint = base_url.rstrip("/") + STORE_API_PATH
+    headers = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
+
+    def get_page(page: int):
+        resp = session.get(
+            endpoint,
+            params={"per_page": per_page, "page": page},
+            headers=headers,
+            timeout=timeout,
+        )
+        resp.raise_for_status()
+        return resp
+
+    def get_items(page: int) -> list:
+        try:
+            return list(get_page(page).json())
+        except Exception as e:
+            logger.warning("Caster City catalog page %d failed: %s", page, e)
+            return []
+
+    first = get_page(1)
+    items = list(first.json())
+    total_pages = min(int(first.headers.get("X-WP-TotalPages") or 1), max_pages)
+    if total_pages > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for page_items in pool.map(get_items, range(2, total_pages + 1)):
+                items.extend(page_items)
+
+    prices = {}
+    for item in items:
+        price = format_store_price(item.get("prices") or {})
+        if not price:
+            continue
+        slug = (item.get("slug") or product_key(item.get("permalink") or "")).lower()
+        if slug:
+            prices[slug] = price
+        if item.get("id") is not None:
+            prices[str(item["id"])] = price
+    return prices
+
+
+def bulk_prices_for_urls(urls: Iterable[str], base_url: str = BASE_URL, **kwargs) -> Dict[str, str]:
+    """Return ``{url: price}`` for every URL found in the catalog."""
+    catalog = fetch_catalog_prices(base_url, **kwargs)
+    found = {}
+    for url in urls:
+        price = catalog.get(product_key(url))
+        if price:
+            found[url] = price
+    return found
+
+
 async def extract_price_caster_city():
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
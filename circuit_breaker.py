@@ -0,0 +1,157 @@
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitOpen(Exception):
+    """Raised instead of calling a tier whose breaker is open.
+
+    Not a verdict on the page: the row was never tried, and trying again
+    before ``retry_in`` seconds have passed would only hit the breaker again.
+    """
+
+    def __init__(self, domain: str, tier: str, retry_in: float = 0.0, last_block: Optional[str] = None):
+        super().__init__(f"{tier} circuit open for {domain}")
+        self.domain = domain
+        self.tier = tier
+        self.retry_in = retry_in
+        self.last_block = last_block
+
+
+class CircuitBreaker:
+    """Failure-rate circuit breaker for a single (domain, tier) pair.
+
+    The breaker tracks the outcome of the last ``window`` calls. Once at least
+    ``min_calls`` have been seen and the failure rate reaches
+    ``failure_rate``, it opens and rejects calls for ``cooldown`` seconds.
+    After the cooldown it lets ``probes`` calls through (half-open); a
+    successful probe closes it again, a failed one re-opens it with a doubled
+    cooldown (capped at ``max_cooldown``).
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = 0.5,
+        min_calls: int = 3,
+        window: int = 10,
+        cooldown: float = 120.0,
+        max_cooldown: float = 1800.0,
+        probes: int = 1,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.probes = probes
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+        self.skipped = 0
+        self.failures = 0
+        self.successes = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Return True if a call may proceed; False means skip the tier."""
+        with self._lock:
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown:
+                    self.skipped += 1
+                    return False
+                self.state = HALF_OPEN
+                self.probes_in_flight = 0
+            if self.state == HALF_OPEN:
+                if self.probes_in_flight >= self.probes:
+                    self.skipped += 1
+                    return False
+                self.probes_in_flight += 1
+            return True
+
+    def record(self, ok: bool) -> None:
+        """Record the outcome of a call that :meth:`allow` let through."""
+        with self._lock:
+            if ok:
+                self.successes += 1
+            else:
+                self.failures += 1
+            if self.state == HALF_OPEN:
+                self.probes_in_flight = max(self.probes_in_flight - 1, 0)
+                if ok:
+                    self.state = CLOSED
+                    self.cooldown = self.base_cooldown
+                    self.outcomes.clear()
+                else:
+                    self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                    self._trip()
+                return
+            self.outcomes.append(ok)
+            if len(self.outcomes) < self.min_calls:
+                return
+            failed = self.outcomes.count(False)
+            if failed / len(self.outcomes) >= self.failure_rate:
+                self._trip()
+
+    def release(self) -> None:
+        """Give back a call :meth:`allow` let through without recording an outcome.
+
+        For calls that said nothing about the site, such as a scraping API
+        throttling us: a half-open probe slot is freed for the next call.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self.probes_in_flight = max(self.probes_in_flight - 1, 0)
+
+    def retry_in(self) -> float:
+        """Seconds until an open breaker lets a probe through (0 if it would now)."""
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(self.opened_at + self.cooldown - time.monotonic(), 0.0)
+
+    def _trip(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+
+
+class BreakerRegistry:
+    """Thread-safe collection of breakers keyed by ``(domain, tier)``."""
+
+    def __init__(self, **breaker_options):
+        self.breaker_options = breaker_options
+        self.breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, domain: str, tier: str) -> CircuitBreaker:
+        key = (domain, tier)
+        with self._lock:
+            breaker = self.breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(**self.breaker_options)
+                self.breakers[key] = breaker
+            return breaker
+
+    def allow(self, domain: str, tier: str) -> bool:
+        return self.get(domain, tier).allow()
+
+    def record(self, domain: str, tier: str, ok: bool) -> None:
+        self.get(domain, tier).record(ok)
+
+    def release(self, domain: str, tier: str) -> None:
+        self.get(domain, tier).release()
+
+    def tripped(self) -> List[Tuple[str, str, CircuitBreaker]]:
+        """Return breakers that are not closed, with their keys."""
+        with self._lock:
+            items = list(self.breakers.items())
+        return [
+            (domain, tier, breaker)
+            for (domain, tier), breaker in items
+            if breaker.state != CLOSED
+        ]
@@ -0,0 +1,188 @@
+import asyncio
+import datetime
+import json
+import logging
+import threading
+from typing import Iterable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    401: "Unauthorized",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class ApiServer:
+    """Tiny HTTP/JSON server running on the current event loop.
+
+    ``routes`` maps ``(method, path)`` to ``async handler(query, body)``
+    returning ``(status, payload)``. Dict and list payloads are sent as JSON,
+    strings as plain text. When ``token`` is set every request needs an
+    ``Authorization: Bearer <token>`` header. One request per connection.
+    """
+
+    def __init__(self, routes, host="127.0.0.1", port=8765, token=None, max_body=1 << 20):
+        self.routes = routes
+        self.host = host
+        self.port = port
+        self.token = token
+        self.max_body = max_body
+        self._server = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _read_request(self, reader):
+        line = await asyncio.wait_for(reader.readline(), 30)
+        method, target, _ = line.decode("latin-1").split(" ", 2)
+        headers = {}
+        while True:
+            line = await asyncio.wait_for(reader.readline(), 30)
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length") or 0)
+        if length > self.max_body:
+            return method, target, headers, None
+        body = await asyncio.wait_for(reader.readexactly(length), 30) if length else b""
+        return method, target, headers, body
+
+    async def _dispatch(self, method, target, headers, body):
+        if body is None:
+            return 413, {"error": "request body too large"}
+        if self.token and headers.get("authorization") != f"Bearer {self.token}":
+            return 401, {"error": "missing or wrong bearer token"}
+        parts = urlsplit(target)
+        handler = self.routes.get((method.upper(), parts.path))
+        if handler is None:
+            known = any(path == parts.path for _, path in self.routes)
+            return (405, {"error": "method not allowed"}) if known else (404, {"error": "not found"})
+        query = {k: v[-1] for k, v in parse_qs(parts.query).items()}
+        try:
+            payload = json.loads(body) if body else {}
+        except ValueError:
+            return 400, {"error": "body is not valid JSON"}
+        return await handler(query, payload)
+
+    async def _handle(self, reader, writer):
+        try:
+            try:
+                request = await self._read_request(reader)
+            except (ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                status, payload = 400, {"error": "malformed request"}
+            else:
+                try:
+                    status, payload = await self._dispatch(*request)
+                except Exception as e:
+                    logger.exception("API handler failed")
+                    status, payload = 500, {"error": str(e)}
+            if isinstance(payload, str):
+                data, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+            else:
+                data, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+            writer.write(
+                (
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: {content_type}; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    "Connection: close\r\n\r\n"
+                ).encode("latin-1")
+                + data
+            )
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+class Metrics:
+    """Counters and gauges exposed in the Prometheus text format."""
+
+    def __init__(self, prefix: str = "scraper"):
+        self.prefix = prefix
+        self._values = {}
+        self._meta = {}
+        self._lock = threading.Lock()
+
+    def _declare(self, name, kind, help_text):
+        if name not in self._meta:
+            self._meta[name] = (kind, help_text)
+            self._values.setdefault(name, 0)
+
+    def inc(self, name: str, value: float = 1, help_text: str = "") -> None:
+        with self._lock:
+            self._declare(name, "counter", help_text)
+            self._values[name] += value
+
+    def set(self, name: str, value: float, help_text: str = "") -> None:
+        with self._lock:
+            self._declare(name, "gauge", help_text)
+            self._values[name] = value
+
+    def get(self, name: str) -> float:
+        return self._values.get(name, 0)
+
+    def render(self) -> str:
+        lines = []
+        with self._lock:
+            for name, value in self._values.items():
+                kind, help_text = self._meta[name]
+                full = f"{self.prefix}_{name}"
+                if help_text:
+                    lines.append(f"# HELP {full} {help_text}")
+                lines.append(f"# TYPE {full} {kind}")
+                lines.append(f"{full} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def parse_times(text: Optional[str]) -> list:
+    """Parse ``"06:00,18:30"`` into a sorted list of :class:`datetime.time`."""
+    times = []
+    for part in (text or "").split(","):
+        part = part.strip()
+        if part:
+            hour, _, minute = part.partition(":")
+            times.append(datetime.time(int(hour), int(minute or 0)))
+    return sorted(times)
+
+
+def next_run_time(
+    now: datetime.datetime,
+    every: Optional[datetime.timedelta] = None,
+    times: Iterable[datetime.time] = (),
+    last_run: Optional[datetime.datetime] = None,
+    started: Optional[datetime.datetime] = None,
+) -> Optional[datetime.datetime]:
+    """Return when the next scheduled run is due, or None without a schedule.
+
+    ``every`` repeats the run at a fixed interval after the last run (or
+    after ``started`` before the first one); ``times`` are daily local clock
+    times. The earliest candidate wins.
+    """
+    candidates = []
+    if every:
+        candidates.append((last_run or started or now) + every)
+    for at in times:
+        candidate = datetime.datetime.combine(now.date(), at)
+        if candidate <= now or (last_run and candidate <= last_run):
+            candidate += datetime.timedelta(days=1)
+        candidates.append(candidate)
+    return min(candidates) if candidates else None
@@ -20,9 +20,9 @@ def build_dy_url(url: str) -> str:
     return f"{DY_ENDPOINT}?sec={SEC_ID}&ref={ref}&isSesNew=false&ctx={ctx}"
 
 
-def fetch_price(url: str = URL) -> str:
+def fetch_price(url: str = URL, timeout: float = 15) -> str:
     dy_url = build_dy_url(url)
-    resp = requests.get(dy_url, timeout=15)
+    resp = requests.get(dy_url, timeout=timeout)
     resp.raise_for_status()
     data = resp.json()
     price = data.get("feedProperties", {}).get("price")
@@ -0,0 +1,208 @@
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+# Keep evicting until the archive is this fraction of its cap, so a full
+# archive does not rescan the object store on every write
+EVICT_TO = 0.9
+EXTENSIONS = {"zstd": ".html.zst", "gzip": ".html.gz"}
+
+
+def _zstd():
+    try:
+        import zstandard  # optional, much faster than gzip at a similar ratio
+    except ImportError:
+        return None
+    return zstandard
+
+
+def default_codec() -> str:
+    return "zstd" if _zstd() else "gzip"
+
+
+class HtmlArchive:
+    """Compressed, content-addressed store of fetched pages.
+
+    Pages live under ``objects/`` named by the SHA-256 of their markup, so a
+    page fetched again unchanged costs no extra space. Every run appends to
+    its own manifest in ``runs/`` with the pages fetched per URL and the
+    result written for each row. Objects are evicted least recently used
+    first once the store grows past ``max_bytes``; manifests that point at an
+    evicted page simply find nothing for it.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 500 << 20, codec: Optional[str] = None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.codec = codec or default_codec()
+        if self.codec == "zstd" and not _zstd():
+            raise ValueError("zstd archive needs the zstandard package")
+        self.run_id = None
+        self._size = None
+        self._lock = threading.Lock()
+
+    # --- objects -----------------------------------------------------------
+
+    def _path(self, digest: str, codec: str) -> str:
+        return os.path.join(self.root, "objects", digest[:2], digest + EXTENSIONS[codec])
+
+    def _find(self, digest: str) -> Optional[str]:
+        for codec in EXTENSIONS:
+            path = self._path(digest, codec)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return _zstd().ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def _decompress(path: str, data: bytes) -> bytes:
+        if path.endswith(EXTENSIONS["zstd"]):
+            return _zstd().ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def put(self, html: str) -> str:
+        """Store ``html`` and return its digest."""
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self._find(digest)
+        if existing:
+            os.utime(existing)  # counts as a use for LRU eviction
+            return digest
+        path = self._path(digest, self.codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        blob = self._compress(data)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as fh:
+            fh.write(blob)
+        os.replace(tmp, path)
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(blob)
+            if self.max_bytes and self._size > self.max_bytes:
+                self._evict()
+        return digest
+
+    def get(self, digest: str) -> Optional[str]:
+        path = self._find(digest)
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as fh:
+                data = self._decompress(path, fh.read())
+            os.utime(path)
+        except OSError:
+            return None  # evicted by another process meanwhile
+        return data.decode("utf-8")
+
+    def _objects(self) -> Iterator[os.DirEntry]:
+        base = os.path.join(self.root, "objects")
+        if not os.path.isdir(base):
+            return
+        for shard in os.scandir(base):
+            if shard.is_dir():
+                yield from (e for e in os.scandir(shard.path) if not e.name.endswith(".tmp"))
+
+    def _scan_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._objects())
+
+    def _evict(self) -> None:
+        entries = sorted(
+            ((e.stat().st_mtime, e.stat().st_size, e.path) for e in self._objects())
+        )
+        size = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_TO
+        for _, entry_size, path in entries:
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+        self._size = size
+
+    # --- run manifests -----------------------------------------------------
+
+    def begin_run(self) -> str:
+        """Start a new manifest; later records go to it."""
+        run_id = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        with self._lock:
+            if run_id == self.run_id or os.path.exists(self._manifest(run_id)):
+                run_id = f"{run_id}-{os.getpid()}-{int(time.time() * 1000) % 1000:03d}"
+            self.run_id = run_id
+        return run_id
+
+    def _manifest(self, run_id: str) -> str:
+        return os.path.join(self.root, "runs", f"{run_id}.jsonl")
+
+    def _append(self, entry: dict) -> None:
+        if self.run_id is None:
+            self.begin_run()
+        path = self._manifest(self.run_id)
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "a", encoding="utf-8") as fh:
+                fh.write(line)
+
+    def record_page(self, url: str, html: str, source: str, status: Optional[int] = None) -> str:
+        """Store a fetched page and note it under ``url`` in the current run."""
+        digest = self.put(html)
+        self.note_page(url, digest, source, status)
+        return digest
+
+    def note_page(
+        self, url: str, digest: str, source: str, status: Optional[int] = None, **extra
+    ) -> None:
+        """Note a page stored with :meth:`put` under ``url`` in the current run.
+
+        One listing page is noted this way under every product priced from it.
+        """
+        self._append(
+            {"type": "page", "url": url, "source": source, "status": status, "digest": digest, **extra}
+        )
+
+    def record_result(self, url: str, price: str, method: str) -> None:
+        """Note the price the run wrote for ``url``."""
+        self._append({"type": "result", "url": url, "price": price, "method": method})
+
+    def runs(self) -> List[str]:
+        base = os.path.join(self.root, "runs")
+        if not os.path.isdir(base):
+            return []
+        return sorted(name[: -len(".jsonl")] for name in os.listdir(base) if name.endswith(".jsonl"))
+
+    def load_run(self, run_id: Optional[str] = None) -> Dict[str, dict]:
+        """Return ``{url: {"pages": [...], "result": {...}}}`` for a run.
+
+        ``run_id`` defaults to the latest run. Pages are listed newest first.
+        """
+        if run_id is None:
+            runs = self.runs()
+            if not runs:
+                raise FileNotFoundError(f"No archived runs in {self.root}")
+            run_id = runs[-1]
+        by_url = {}
+        with open(self._manifest(run_id), encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn line from an interrupted run
+                item = by_url.setdefault(entry["url"], {"pages": [], "result": None})
+                if entry.get("type") == "page":
+                    item["pages"].insert(0, entry)
+                else:
+                    item["result"] = entry
+        return by_url
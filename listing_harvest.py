@@ -0,0 +1,124 @@
+import json
+import logging
+import os
+from typing import Callable, Dict, Iterable, Optional
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+# Listing markup per catalog vendor. "item" wraps one product tile, "link"
+# is the anchor to the product page and "page_param" paginates the listing.
+VENDORS = {
+    "casterdepot.com": {
+        "item": "li.product-item",
+        "link": "a.product-item-link",
+        "page_param": "p",
+    },
+}
+
+
+def vendor_for(url: str) -> Optional[str]:
+    domain = urlparse(url).netloc.lower()
+    for vendor in VENDORS:
+        if domain == vendor or domain.endswith("." + vendor):
+            return vendor
+    return None
+
+
+def normalize_product_url(url: str) -> str:
+    """Return a comparable form of a product URL (no www, query or slash)."""
+    parsed = urlparse(url.strip())
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parsed.path.rstrip('/').lower()}"
+
+
+def with_page(url: str, param: str, page: int) -> str:
+    parsed = urlparse(url)
+    query = [(k, v) for k, v in parse_qsl(parsed.query) if k != param]
+    if page > 1:
+        query.append((param, str(page)))
+    return urlunparse(parsed._replace(query=urlencode(query)))
+
+
+def load_listings(path: str) -> Dict[str, dict]:
+    """Load the listing pages to harvest, keyed by vendor domain.
+
+    The file maps a domain to ``{"urls": [...], "max_pages": N}``.
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def harvest_listing_page(html: str, page_url: str, config: dict, extractor: Callable) -> Dict[str, str]:
+    """Return ``{normalized product URL: price}`` for one listing page."""
+    soup = BeautifulSoup(html, "html.parser")
+    found = {}
+    for item in soup.select(config["item"]):
+        link = item.select_one(config["link"])
+        if not link or not link.get("href"):
+            continue
+        price = extractor(str(item))
+        if price:
+            found[normalize_product_url(urljoin(page_url, link["href"]))] = price
+    return found
+
+
+def listing_judge(vendor: str, extractor: Callable) -> Callable[[str], bool]:
+    """Return a check telling whether fetched HTML is a listing with priced tiles.
+
+    Scraping services escalate to a rendered fetch when their ``extractor``
+    finds nothing, and a product-page scan finds nothing on a listing.
+    """
+    config = VENDORS[vendor]
+    return lambda html: bool(harvest_listing_page(html, "", config, extractor))
+
+
+def harvest_vendor(
+    vendor: str,
+    listing: dict,
+    fetchers: Iterable[Callable[[str], Optional[str]]],
+    extractor: Callable[[str], Optional[str]],
+    wanted: Optional[Iterable[str]] = None,
+    on_page: Optional[Callable[[str, str, Dict[str, str]], None]] = None,
+) -> Dict[str, str]:
+    """Walk a vendor's listing pages and collect product prices.
+
+    Each of ``fetchers`` takes a URL and returns HTML or None; they are tried
+    in order until one yields product tiles (e.g. direct GET, then proxies).
+    ``extractor(html)`` is applied to each tile; it should read structured
+    price markup only, since a text scan picks up "Save $X" and was-prices.
+    Pages are walked until one adds no new products, ``max_pages`` is
+    reached, or every ``wanted`` URL has been priced.
+    ``on_page(page_url, html, found)`` is called for each page with tiles.
+    """
+    fetchers = list(fetchers)
+    config = VENDORS[vendor]
+    wanted = {normalize_product_url(u) for u in wanted} if wanted else None
+    max_pages = int(listing.get("max_pages", 10))
+    prices = {}
+    for base in listing.get("urls", []):
+        for page in range(1, max_pages + 1):
+            page_url = with_page(base, config["page_param"], page)
+            found = {}
+            for fetch in fetchers:
+                html = fetch(page_url)
+                if html:
+                    found = harvest_listing_page(html, page_url, config, extractor)
+                if found:
+                    if on_page:
+                        on_page(page_url, html, found)
+                    break
+            new = set(found) - set(prices)
+            prices.update(found)
+            logger.info("Harvested %d products from %s", len(found), page_url)
+            if not new:
+                break
+            if wanted and wanted <= set(prices):
+                return prices
+    return prices
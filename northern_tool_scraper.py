@@ -1,4 +1,5 @@
 import re
+import time
 import asyncio
 from typing import Optional
 
@@ -51,14 +52,14 @@ def parse_price(data) -> Optional[str]:
     return None
 
 
-def fetch_price_json(url: str) -> Optional[str]:
+def fetch_price_json(url: str, timeout: float = 15) -> Optional[str]:
     part = extract_part_number(url)
     if not part:
         return None
     endpoint = JSON_TEMPLATE.format(part=part)
     headers = {"User-Agent": "Mozilla/5.0", "Accept": "application/json"}
     try:
-        resp = requests.get(endpoint, headers=headers, timeout=15)
+        resp = requests.get(endpoint, headers=headers, timeout=timeout)
         resp.raise_for_status()
         data = resp.json()
         return parse_price(data)
@@ -88,25 +89,43 @@ async def fetch_price_playwright(url: str) -> Optional[str]:
             await browser.close()
 
 
-async def price_from_page(page: Page, url: str) -> Optional[str]:
-    """Use an existing Playwright page to fetch the price."""
+async def price_from_page(
+    page: Page,
+    url: str,
+    json_fallback: bool = True,
+    timeout: Optional[float] = None,
+) -> Optional[str]:
+    """Use an existing Playwright page to fetch the price.
+
+    When ``json_fallback`` is false the direct WCS request is skipped, so only
+    traffic seen by the browser is used (e.g. during HAR replay). ``timeout``
+    is an overall budget in seconds shared by every step.
+    """
     part = extract_part_number(url)
+    expires = time.monotonic() + timeout if timeout is not None else None
+
+    def budget(seconds: float) -> float:
+        if expires is None:
+            return seconds
+        return max(min(seconds, expires - time.monotonic()), 0.001)
 
     def matches(resp):
         if "price" in resp.url and "byPartNumbers" in resp.url:
             return part in resp.url if part else True
         return False
 
-    await page.goto(url, timeout=60000)
+    await page.goto(url, timeout=budget(60) * 1000)
     try:
-        resp = await page.wait_for_event("response", matches, timeout=15000)
+        resp = await page.wait_for_event("response", matches, timeout=budget(15) * 1000)
         data = await resp.json()
         price = parse_price(data)
         if price:
             return price
     except Exception:
         pass
-    return fetch_price_json(url)
+    if not json_fallback or budget(15) <= 0.001:
+        return None
+    return fetch_price_json(url, timeout=budget(15))
 
 
 async def fetch_price_async(url: str = URL) -> str:
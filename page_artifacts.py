@@ -0,0 +1,74 @@
+import json
+from functools import cached_property
+from typing import Any, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+
+class PageArtifacts:
+    """Views of one fetched page, each derived on first use and then reused.
+
+    Built from markup that is already in hand (``PageArtifacts(html)``) or
+    from a live Playwright page (``PageArtifacts(page=page)``), in which case
+    nothing is serialized until :meth:`load` is awaited. Extractors that take
+    ``html`` accept either a string or an instance, so a chain of them parses
+    the page once instead of once per extractor.
+    """
+
+    def __init__(self, html: Optional[str] = None, page=None, response=None):
+        self.page = page
+        self.response = response
+        self._html = html
+
+    @classmethod
+    def of(cls, source) -> "PageArtifacts":
+        return source if isinstance(source, cls) else cls(source or "")
+
+    @property
+    def loaded(self) -> bool:
+        return self._html is not None
+
+    async def load(self) -> "PageArtifacts":
+        """Serialize the live page's DOM, once."""
+        if self._html is None:
+            self._html = await self.page.content() if self.page else ""
+        return self
+
+    @property
+    def html(self) -> str:
+        return self._html or ""
+
+    @property
+    def status(self) -> Optional[int]:
+        return self.response.status if self.response else None
+
+    def snippet(self, size: int = 300) -> str:
+        return self.html[:size]
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, "html.parser")
+
+    @cached_property
+    def strings(self) -> Tuple[str, ...]:
+        """Visible text nodes, stripped, in document order."""
+        return tuple(self.soup.stripped_strings)
+
+    @cached_property
+    def scripts(self) -> List[Tuple[Optional[str], str]]:
+        """``(type, content)`` for every ``<script>`` tag."""
+        return [(tag.get("type"), tag.string or "") for tag in self.soup.find_all("script")]
+
+    @cached_property
+    def script_json(self) -> List[Any]:
+        """Parsed JSON-LD per entry of :attr:`scripts` (None for other scripts)."""
+        parsed = []
+        for kind, content in self.scripts:
+            data = None
+            if kind == "application/ld+json":
+                try:
+                    data = json.loads(content)
+                except ValueError:
+                    pass
+            parsed.append(data)
+        return parsed
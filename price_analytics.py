@@ -0,0 +1,303 @@
+"""Price-history report over the sheet's price columns or bulk-mode outputs.
+
+Every cell is parsed in one vectorized pass and the per-row statistics are
+computed on the whole matrix at once, so thousands of rows by hundreds of
+runs take well under a second. Run directly to report on bulk result files::
+
+    python price_analytics.py out-0601.jsonl out-0608.jsonl --output report.csv
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Same currency markers as extract_price in the scraper
+CURRENCY_SYMBOLS = "$€£¥₹"
+CURRENCY_CODES = "USD|EUR|GBP|CAD|AUD|JPY|CNY|INR"
+CURRENCY_RE = rf"[{CURRENCY_SYMBOLS}]|\b(?:{CURRENCY_CODES})\b"
+# Grouped thousands ("1,234" / "1.234") or plain digits, then up to two decimals
+NUMBER_RE = r"(\d{1,3}(?:[,.]\d{3})+|\d+)(?:[,.](\d{1,2}))?(?!\d)"
+# Longest cell the regex-free "$1,234.56" path handles; its digits must sum
+# exactly in a float64
+FAST_WIDTH = 16
+POWERS_OF_TEN = 10.0 ** np.arange(FAST_WIDTH + 1)
+PRICE_HEADER = re.compile(r"^Price \d{4}-\d{2}-\d{2}")
+
+# Columns of the links tab (0-based) and the flags a row can get
+VENDOR_COL = 1
+URL_COL = 2
+FLAGS = ("jump", "change", "lost", "new")
+
+
+def parse_prices(cells: pd.DataFrame) -> pd.DataFrame:
+    """Turn ``"$1,234.56"``-style cells into floats; anything else is NaN.
+
+    Only cells with a currency marker count, so ``"Error: 404"`` stays NaN.
+    Prices repeat across runs, so each distinct string is parsed once and
+    the results are broadcast back with ``factorize``. Strings in the
+    scraper's own ``$1,234.56`` form are parsed without a regex by
+    :func:`parse_dollars`; only the rest go through :func:`parse_with_regex`.
+    """
+    flat = pd.Series(cells.to_numpy(dtype=object).ravel())
+    codes, uniques = pd.factorize(flat, use_na_sentinel=True)
+    text = pd.Series(uniques, dtype=object).astype(str)
+    values, done = parse_dollars(text.to_numpy(dtype=object))
+    if not done.all():
+        values[~done] = parse_with_regex(text[~done])
+    parsed = np.where(codes >= 0, values[np.maximum(codes, 0)] if len(values) else np.nan, np.nan)
+    return pd.DataFrame(parsed.reshape(cells.shape), index=cells.index, columns=cells.columns)
+
+
+def parse_dollars(text: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Return ``(values, parsed)`` for strings written exactly like ``$1,234.56``.
+
+    Covers ``$`` followed by digits, optionally grouped by commas in threes,
+    and optionally two decimals. ``parsed`` is False for every other string,
+    whose value is left NaN for :func:`parse_with_regex`. All strings are
+    joined into one byte buffer, so each check is a handful of array
+    operations over every character at once.
+    """
+    count = len(text)
+    values = np.full(count, np.nan)
+    parsed = np.zeros(count, dtype=bool)
+    if not count:
+        return values, parsed
+    lengths = np.fromiter(map(len, text), dtype=np.int64, count=count)
+    # One byte per character (anything outside ASCII turns into "?" and fails),
+    # each string followed by a separator that is counted with it
+    buf = np.frombuffer(("\n".join(text) + "\n").encode("ascii", "replace"), dtype=np.uint8)
+    cell = np.repeat(np.arange(count), lengths + 1)
+    ends = np.cumsum(lengths + 1) - 1
+    starts = ends - lengths
+
+    def per_cell(where, weights=None):
+        return np.bincount(cell[where], weights=weights, minlength=count)
+
+    digit = (buf >= ord("0")) & (buf <= ord("9"))
+    comma = np.flatnonzero(buf == ord(","))
+    dot = np.flatnonzero(buf == ord("."))
+    # Besides digits, commas and a dot, only the "$" and the separator may appear
+    others = per_cell(np.flatnonzero(~digit & (buf != ord(",")) & (buf != ord("."))))
+    # A dot has exactly two characters after it and ends the integer part
+    dots = per_cell(dot)
+    placed_dots = per_cell(dot, dot == ends[cell[dot]] - 3)
+    int_end = np.where(dots == 1, ends - 3, ends)
+    int_len = int_end - starts - 1
+    # Grouping commas sit every fourth character back from the end of the integer part
+    comma_end = int_end[cell[comma]]
+    slots = per_cell(comma, (comma < comma_end) & ((comma_end - comma) % 4 == 0))
+    commas = per_cell(comma)
+    ok = (
+        (lengths <= FAST_WIDTH)
+        & (buf[starts] == ord("$"))
+        & (others == 2)
+        & (int_len >= 1)
+        & ((dots == 0) | ((dots == 1) & (placed_dots == 1)))
+        & ((commas == 0) | ((commas == int_len // 4) & (int_len % 4 != 0) & (slots == commas)))
+    )
+    # Each digit is worth ten to the number of digits after it in its cell
+    digits = np.flatnonzero(digit)
+    digit_cell = cell[digits]
+    last_digit = np.cumsum(np.bincount(digit_cell, minlength=count)) - 1
+    after = np.minimum(last_digit[digit_cell] - np.arange(len(digits)), FAST_WIDTH)
+    number = np.bincount(
+        digit_cell, weights=(buf[digits] - ord("0")) * POWERS_OF_TEN[after], minlength=count
+    )
+    values[ok] = (number / np.where(dots == 1, 100, 1))[ok]
+    parsed[ok] = True
+    return values, parsed
+
+
+def parse_with_regex(text: pd.Series) -> np.ndarray:
+    """Parse any price format :data:`NUMBER_RE` knows; NaN without a currency marker.
+
+    A dollar amount groups thousands with commas, so ``"$12.345"`` is NaN
+    rather than 12345.
+    """
+    parts = text.str.extract(NUMBER_RE)
+    values = pd.to_numeric(
+        parts[0].str.replace(r"[,.]", "", regex=True) + "." + parts[1].fillna("0"),
+        errors="coerce",
+    ).to_numpy(dtype=float)
+    dotted = parts[0].str.contains(".", regex=False) & text.str.contains("$", regex=False)
+    values[~text.str.contains(CURRENCY_RE, regex=True).to_numpy()] = np.nan
+    values[dotted.fillna(False).to_numpy(dtype=bool)] = np.nan
+    return values
+
+
+def history_from_values(values: Sequence[Sequence[str]]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Split a links-tab ``values.get`` result into row info and price cells.
+
+    Price columns are the ones whose header the scraper wrote
+    (``Price YYYY-MM-DD ...``), in sheet order, i.e. oldest first.
+    """
+    if not values:
+        return pd.DataFrame(columns=["row", "vendor", "url"]), pd.DataFrame()
+    header, body = list(values[0]), [list(row) for row in values[1:]]
+    width = max([len(header)] + [len(row) for row in body])
+    grid = pd.DataFrame(body, columns=range(width)) if body else pd.DataFrame(columns=range(width))
+    header += [""] * (width - len(header))
+    price_cols = [i for i, name in enumerate(header) if PRICE_HEADER.match(str(name))]
+    info = pd.DataFrame(
+        {
+            "row": np.arange(2, len(grid) + 2),
+            "vendor": grid[VENDOR_COL] if VENDOR_COL < width else "",
+            "url": grid[URL_COL] if URL_COL < width else "",
+        }
+    ).fillna("")
+    cells = grid[price_cols]
+    cells.columns = [header[i] for i in price_cols]
+    return info, cells
+
+
+def history_from_results(paths: Sequence[str]) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Line up bulk-mode outputs (JSONL or CSV, oldest first) by URL."""
+    columns = []
+    vendors = pd.Series(dtype=object)
+    for path in paths:
+        if path.endswith(".csv"):
+            frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+        else:
+            frame = pd.read_json(path, lines=True, dtype=False)
+        frame = frame.drop_duplicates("url", keep="last").set_index("url")
+        columns.append(frame["price"].rename(os.path.basename(path)))
+        if "vendor" in frame:
+            vendors = frame["vendor"].combine_first(vendors)
+    cells = pd.concat(columns, axis=1) if columns else pd.DataFrame()
+    info = pd.DataFrame(
+        {
+            "row": np.arange(1, len(cells) + 1),
+            "vendor": vendors.reindex(cells.index).fillna("").to_numpy(),
+            "url": cells.index,
+        }
+    )
+    return info, cells.reset_index(drop=True)
+
+
+def trailing_median(values: np.ndarray, window: int) -> np.ndarray:
+    """Median of the ``window`` cells before each cell in its row, ignoring NaN.
+
+    Works on the whole matrix at once: NaN sorts last, so the median of each
+    window is read from the middle of its valid prefix.
+    """
+    rows, runs = values.shape
+    padded = np.concatenate([np.full((rows, window), np.nan), values[:, :-1]], axis=1)
+    windows = np.sort(np.lib.stride_tricks.sliding_window_view(padded, window, axis=1), axis=2)
+    valid = (~np.isnan(windows)).sum(axis=2)
+    lower = np.take_along_axis(windows, np.maximum((valid - 1) // 2, 0)[..., None], axis=2)[..., 0]
+    upper = np.take_along_axis(windows, (valid // 2)[..., None].clip(max=window - 1), axis=2)[..., 0]
+    return np.where(valid > 0, (lower + upper) / 2, np.nan)
+
+
+def analyze(prices: pd.DataFrame, window: int = 5, jump: float = 10.0, change: float = 0.5) -> pd.DataFrame:
+    """Per-row statistics and flags for a rows x runs price matrix.
+
+    ``jump`` flags a latest price at least ``jump`` times above or below the
+    median of the previous ``window`` runs, which usually means an extractor
+    read the wrong number. ``change`` flags a relative move against the last
+    known price; ``lost`` and ``new`` mark prices that vanished or appeared.
+    History outliers count every earlier cell that jumped the same way.
+    """
+    values = prices.to_numpy(dtype=float)
+    rows, runs = values.shape
+    stats = pd.DataFrame(index=prices.index)
+    if runs == 0:
+        return stats.assign(latest=np.nan, flags="")
+    latest = values[:, -1]
+    previous = (
+        prices.iloc[:, :-1].ffill(axis=1).iloc[:, -1].to_numpy() if runs > 1 else np.full(rows, np.nan)
+    )
+    trailing = trailing_median(values, window)
+    median = trailing[:, -1]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = latest - previous
+        pct = delta / previous
+        ratio = latest / median
+        cell_ratio = values / trailing
+    outliers = ((cell_ratio >= jump) | (cell_ratio <= 1 / jump)).sum(axis=1)
+
+    flag_masks = {
+        "jump": (ratio >= jump) | (ratio <= 1 / jump),
+        "change": np.abs(pct) >= change,
+        "lost": np.isnan(latest) & ~np.isnan(previous),
+        "new": ~np.isnan(latest) & np.isnan(previous) & (runs > 1),
+    }
+    flags = np.full(rows, "", dtype=object)
+    for name in FLAGS:
+        mask = flag_masks[name]
+        flags[mask] = np.where(flags[mask] == "", name, flags[mask] + "," + name)
+
+    return stats.assign(
+        latest=latest,
+        previous=previous,
+        delta=delta,
+        pct_change=pct,
+        median=median,
+        ratio=ratio,
+        history_outliers=outliers,
+        known_runs=(~np.isnan(values)).sum(axis=1),
+        flags=flags,
+    )
+
+
+def build_report(
+    info: pd.DataFrame,
+    cells: pd.DataFrame,
+    window: int = 5,
+    jump: float = 10.0,
+    change: float = 0.5,
+) -> Tuple[dict, pd.DataFrame]:
+    """Return ``(summary, flagged rows)`` for a price history."""
+    started = time.perf_counter()
+    prices = parse_prices(cells)
+    stats = analyze(prices, window=window, jump=jump, change=change)
+    table = pd.concat([info.reset_index(drop=True), stats.reset_index(drop=True)], axis=1)
+    flagged = table[table["flags"] != ""]
+    flagged = flagged.assign(_order=flagged["flags"].str.contains("jump")).sort_values(
+        ["_order", "history_outliers"], ascending=False
+    ).drop(columns="_order")
+    summary = {
+        "rows": int(len(table)),
+        "runs": int(cells.shape[1]),
+        "priced": int(np.count_nonzero(~np.isnan(stats["latest"].to_numpy(dtype=float)))),
+        "flags": {name: int(table["flags"].str.contains(name).sum()) for name in FLAGS},
+        "history_outliers": int(stats["history_outliers"].sum()) if len(stats) else 0,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+    return summary, flagged
+
+
+def write_report(flagged: pd.DataFrame, summary: dict, path: str) -> None:
+    """Write flagged rows to ``path`` (CSV) and the summary next to it."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    flagged.round({"delta": 2, "pct_change": 4, "median": 2, "ratio": 3}).to_csv(path, index=False)
+    with open(os.path.splitext(path)[0] + ".json", "w", encoding="utf-8") as fh:
+        json.dump(summary, fh, indent=2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report price changes across bulk-mode outputs")
+    parser.add_argument("results", nargs="+", help="JSONL/CSV outputs of --input runs, oldest first")
+    parser.add_argument("--output", default="price-report.csv", help="CSV of flagged rows")
+    parser.add_argument("--window", type=int, default=5, help="Runs in the rolling median")
+    parser.add_argument("--jump", type=float, default=10.0, help="Ratio to the median flagged as a jump")
+    parser.add_argument("--change", type=float, default=0.5, help="Relative change flagged as a change")
+    args = parser.parse_args(argv)
+    info, cells = history_from_results(args.results)
+    summary, flagged = build_report(info, cells, args.window, args.jump, args.change)
+    write_report(flagged, summary, args.output)
+    json.dump(summary, sys.stdout, indent=2)
+    print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
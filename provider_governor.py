@@ -0,0 +1,367 @@
+import asyncio
+import datetime
+import email.utils
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Iterable, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Concurrent requests allowed on each provider's entry-level plan. Override
+# (and add "rate", "burst" and "monthly_credits") with PROVIDER_LIMITS.
+DEFAULT_LIMITS = {
+    "scraperapi": {"concurrency": 5},
+    "scrapingbee": {"concurrency": 5},
+    "scrape.do": {"concurrency": 5},
+    "apify": {"concurrency": 10},
+    "zyte": {"concurrency": 10},
+    "brightdata": {"concurrency": 10},
+}
+# Rest after a 429 that carries no Retry-After, doubled per repeat and capped
+DEFAULT_BACKOFF = 10.0
+MAX_BACKOFF = 300.0
+# How often a waiter rechecks a provider whose slots are all busy
+SLOT_POLL = 0.05
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Return the seconds a ``Retry-After`` header asks for (delta or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(when.timestamp() - (now or time.time()), 0.0)
+
+
+class TokenBucket:
+    """Requests-per-second limit allowing short bursts."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        self.rate = rate
+        self.capacity = burst or max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self) -> bool:
+        """Take one token if one is available; never waits."""
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def delay(self) -> float:
+        """Seconds until a token is available (0 if one is now)."""
+        with self._lock:
+            self._refill()
+            return max((1 - self.tokens) / self.rate, 0.0)
+
+
+class Provider:
+    """Limits, live state and per-run counters of one paid provider."""
+
+    def __init__(self, name: str, limits: Mapping):
+        self.name = name
+        self.concurrency = limits.get("concurrency")
+        self.monthly_credits = limits.get("monthly_credits")
+        self.in_flight = 0
+        rate = limits.get("rate")
+        self.bucket = TokenBucket(rate, limits.get("burst")) if rate else None
+        self.resume_at = 0.0
+        self.backoff = DEFAULT_BACKOFF
+        self.reset_counters()
+
+    def reset_counters(self) -> None:
+        self.requests = 0
+        self.credits = 0.0
+        self.throttled = 0
+        self.waited = 0.0
+        self.skipped = 0
+
+
+class ProviderGovernor:
+    """Per-provider concurrency, rate, Retry-After and monthly credit control.
+
+    Each provider gets a count of requests in flight, capped at its
+    concurrent-request limit, and an optional token bucket. Waiting for a
+    slot or a token happens on the event loop in :meth:`wait_for_capacity`;
+    :meth:`acquire` itself never blocks, so it is safe in worker threads;
+    :meth:`wait_in_thread` is the blocking wait for a worker's second request.
+    A 429 (or a 503 with ``Retry-After``) rests the provider until the time
+    it asked for. Credits charged this month are
+    persisted to ``path`` and reset when the month changes. A provider is
+    skipped once its budget is gone, and also while it has less left than
+    the rest of the run is projected to need and another provider has enough.
+    """
+
+    def __init__(self, limits: Optional[Mapping[str, Mapping]] = None, path: Optional[str] = None):
+        self.limits = {name: dict(value) for name, value in DEFAULT_LIMITS.items()}
+        for name, value in (limits or {}).items():
+            self.limits.setdefault(name, {}).update(value)
+        self.path = path
+        self.providers: Dict[str, Provider] = {}
+        self.month = self._current_month()
+        self.used: Dict[str, float] = {}
+        self.rows_total = 0
+        self.rows_done = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    data = json.load(fh)
+                if data.get("month") == self.month:
+                    self.used = {k: float(v) for k, v in data.get("used", {}).items()}
+            except Exception as e:
+                logger.warning("Ignoring unreadable provider credits %s: %s", path, e)
+
+    @staticmethod
+    def _current_month() -> str:
+        return datetime.date.today().strftime("%Y-%m")
+
+    def provider(self, name: str) -> Provider:
+        with self._lock:
+            if name not in self.providers:
+                self.providers[name] = Provider(name, self.limits.get(name, {}))
+            return self.providers[name]
+
+    # --- budget ------------------------------------------------------------
+
+    def remaining(self, name: str) -> Optional[float]:
+        """Credits left this month, or None without a configured budget."""
+        budget = self.provider(name).monthly_credits
+        if budget is None:
+            return None
+        with self._lock:
+            if self._current_month() != self.month:
+                self.month, self.used, self._dirty = self._current_month(), {}, True
+            return budget - self.used.get(name, 0.0)
+
+    def begin_run(self, rows: int) -> None:
+        """Reset the per-run counters; ``rows`` feeds the projected need."""
+        with self._lock:
+            self.rows_total = rows
+            self.rows_done = 0
+            for provider in self.providers.values():
+                provider.reset_counters()
+
+    def row_done(self) -> None:
+        with self._lock:
+            self.rows_done += 1
+
+    def projected_need(self) -> float:
+        """Credits the rest of the run needs at this run's spend per row so far."""
+        with self._lock:
+            if not self.rows_done:
+                return 0.0
+            spent = sum(provider.credits for provider in self.providers.values())
+            return spent / self.rows_done * max(self.rows_total - self.rows_done, 0)
+
+    def _has_budget_for(self, name: str, need: float) -> bool:
+        remaining = self.remaining(name)
+        return remaining is None or remaining >= need
+
+    def _fundable(self, name: str, cost: float, alternatives: Iterable[str]) -> bool:
+        """False if ``name`` is out of credits for this request or the run."""
+        if not self._has_budget_for(name, cost):
+            return False
+        need = self.projected_need()
+        if need > cost and not self._has_budget_for(name, need):
+            return not any(
+                self._has_budget_for(other, need) for other in alternatives if other != name
+            )
+        return True
+
+    # --- requests ----------------------------------------------------------
+
+    def delay(self, name: str, cost: float = 1, alternatives: Iterable[str] = ()) -> Optional[float]:
+        """Seconds until ``name`` could take a request, or None if it cannot this run.
+
+        A provider with every slot busy reports :data:`SLOT_POLL`, since the
+        time a slot frees up is not known in advance.
+        """
+        if not self._fundable(name, cost, alternatives):
+            return None
+        provider = self.provider(name)
+        with self._lock:
+            rest = provider.resume_at - time.monotonic()
+            busy = bool(provider.concurrency) and provider.in_flight >= provider.concurrency
+        if rest > 0:
+            return rest
+        if busy:
+            return SLOT_POLL
+        return provider.bucket.delay() if provider.bucket else 0.0
+
+    def _next_wait(
+        self,
+        names: list,
+        cost: Union[float, Mapping[str, float]],
+        started: float,
+        timeout: Optional[float],
+    ) -> Optional[float]:
+        """Seconds to sleep before checking ``names`` again; 0 once one is free, None to give up."""
+        costs = cost if isinstance(cost, Mapping) else dict.fromkeys(names, cost)
+        delays = {name: self.delay(name, costs.get(name, 1), names) for name in names}
+        usable = {name: wait for name, wait in delays.items() if wait is not None}
+        if not usable:
+            return None
+        name = min(usable, key=usable.get)
+        wait = usable[name]
+        now = time.monotonic()
+        if wait <= 0:
+            provider = self.provider(name)
+            with self._lock:
+                provider.waited += now - started
+            return 0.0
+        if timeout is not None and now - started >= timeout:
+            return None
+        if timeout is not None:
+            wait = min(wait, started + timeout - now)
+        return wait
+
+    async def wait_for_capacity(
+        self,
+        names: Iterable[str],
+        cost: Union[float, Mapping[str, float]] = 1,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """Wait on the event loop until one of ``names`` could take a request.
+
+        ``cost`` is the credits the request would take, or a mapping of them
+        per provider. Returns False at once when none of them can be used
+        this run, or after ``timeout`` seconds. Callers wait here before
+        handing the request to a worker thread, so throttled rows park as
+        coroutines rather than tie up the default executor.
+        """
+        names = list(names)
+        started = time.monotonic()
+        while True:
+            wait = self._next_wait(names, cost, started, timeout)
+            if wait is None:
+                return False
+            if not wait:
+                return True
+            await asyncio.sleep(wait)
+
+    def wait_in_thread(
+        self,
+        names: Iterable[str],
+        cost: Union[float, Mapping[str, float]] = 1,
+        timeout: Optional[float] = None,
+    ) -> bool:
+        """Blocking :meth:`wait_for_capacity` for a request a worker thread decides on.
+
+        Only for a second request within the same fetch, such as a render
+        after a plain miss; keep ``timeout`` short since the thread is held.
+        """
+        names = list(names)
+        started = time.monotonic()
+        while True:
+            wait = self._next_wait(names, cost, started, timeout)
+            if wait is None:
+                return False
+            if not wait:
+                return True
+            time.sleep(wait)
+
+    def acquire(self, name: str, cost: float = 1, alternatives: Iterable[str] = ()) -> bool:
+        """Reserve a request slot on ``name`` without waiting; False means skip it.
+
+        Use :meth:`wait_for_capacity` on the event loop first to queue for a
+        slot. Every True must be paired with :meth:`release`.
+        """
+        provider = self.provider(name)
+        if time.monotonic() < provider.resume_at or not self._fundable(name, cost, alternatives):
+            with self._lock:
+                provider.skipped += 1
+            return False
+        with self._lock:
+            if provider.concurrency and provider.in_flight >= provider.concurrency:
+                provider.skipped += 1
+                return False
+            if provider.bucket and not provider.bucket.take():
+                provider.skipped += 1
+                return False
+            provider.in_flight += 1
+            provider.requests += 1
+        return True
+
+    def release(
+        self,
+        name: str,
+        status: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        cost: float = 1,
+    ) -> Optional[float]:
+        """Free the slot and account for the response.
+
+        Successful responses (2xx and 404, which the providers bill) are
+        charged ``cost``. Returns the pause in seconds if the provider asked
+        to slow down.
+        """
+        provider = self.provider(name)
+        with self._lock:
+            provider.in_flight = max(provider.in_flight - 1, 0)
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        if status == 429 or (status == 503 and retry_after is not None):
+            with self._lock:
+                pause = retry_after if retry_after is not None else provider.backoff
+                provider.backoff = min(provider.backoff * 2, MAX_BACKOFF)
+                provider.resume_at = max(provider.resume_at, time.monotonic() + pause)
+                provider.throttled += 1
+            return pause
+        if status is not None and (200 <= status < 300 or status == 404):
+            with self._lock:
+                provider.backoff = DEFAULT_BACKOFF
+                provider.credits += cost
+                self.used[name] = self.used.get(name, 0.0) + cost
+                self._dirty = True
+        return None
+
+    def summary(self) -> Dict[str, dict]:
+        """Per-provider counters for the current run."""
+        report = {}
+        for name, provider in list(self.providers.items()):
+            if not (provider.requests or provider.skipped):
+                continue
+            report[name] = {
+                "requests": provider.requests,
+                "credits": provider.credits,
+                "throttled": provider.throttled,
+                "waited": provider.waited,
+                "skipped": provider.skipped,
+                "remaining": self.remaining(name),
+            }
+        return report
+
+    def save(self) -> None:
+        """Persist this month's used credits if they changed."""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({"month": self.month, "used": self.used}, fh, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+            self._dirty = False
@@ -0,0 +1,74 @@
+import threading
+from collections import defaultdict
+
+# Approximate credits per request (plain, rendered) from the providers'
+# published pricing; only used to estimate savings in the run report.
+PROVIDER_CREDITS = {
+    "scraperapi": (1, 10),
+    "scrapingbee": (1, 5),
+    "scrape.do": (1, 5),
+    "apify": (1, 5),
+    "zyte": (1, 10),
+}
+DEFAULT_CREDITS = (1, 5)
+
+
+class RenderStats:
+    """Per-run tally of plain and rendered scraping-service fetches.
+
+    A plain fetch that yields a price saves the credits and latency of the
+    rendered fetch it replaced; one that misses and escalates wastes its own.
+    Rendered latency is estimated from the rendered fetches of the same run.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.plain_hits = 0
+            self.escalations = 0
+            self.rendered = 0
+            self.credits_saved = 0
+            self.credits_spent = 0
+            self._plain_seconds = []
+            self._wasted_seconds = []
+            self._render_seconds = defaultdict(list)
+
+    def record(self, provider: str, mode: str, seconds: float, found: bool) -> None:
+        plain_cost, render_cost = PROVIDER_CREDITS.get(provider, DEFAULT_CREDITS)
+        with self._lock:
+            if mode == "render":
+                self.rendered += 1
+                self.credits_spent += render_cost
+                self._render_seconds[provider].append(seconds)
+                return
+            self.credits_spent += plain_cost
+            if found:
+                self.plain_hits += 1
+                self.credits_saved += render_cost - plain_cost
+                self._plain_seconds.append(seconds)
+            else:
+                self.escalations += 1
+                self.credits_saved -= plain_cost
+                self._wasted_seconds.append(seconds)
+
+    def summary(self) -> dict:
+        with self._lock:
+            renders = [s for values in self._render_seconds.values() for s in values]
+            seconds_saved = None
+            if renders:
+                avg_render = sum(renders) / len(renders)
+                seconds_saved = (
+                    sum(avg_render - s for s in self._plain_seconds)
+                    - sum(self._wasted_seconds)
+                )
+            return {
+                "plain_hits": self.plain_hits,
+                "escalations": self.escalations,
+                "rendered": self.rendered,
+                "credits_spent": self.credits_spent,
+                "credits_saved": self.credits_saved,
+                "seconds_saved": seconds_saved,
+            }
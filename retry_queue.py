@@ -0,0 +1,91 @@
+import heapq
+import itertools
+import random
+import re
+import time
+from collections import Counter
+from typing import Any, Optional
+
+# Failure kinds worth another attempt later in the run
+RETRYABLE = {"timeout", "blocked", "exception"}
+BLOCK_STATUSES = {403, 429}
+
+
+def classify_failure(status: Optional[int], method: str, result: str) -> str:
+    """Sort a failed row into ``deadline``, ``circuit-open``, ``blocked``,
+    ``timeout``, ``exception`` or ``selector-miss``."""
+    text = (result or "").strip().lower()
+    if method in ("deadline", "run-budget"):
+        return "deadline"
+    if method == "circuit-open":
+        return "circuit-open"
+    if method.startswith("blocked:") or status in BLOCK_STATUSES or re.search(r"\b(403|429)\b", text):
+        return "blocked"
+    if method == "timeout" or text.startswith("timeout"):
+        return "timeout"
+    if method == "exception" or text.startswith("error"):
+        return "exception"
+    return "selector-miss"
+
+
+class RetryScheduler:
+    """Deferred queue of failed rows, released after an exponential backoff.
+
+    Attempt ``n`` waits ``base_delay * 2**n`` seconds, capped at
+    ``max_delay``, scaled by a random factor in ``[1 - jitter, 1 + jitter]``
+    so retries against one domain do not fire in lockstep. At most
+    ``per_domain`` retries are scheduled for a domain per run.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 2,
+        base_delay: float = 5.0,
+        max_delay: float = 60.0,
+        per_domain: int = 10,
+        jitter: float = 0.5,
+        clock=time.monotonic,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.per_domain = per_domain
+        self.jitter = jitter
+        self.clock = clock
+        self.scheduled = Counter()
+        self.kinds = Counter()
+        self._heap = []
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def offer(self, item: Any, domain: str, kind: str, attempt: int) -> Optional[float]:
+        """Schedule ``item`` for retry; returns the delay, or None if refused."""
+        if kind not in RETRYABLE or attempt >= self.max_attempts:
+            return None
+        if self.per_domain and self.scheduled[domain] >= self.per_domain:
+            return None
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        self.scheduled[domain] += 1
+        self.kinds[kind] += 1
+        heapq.heappush(self._heap, (self.clock() + delay, next(self._seq), item))
+        return delay
+
+    def next_delay(self) -> Optional[float]:
+        """Seconds until the next item is due (0 if one is), None if empty."""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self.clock())
+
+    def pop_due(self) -> Optional[Any]:
+        if self._heap and self._heap[0][0] <= self.clock():
+            return heapq.heappop(self._heap)[2]
+        return None
+
+    def drain(self):
+        """Remove and return every waiting item, due or not."""
+        items = [entry[2] for entry in sorted(self._heap)]
+        self._heap.clear()
+        return items
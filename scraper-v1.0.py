@@ -11,13 +11,48 @@ from googleapiclient.discovery import build
 from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import random
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 import json
 import argparse
 from dotenv import load_dotenv
-from harbor_freight_scraper import fetch_price as hf_fetch_price
-from northern_tool_scraper import price_from_page as nt_price_from_page
+from harbor_freight_scraper import build_dy_url as hf_build_dy_url, fetch_price as hf_fetch_price
+from northern_tool_scraper import (
+    JSON_TEMPLATE as NT_JSON_TEMPLATE,
+    extract_part_number as nt_extract_part_number,
+    parse_price as nt_parse_price,
+    price_from_page as nt_price_from_page,
+)
+from caster_city_scraper import bulk_prices_for_urls as caster_city_bulk_prices
+from bulk_io import ResultWriter, read_rows
+from listing_harvest import (
+    VENDORS as LISTING_VENDORS,
+    harvest_listing_page,
+    harvest_vendor,
+    listing_judge,
+    load_listings,
+    normalize_product_url,
+    vendor_for,
+)
+from circuit_breaker import BreakerRegistry, CircuitOpen
+from strategy_memo import StrategyMemo
+from retry_queue import RetryScheduler, classify_failure
+from render_policy import DEFAULT_CREDITS, PROVIDER_CREDITS, RenderStats
+from provider_governor import ProviderGovernor
+from async_profiler import AsyncProfiler
+from url_canon import product_key
+from block_detect import Blocked, detect_block, is_challenge_title
+from page_artifacts import PageArtifacts
+from html_archive import HtmlArchive
+from daemon_api import ApiServer, Metrics, next_run_time, parse_times
 import subprocess
+import signal
+import functools
+from concurrent.futures import ProcessPoolExecutor
+import contextlib
+import threading
+import hashlib
+import time
+from decimal import Decimal
 
 # Load environment variables from .env files if present
 load_dotenv()
@@ -35,6 +70,8 @@ CREDENTIALS_FILE = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
 HEADLESS_ENV = os.environ.get("HEADLESS", "true").lower() in ("1", "true", "yes", "y")
 HEADLESS = HEADLESS_ENV
 CONCURRENCY = int(os.environ.get("SCRAPER_CONCURRENCY", "2"))
+# Optional proxy for all browser traffic, e.g. http://127.0.0.1:3128
+BROWSER_PROXY = os.environ.get("BROWSER_PROXY")
 
 # API keys for optional scraping services
 SCRAPERAPI_KEY = os.environ.get("SCRAPERAPI_KEY")
@@ -46,6 +83,103 @@ BRIGHTDATA_BROWSER_URL = os.environ.get("BRIGHTDATA_BROWSER_URL")
 BRIGHTDATA_API_TOKEN = os.environ.get("BRIGHTDATA_API_TOKEN")
 STEALTH_MODE = os.environ.get("STEALTH_MODE", "true").lower() in ("1", "true", "yes", "y")
 
+# Ask scraping services for non-rendered HTML first and render only when needed
+PROXY_PLAIN_FIRST = os.environ.get("PROXY_PLAIN_FIRST", "true").lower() in ("1", "true", "yes", "y")
+RENDER_RECHECK_DAYS = float(os.environ.get("RENDER_RECHECK_DAYS", "7"))
+
+# Grainger engine: "playwright" or "selenium" (pooled WebDriver tier tried first)
+GRAINGER_ENGINE = os.environ.get("GRAINGER_ENGINE", "playwright").lower()
+SELENIUM_DRIVERS = int(os.environ.get("SELENIUM_DRIVERS", str(CONCURRENCY)))
+SELENIUM_MAX_PAGES = int(os.environ.get("SELENIUM_MAX_PAGES", "50"))
+
+# Plain HTTP attempt before launching the browser for generic vendors
+STATIC_FIRST = os.environ.get("STATIC_FIRST", "true").lower() in ("1", "true", "yes", "y")
+STATIC_RECHECK_DAYS = float(os.environ.get("STATIC_RECHECK_DAYS", "7"))
+
+# Price whole vendor catalogs in a few requests before the per-row pass
+CASTER_CITY_BULK = os.environ.get("CASTER_CITY_BULK", "true").lower() in ("1", "true", "yes", "y")
+CASTER_CITY_BASE_URL = os.environ.get("CASTER_CITY_BASE_URL", "https://castercity.com")
+HARVEST_LISTINGS_FILE = os.environ.get("HARVEST_LISTINGS_FILE", "harvest_listings.json")
+
+# Crawl HTTP-only vendors and static-HTML rows with Scrapy before the browser pass
+SCRAPY_ENGINE = os.environ.get("SCRAPY_ENGINE", "false").lower() in ("1", "true", "yes", "y")
+SCRAPY_PER_DOMAIN = int(os.environ.get("SCRAPY_PER_DOMAIN", "8"))
+SCRAPY_CACHE_HOURS = float(os.environ.get("SCRAPY_CACHE_HOURS", "0"))
+
+# Time budgets in seconds (0 disables); overridable with --row-budget/--run-budget
+ROW_BUDGET = float(os.environ.get("ROW_BUDGET", "180"))
+RUN_BUDGET = float(os.environ.get("RUN_BUDGET", "0"))
+
+# Deferred retries for blocked, timed-out and crashed rows after the main pass
+RETRY_ATTEMPTS = int(os.environ.get("RETRY_ATTEMPTS", "2"))
+RETRY_BASE_DELAY = float(os.environ.get("RETRY_BASE_DELAY", "5"))
+RETRY_MAX_DELAY = float(os.environ.get("RETRY_MAX_DELAY", "60"))
+RETRY_PER_DOMAIN = int(os.environ.get("RETRY_PER_DOMAIN", "10"))
+
+# Local state kept between runs (strategy memo and similar caches)
+STATE_DIR = os.environ.get("SCRAPER_STATE_DIR", ".scraper_state")
+STRATEGY_MEMO = StrategyMemo(
+    os.environ.get("STRATEGY_MEMO_FILE", os.path.join(STATE_DIR, "strategy_memo.json"))
+)
+
+# Compressed copies of fetched pages for --reextract (HTML_ARCHIVE_MB=0 disables)
+HTML_ARCHIVE_DIR = os.environ.get("HTML_ARCHIVE_DIR", os.path.join(STATE_DIR, "html_archive"))
+HTML_ARCHIVE_MB = float(os.environ.get("HTML_ARCHIVE_MB", "500"))
+ARCHIVE = (
+    HtmlArchive(
+        HTML_ARCHIVE_DIR,
+        max_bytes=int(HTML_ARCHIVE_MB * (1 << 20)),
+        codec=os.environ.get("HTML_ARCHIVE_CODEC") or None,
+    )
+    if HTML_ARCHIVE_MB > 0
+    else None
+)
+
+# Price-history report after each sheet run (also --report): rolling-median
+# window in runs, ratio to that median flagged as a jump, relative change alert
+PRICE_REPORT = os.environ.get("PRICE_REPORT", "true").lower() in ("1", "true", "yes", "y")
+PRICE_REPORT_WINDOW = int(os.environ.get("PRICE_REPORT_WINDOW", "5"))
+PRICE_JUMP_FACTOR = float(os.environ.get("PRICE_JUMP_FACTOR", "10"))
+PRICE_CHANGE_ALERT = float(os.environ.get("PRICE_CHANGE_ALERT", "0.5"))
+
+# Circuit breakers that stop calling a tier that keeps failing for a domain
+BREAKERS = BreakerRegistry(
+    failure_rate=float(os.environ.get("BREAKER_FAILURE_RATE", "0.5")),
+    min_calls=int(os.environ.get("BREAKER_MIN_CALLS", "3")),
+    window=int(os.environ.get("BREAKER_WINDOW", "10")),
+    cooldown=float(os.environ.get("BREAKER_COOLDOWN", "120")),
+)
+
+# Plain vs rendered scraping-service fetches in the current run
+RENDER_STATS = RenderStats()
+
+# Concurrency, rate and monthly credit limits of the paid scraping APIs, as
+# JSON: {"scraperapi": {"concurrency": 20, "rate": 5, "monthly_credits": 250000}}.
+# PROVIDER_WAIT caps how long a row waits for a free slot before moving on.
+GOVERNOR = ProviderGovernor(
+    json.loads(os.environ.get("PROVIDER_LIMITS") or "{}"),
+    os.environ.get("PROVIDER_CREDITS_FILE", os.path.join(STATE_DIR, "provider_credits.json")),
+)
+PROVIDER_WAIT = float(os.environ.get("PROVIDER_WAIT", "30"))
+
+# Event-loop profiling (set via --profile); sampling interval and stall threshold in ms
+PROFILE_PATH = None
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+PROFILE_STALL_MS = float(os.environ.get("PROFILE_STALL_MS", "100"))
+PROFILER = None
+
+# HAR archives for deterministic offline browser runs (set via --record-har/--replay-har)
+HAR_RECORD_DIR = None
+HAR_REPLAY_DIR = None
+
+# Daemon mode (--daemon): local API address, optional bearer token and schedule
+DAEMON_HOST = os.environ.get("DAEMON_HOST", "127.0.0.1")
+DAEMON_PORT = int(os.environ.get("DAEMON_PORT", "8765"))
+DAEMON_TOKEN = os.environ.get("DAEMON_TOKEN")
+DAEMON_EVERY_MINUTES = float(os.environ.get("DAEMON_EVERY_MINUTES", "0"))
+DAEMON_AT = os.environ.get("DAEMON_AT", "")
+DAEMON_MAX_URLS = int(os.environ.get("DAEMON_MAX_URLS", "50"))
+
 # === LOGGING SETUP ===
 logging.basicConfig(
     level=logging.INFO,
@@ -135,6 +269,57 @@ Object.defineProperty(navigator, 'plugins', { get: () => [1,2,3,4] });
 Object.defineProperty(navigator, 'languages', { get: () => ['en-US', 'en'] });
 """
 
+class DeadlineExceeded(Exception):
+    """Raised when a row has used up its time budget."""
+
+
+class Deadline:
+    """Absolute point in time shared by every tier working on a row or run.
+
+    ``Deadline()`` never expires. Helpers cap their own timeouts with
+    :meth:`timeout` / :meth:`timeout_ms` so a tier only uses what remains.
+    """
+
+    def __init__(self, seconds=None):
+        self.expires = time.monotonic() + seconds if seconds else None
+
+    def child(self, seconds=None):
+        """Return a deadline ``seconds`` from now that never outlives this one."""
+        child = Deadline(seconds)
+        if self.expires is not None and (child.expires is None or self.expires < child.expires):
+            child.expires = self.expires
+        return child
+
+    def remaining(self):
+        if self.expires is None:
+            return None
+        return max(self.expires - time.monotonic(), 0.0)
+
+    def expired(self):
+        return self.expires is not None and time.monotonic() >= self.expires
+
+    def check(self):
+        """Raise :class:`DeadlineExceeded` if the budget is used up."""
+        if self.expired():
+            raise DeadlineExceeded("row time budget exhausted")
+
+    def timeout(self, seconds):
+        """Return ``seconds`` capped to the remaining budget."""
+        remaining = self.remaining()
+        if remaining is None:
+            return seconds
+        return max(min(seconds, remaining), 0.001)
+
+    def timeout_ms(self, ms):
+        """Millisecond variant of :meth:`timeout` for Playwright calls.
+
+        Never returns 0, which Playwright treats as "no timeout".
+        """
+        return max(int(self.timeout(ms / 1000) * 1000), 1)
+
+
+NO_DEADLINE = Deadline()
+
 def extract_price(text):
     """Return the first price-like string found in the text.
 
@@ -153,10 +338,20 @@ def extract_price(text):
             return match.group(0)
     return None
 
+def with_currency(value):
+    """Return a bare number such as ``"89.9"`` as ``"$89.90"``; other text as is.
+
+    JSON price APIs send plain numbers, which :func:`extract_price` rejects
+    and which would read as ``$89`` with only one decimal.
+    """
+    text = str(value).strip()
+    if extract_price(text) or not re.fullmatch(r"\d[\d,]*(?:\.\d+)?", text):
+        return text
+    return f"${Decimal(text.replace(',', '')):,.2f}"
+
 def bs_price_scan(html):
     """Parse HTML with BeautifulSoup to locate a price when regex fails."""
-    soup = BeautifulSoup(html, "html.parser")
-    for text_node in soup.stripped_strings:
+    for text_node in PageArtifacts.of(html).strings:
         price = extract_price(text_node)
         if price:
             return price
@@ -166,7 +361,10 @@ def _json_price_search(data):
     """Recursively look for a numeric price field in JSON data."""
     if isinstance(data, dict):
         for key, value in data.items():
-            if key.lower() == "price" and isinstance(value, (str, int, float)):
+            if key.lower() == "price" and isinstance(value, float):
+                # 390.7 would otherwise read as "$390" in extract_price
+                return f"{value:.2f}"
+            if key.lower() == "price" and isinstance(value, (str, int)):
                 return str(value)
             found = _json_price_search(value)
             if found:
@@ -181,14 +379,9 @@ def _json_price_search(data):
 
 def script_price_scan(html):
     """Search <script> tags for a price value."""
-    soup = BeautifulSoup(html, "html.parser")
-    for script in soup.find_all("script"):
-        content = script.string or ""
-        if script.get("type") == "application/ld+json":
-            try:
-                data = json.loads(content)
-            except Exception:
-                data = None
+    doc = PageArtifacts.of(html)
+    for (kind, content), data in zip(doc.scripts, doc.script_json):
+        if kind == "application/ld+json":
             if data:
                 price = _json_price_search(data)
                 if price:
@@ -201,6 +394,7 @@ def script_price_scan(html):
 
 def initial_state_price_scan(html):
     """Look for window.__INITIAL_STATE__ JSON data and parse a price."""
+    html = PageArtifacts.of(html).html
     match = re.search(r"__INITIAL_STATE__\s*=\s*(\{.*?\})\s*;", html, re.DOTALL)
     if match:
         try:
@@ -212,83 +406,308 @@ def initial_state_price_scan(html):
             return None
     return None
 
-def fetch_with_scraping_services(url):
-    """Fetch a URL using one of the configured scraping services."""
+# Shared connection pool for plain HTTP fetches
+HTTP_SESSION = requests.Session()
+HTTP_SESSION.mount("http://", HTTPAdapter(pool_connections=16, pool_maxsize=max(CONCURRENCY * 2, 10)))
+HTTP_SESSION.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=max(CONCURRENCY * 2, 10)))
+HTTP_SESSION.headers.update(
+    {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/113.0.0.0 Safari/537.36"
+        ),
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+    }
+)
+
+def in_har_mode():
+    """True while recording or replaying HAR archives.
+
+    Both modes run only the browser path, so a recording holds the traffic
+    that its replay will ask for.
+    """
+    return bool(HAR_RECORD_DIR or HAR_REPLAY_DIR)
+
+def archive_page(url, html, source, status=None):
+    """Keep a compressed copy of a fetched page for --reextract."""
+    if ARCHIVE is None or HAR_REPLAY_DIR or not html:
+        return
+    try:
+        ARCHIVE.record_page(url, html, source, status)
+    except OSError as e:
+        logger.debug("Could not archive %s: %s", url, e)
+
+def fetch_static_html(url, deadline=NO_DEADLINE):
+    """GET a page without a browser and return ``(status, html)``."""
+    if in_har_mode() or deadline.expired():
+        return None, None
+    try:
+        resp = HTTP_SESSION.get(url, timeout=deadline.timeout(10))
+    except Exception as e:
+        logger.debug("Static fetch failed for %s: %s", url, e)
+        return None, None
+    content_type = resp.headers.get("Content-Type", "")
+    if resp.status_code != 200 or "html" not in content_type.lower():
+        return resp.status_code, None
+    archive_page(url, resp.text, "static", resp.status_code)
+    return resp.status_code, resp.text
+
+def static_price_from_html(html, selector=None):
+    """Find a price in server-rendered HTML without running any JavaScript.
+
+    A sheet ``selector`` is authoritative: if it finds no price, None is
+    returned so the row goes to the browser rather than taking another price.
+    """
+    doc = PageArtifacts.of(html)
+    soup = doc.soup
+    if selector:
+        try:
+            el = soup.select_one(selector)
+        except Exception:
+            el = None  # Playwright-only selector syntax
+        if not el:
+            return None
+        return extract_price(el.get("content") or el.get_text() or "")
+    # Structured price attributes usually hold a bare number such as "19.45"
+    for sel in ('meta[property="product:price:amount"]', '[itemprop="price"]'):
+        el = soup.select_one(sel)
+        if not el:
+            continue
+        value = (el.get("content") or el.get_text() or "").strip()
+        price = extract_price(value) or extract_price(f"${value}")
+        if price:
+            return price
+    return script_price_scan(doc) or initial_state_price_scan(doc)
+
+def static_price_attempt(url, selector=None, deadline=NO_DEADLINE):
+    """Fetch and scan a page without the browser.
+
+    Returns ``(price, status, scanned)``; ``scanned`` is False when no HTML
+    came back (network error, 4xx/5xx or a non-HTML response).
+    """
+    status, html = fetch_static_html(url, deadline)
+    if not html:
+        return None, status, False
+    return static_price_from_html(html, selector), status, True
+
+def breaker_domain(url):
+    """Return the domain used to key circuit breakers."""
+    domain = urlparse(url).netloc.lower()
+    return domain[4:] if domain.startswith("www.") else domain
+
+def embedded_price_scan(html):
+    """Look for a price in JSON-LD or ``__INITIAL_STATE__`` data."""
+    doc = PageArtifacts.of(html)
+    return script_price_scan(doc) or initial_state_price_scan(doc)
+
+def proxy_modes(url):
+    """Scraping-service modes to try for ``url``, in order."""
+    render_known = STRATEGY_MEMO.render_required(url, RENDER_RECHECK_DAYS * 86400)
+    return ("plain", "render") if PROXY_PLAIN_FIRST and not render_known else ("render",)
+
+def fetch_with_scraping_services(url, deadline=NO_DEADLINE, extractor=None):
+    """Fetch a URL using one of the configured scraping services.
+
+    JavaScript rendering is the slowest and most expensive mode, so unless
+    the domain is known to need it a non-rendered fetch is tried first. It is
+    accepted only if ``extractor`` (by default :func:`embedded_price_scan`)
+    finds a price; otherwise the request is repeated with rendering on. The
+    outcome is remembered per domain in the strategy memo. ``extractor``
+    must rely on structured data only: a fuzzy text scan finds some amount
+    on almost any shell page and would stop every escalation.
+    """
+    if in_har_mode():
+        # Service traffic is not part of the browser HAR archive
+        return None
+    # (name, non-rendered URL, rendered URL)
     services = []
     if SCRAPERAPI_KEY:
-        services.append(
-            (
-                "scraperapi",
-                f"http://api.scraperapi.com/?api_key={SCRAPERAPI_KEY}&url={url}&render=true",
-            )
-        )
+        base = f"http://api.scraperapi.com/?api_key={SCRAPERAPI_KEY}&url={url}"
+        services.append(("scraperapi", base, f"{base}&render=true"))
     if SCRAPINGBEE_KEY:
-        services.append(
-            (
-                "scrapingbee",
-                f"https://app.scrapingbee.com/api/v1/?api_key={SCRAPINGBEE_KEY}&url={url}&render_js=true",
-            )
-        )
+        base = f"https://app.scrapingbee.com/api/v1/?api_key={SCRAPINGBEE_KEY}&url={url}"
+        services.append(("scrapingbee", f"{base}&render_js=false", f"{base}&render_js=true"))
     if SCRAPEDO_KEY:
-        services.append(
-            (
-                "scrape.do",
-                f"https://api.scrape.do/?token={SCRAPEDO_KEY}&url={url}&render=true",
-            )
-        )
+        base = f"https://api.scrape.do/?token={SCRAPEDO_KEY}&url={url}"
+        services.append(("scrape.do", base, f"{base}&render=true"))
     if APIFY_TOKEN:
-        services.append(
-            (
-                "apify",
-                f"http://proxy.apify.com/?token={APIFY_TOKEN}&url={url}&render=true",
-            )
-        )
+        base = f"http://proxy.apify.com/?token={APIFY_TOKEN}&url={url}"
+        services.append(("apify", base, f"{base}&render=true"))
     if ZYTE_API_KEY:
-        services.append(
-            (
-                "zyte",
-                f"https://api.zyte.com/v1/extract?url={url}&apikey={ZYTE_API_KEY}&render=true",
-            )
-        )
+        base = f"https://api.zyte.com/v1/extract?url={url}&apikey={ZYTE_API_KEY}"
+        services.append(("zyte", base, f"{base}&render=true"))
 
     random.shuffle(services)
     headers = {"User-Agent": "Mozilla/5.0"}
-    for name, service_url in services:
-        try:
-            resp = requests.get(service_url, headers=headers, timeout=30)
-            if resp.status_code == 200 and resp.text:
-                logger.info("Fetched %s via %s", url, name)
-                return resp.text
-            logger.warning("%s returned status %s", name, resp.status_code)
-        except Exception as e:
-            logger.warning("Service %s failed: %s", name, e)
+    domain = breaker_domain(url)
+    check = extractor or embedded_price_scan
+    modes = proxy_modes(url)
+    escalated = False
+    blocked = None
+    names = [name for name, _, _ in services]
+    for mode in modes:
+        if mode != modes[0]:
+            # The row queued for a plain request; a render costs more, so queue again
+            costs = {name: PROVIDER_CREDITS.get(name, DEFAULT_CREDITS)[1] for name in names}
+            GOVERNOR.wait_in_thread(names, costs, timeout=deadline.timeout(PROVIDER_WAIT))
+        for name, plain_url, render_url in services:
+            tier = f"proxy:{name}"
+            if deadline.expired():
+                return None
+            # The governor goes first: a refusal there must not hold a
+            # half-open breaker's probe slot
+            cost = PROVIDER_CREDITS.get(name, DEFAULT_CREDITS)[mode == "render"]
+            if not GOVERNOR.acquire(name, cost, names):
+                logger.debug("Skipping %s for %s: throttled or out of credits", name, url)
+                continue
+            if not BREAKERS.allow(domain, tier):
+                GOVERNOR.release(name)  # nothing was sent, so nothing is charged
+                logger.debug("Skipping %s for %s: circuit open", name, domain)
+                continue
+            started = time.perf_counter()
+            resp = None
+            try:
+                resp = requests.get(
+                    plain_url if mode == "plain" else render_url,
+                    headers=headers,
+                    timeout=deadline.timeout(30),
+                )
+            except Exception as e:
+                BREAKERS.record(domain, tier, False)
+                logger.warning("Service %s failed: %s", name, e)
+                continue
+            finally:
+                pause = GOVERNOR.release(
+                    name,
+                    resp.status_code if resp is not None else None,
+                    resp.headers if resp is not None else None,
+                    cost,
+                )
+            if pause is not None:
+                # The provider is throttling us, not the site blocking it
+                BREAKERS.release(domain, tier)
+                logger.warning("⏳ %s is rate limiting; resting it for %.0fs", name, pause)
+                continue
+            kind = detect_block(resp.status_code, resp.headers, resp.text)
+            if kind:
+                BREAKERS.record(domain, tier, False)
+                blocked = Blocked(kind, resp.status_code, resp.text)
+                logger.warning("🧱 %s was served a %s block for %s", name, kind, url)
+                continue
+            if resp.status_code != 200 or not resp.text:
+                BREAKERS.record(domain, tier, False)
+                logger.warning("%s returned status %s", name, resp.status_code)
+                continue
+            BREAKERS.record(domain, tier, True)
+            elapsed = time.perf_counter() - started
+            archive_page(url, resp.text, f"{tier}:{mode}", resp.status_code)
+            if mode == "plain":
+                found = bool(check(resp.text))
+                RENDER_STATS.record(name, "plain", elapsed, found)
+                if not found:
+                    # The service works; the page just needs rendering
+                    logger.info("No price in non-rendered %s via %s; rendering", url, name)
+                    escalated = True
+                    break
+                STRATEGY_MEMO.set_render_required(url, False)
+            else:
+                RENDER_STATS.record(name, "render", elapsed, True)
+                if escalated and check(resp.text):
+                    STRATEGY_MEMO.set_render_required(url, True)
+            logger.info("Fetched %s via %s (%s)", url, name, mode)
+            return resp.text
+    if blocked:
+        raise blocked
     return None
 
-def fetch_with_brightdata_browser(url):
+def fetch_with_brightdata_browser(url, deadline=NO_DEADLINE, extractor=None):
     """Fetch rendered HTML using BrightData Browser API if configured."""
-    if not BRIGHTDATA_BROWSER_URL or not BRIGHTDATA_API_TOKEN:
+    if in_har_mode() or not BRIGHTDATA_BROWSER_URL or not BRIGHTDATA_API_TOKEN:
+        return None
+    if deadline.expired():
+        return None
+    domain = breaker_domain(url)
+    if not GOVERNOR.acquire("brightdata"):
+        logger.debug("Skipping brightdata-browser for %s: throttled or out of credits", url)
+        return None
+    if not BREAKERS.allow(domain, "brightdata"):
+        GOVERNOR.release("brightdata")
+        logger.debug("Skipping brightdata-browser for %s: circuit open", domain)
         return None
     headers = {"User-Agent": "Mozilla/5.0"}
+    resp = None
     try:
-        resp = requests.get(
-            BRIGHTDATA_BROWSER_URL,
-            params={"url": url, "token": BRIGHTDATA_API_TOKEN},
-            headers=headers,
-            timeout=30,
-        )
+        try:
+            resp = requests.get(
+                BRIGHTDATA_BROWSER_URL,
+                params={"url": url, "token": BRIGHTDATA_API_TOKEN},
+                headers=headers,
+                timeout=deadline.timeout(30),
+            )
+        finally:
+            pause = GOVERNOR.release(
+                "brightdata",
+                resp.status_code if resp is not None else None,
+                resp.headers if resp is not None else None,
+            )
+        if pause is not None:
+            BREAKERS.release(domain, "brightdata")
+            logger.warning("⏳ brightdata-browser is rate limiting; resting it for %.0fs", pause)
+            return None
+        kind = detect_block(resp.status_code, resp.headers, resp.text)
+        if kind:
+            BREAKERS.record(domain, "brightdata", False)
+            logger.warning("🧱 brightdata-browser was served a %s block for %s", kind, url)
+            raise Blocked(kind, resp.status_code, resp.text)
         if resp.status_code == 200 and resp.text:
+            BREAKERS.record(domain, "brightdata", True)
+            archive_page(url, resp.text, "brightdata", resp.status_code)
             logger.info("Fetched %s via brightdata-browser", url)
             return resp.text
         logger.warning(
             "brightdata-browser returned status %s", resp.status_code
         )
+    except Blocked:
+        raise
     except Exception as e:
         logger.warning("BrightData browser failed: %s", e)
+    BREAKERS.record(domain, "brightdata", False)
     return None
 
-def menards_price_from_html(html):
-    """Extract price from Menards HTML content."""
-    soup = BeautifulSoup(html, "html.parser")
+def fetch_providers(fetch):
+    """Paid providers ``fetch`` may call, so callers can queue for a slot first."""
+    fetch = getattr(fetch, "func", fetch)
+    if fetch is fetch_with_scraping_services:
+        keys = {
+            "scraperapi": SCRAPERAPI_KEY,
+            "scrapingbee": SCRAPINGBEE_KEY,
+            "scrape.do": SCRAPEDO_KEY,
+            "apify": APIFY_TOKEN,
+            "zyte": ZYTE_API_KEY,
+        }
+        return [name for name, key in keys.items() if key]
+    if fetch is fetch_with_brightdata_browser and BRIGHTDATA_BROWSER_URL and BRIGHTDATA_API_TOKEN:
+        return ["brightdata"]
+    return []
+
+def provider_costs(fetch, url):
+    """Credits the first request ``fetch`` makes for ``url`` costs, per provider."""
+    providers = fetch_providers(fetch)
+    if getattr(fetch, "func", fetch) is not fetch_with_scraping_services:
+        return dict.fromkeys(providers, 1)
+    render = proxy_modes(url)[0] == "render"
+    return {name: PROVIDER_CREDITS.get(name, DEFAULT_CREDITS)[render] for name in providers}
+
+def menards_price_from_html(html, fuzzy=True):
+    """Extract price from Menards HTML content.
+
+    ``fuzzy=False`` drops the closing text scan, which on a page that was not
+    rendered tends to pick up banner amounts such as "orders over $49".
+    """
+    doc = PageArtifacts.of(html)
+    soup = doc.soup
     selectors = [
         "#itemFinalPrice",
         '[data-at-id="itemFinalPrice"]',
@@ -301,41 +720,67 @@ def menards_price_from_html(html):
             continue
         if "itemFinalPrice" in sel:
             attr = el.get("data-final-price")
-            price = extract_price(attr or "")
+            price = extract_price(with_currency(attr or ""))
         else:
             price = extract_price(el.get_text() or "")
         if price:
             return price
     meta = soup.select_one('meta[property="product:price:amount"]')
     if meta:
-        price = extract_price(meta.get("content") or "")
+        price = extract_price(with_currency(meta.get("content") or ""))
         if price:
             return price
-    return bs_price_scan(html)
+    return bs_price_scan(doc) if fuzzy else None
 
-def zoro_price_from_html(html):
+def zoro_price_from_html(html, fuzzy=True):
     """Extract a price from Zoro HTML using embedded JSON or fuzzy scan."""
-    price = initial_state_price_scan(html)
+    doc = PageArtifacts.of(html)
+    price = initial_state_price_scan(doc)
     if price:
         return price
-    price = script_price_scan(html)
+    price = script_price_scan(doc)
     if price:
         return price
-    return bs_price_scan(html)
+    return bs_price_scan(doc) if fuzzy else None
+
+SEMANTIC_SELECTORS = [
+    '[class*="price"]',
+    '[id*="price"]',
+    '[class*="amount"]',
+    '[itemprop="price"]',
+    'meta[property="product:price:amount"]'
+]
+
+# Builds a short CSS path for a matched element. Ids and classes containing
+# long digit runs are skipped since they usually vary from product to product.
+CSS_PATH_JS = """
+el => {
+  const stable = s => s && !/\\d{3,}/.test(s);
+  const segment = e => {
+    if (e.id && stable(e.id)) return '#' + CSS.escape(e.id);
+    let s = e.tagName.toLowerCase();
+    const classes = Array.from(e.classList).filter(stable).slice(0, 3);
+    if (classes.length) s += '.' + classes.map(c => CSS.escape(c)).join('.');
+    return s;
+  };
+  const parts = [];
+  for (let e = el; e && e.nodeType === 1 && parts.length < 4; e = e.parentElement) {
+    const s = segment(e);
+    parts.unshift(s);
+    if (s.startsWith('#')) break;
+  }
+  return parts.join(' > ');
+}
+"""
 
-async def enhanced_semantic_price_scan(page):
-    """Try multiple price selectors on the page and return the first match."""
-    selector_patterns = [
-        '[class*="price"]',
-        '[id*="price"]',
-        '[class*="amount"]',
-        '[itemprop="price"]',
-        'meta[property="product:price:amount"]'
-    ]
-    for selector in selector_patterns:
+async def semantic_price_match(page, deadline=NO_DEADLINE):
+    """Return ``(price, element, pattern)`` for the first semantic selector hit."""
+    for selector in SEMANTIC_SELECTORS:
+        deadline.check()
         try:
             elements = await page.query_selector_all(selector)
             for element in elements:
+                deadline.check()
                 try:
                     if "meta" in selector:
                         content = await element.get_attribute("content")
@@ -344,16 +789,189 @@ async def enhanced_semantic_price_scan(page):
                         text = await element.inner_text()
                         price = extract_price(text or "")
                     if price:
-                        return price
+                        return price, element, selector
                 except Exception:
                     continue
+        except DeadlineExceeded:
+            raise
         except Exception:
             continue
-    return None
+    return None, None, None
+
+async def enhanced_semantic_price_scan(page, deadline=NO_DEADLINE):
+    """Try multiple price selectors on the page and return the first match."""
+    price, _, _ = await semantic_price_match(page, deadline)
+    return price
+
+async def concrete_selector(element, pattern):
+    """Return a CSS selector that re-locates ``element`` on similar pages."""
+    if "meta" in pattern:
+        return pattern
+    try:
+        return await element.evaluate(CSS_PATH_JS)
+    except Exception:
+        return None
+
+async def learned_selector_price(page, selector, timeout=6000, deadline=NO_DEADLINE):
+    """Read a price from a selector remembered by the strategy memo."""
+    deadline.check()
+    try:
+        element = await page.wait_for_selector(
+            selector, state="attached", timeout=deadline.timeout_ms(timeout)
+        )
+        if not element:
+            return None
+        if selector.startswith("meta"):
+            text = await element.get_attribute("content")
+        else:
+            text = await element.inner_text()
+    except Exception:
+        return None
+    return extract_price(text or "")
 
-async def caster_city_price_scan(page):
+def preferred_tier(url, vendor):
+    """Return the tier that last won for ``url`` in a vendor handler, if any."""
+    method = STRATEGY_MEMO.lookup(url).get("method") or ""
+    prefix = f"{vendor}-"
+    return method[len(prefix):] if method.startswith(prefix) else None
+
+# Last block seen per domain, reported for rows skipped by an open breaker
+BROWSER_BLOCKS = {}
+
+async def goto_checked(page, url, timeout_ms):
+    """Navigate to ``url`` and raise :class:`Blocked` if a challenge page loaded.
+
+    Status and headers are free to check; the markup is only read when they
+    or the page title hint at a block. Blocks feed the domain's ``browser``
+    circuit breaker, so a burst of them skips the browser for a while; while
+    it is open :class:`CircuitOpen` is raised without navigating.
+    """
+    domain = breaker_domain(url)
+    if not BREAKERS.allow(domain, "browser"):
+        raise CircuitOpen(
+            domain,
+            "browser",
+            BREAKERS.get(domain, "browser").retry_in(),
+            BROWSER_BLOCKS.get(domain),
+        )
+    try:
+        response = await page.goto(url, timeout=timeout_ms)
+        status = response.status if response else None
+        headers = response.headers if response else {}
+        try:
+            title = await page.title()
+        except Exception:
+            title = ""  # the page navigated again while we asked
+        html = None
+        if (status or 0) >= 400 or is_challenge_title(title):
+            html = await page.content()
+    except Exception:
+        # Also frees the probe slot if the breaker is half-open
+        BREAKERS.record(domain, "browser", False)
+        raise
+    kind = detect_block(status, headers, html)
+    BREAKERS.record(domain, "browser", not kind)
+    if kind:
+        BROWSER_BLOCKS[domain] = kind
+        raise Blocked(kind, status, html)
+    return response
+
+async def browser_price_tier(
+    page,
+    url,
+    extractor,
+    goto_timeout=20000,
+    idle_timeout=10000,
+    idle_wait=5000,
+    deadline=NO_DEADLINE,
+):
+    """Load ``url`` in Playwright and run ``extractor``, then the semantic scan."""
+    deadline.check()
+    response = await goto_checked(page, url, deadline.timeout_ms(goto_timeout))
+    status = response.status if response else None
+    try:
+        await page.wait_for_load_state("networkidle", timeout=deadline.timeout_ms(idle_timeout))
+    except Exception:
+        deadline.check()
+        await page.wait_for_timeout(deadline.timeout_ms(idle_wait))
+    page_html = await page.content()
+    await asyncio.to_thread(archive_page, url, page_html, "rendered", status)
+    price = extractor(page_html)
+    if price:
+        return price, "direct", status
+    fallback = await enhanced_semantic_price_scan(page, deadline)
+    return fallback, "semantic", status
+
+async def vendor_price_scan(page, url, fetchers, browser_tier, prefer=None, deadline=NO_DEADLINE):
+    """Run a vendor's HTML fetch tiers and browser tier, preferred tier first.
+
+    ``fetchers`` is a list of ``(method, fetch, extractor)`` tuples where
+    ``fetch(url, deadline, extractor=...)`` returns HTML or None. The fetcher
+    gets the extractor with ``fuzzy=False`` to judge a cheap response before
+    paying for more; the full extractor then reads the HTML it returns.
+    ``browser_tier(page, url, deadline)`` returns ``(price, method, status)``.
+    The result has a ``None`` price when every tier missed, unless one of
+    them was blocked: then :class:`Blocked` is raised so the row is recorded
+    as blocked rather than as a missing price. A browser tier skipped by its
+    open breaker likewise re-raises :class:`CircuitOpen` at the end.
+    """
+    tiers = [name for name, _, _ in fetchers] + ["direct"]
+    if prefer == "semantic":
+        prefer = "direct"
+    if prefer in tiers:
+        tiers.remove(prefer)
+        tiers.insert(0, prefer)
+    by_name = {name: (fetch, extractor) for name, fetch, extractor in fetchers}
+    method, status = "semantic", None
+    blocked = None
+    circuit_open = None
+    for tier in tiers:
+        deadline.check()
+        try:
+            if tier == "direct":
+                try:
+                    price, method, status = await browser_tier(page, url, deadline)
+                except (DeadlineExceeded, Blocked, CircuitOpen):
+                    raise
+                except Exception as e:
+                    if tier == tiers[-1] and not blocked:
+                        raise
+                    logger.debug("Browser tier failed for %s: %s", url, e)
+                    continue
+            else:
+                fetch, extractor = by_name[tier]
+                costs = provider_costs(fetch, url)
+                # Queue for a provider slot here, not in a worker thread
+                if costs and not await GOVERNOR.wait_for_capacity(
+                    costs, costs, timeout=deadline.timeout(PROVIDER_WAIT)
+                ):
+                    logger.debug("No %s provider free for %s", tier, url)
+                    continue
+                judge = functools.partial(extractor, fuzzy=False)
+                html = await asyncio.to_thread(fetch, url, deadline, extractor=judge)
+                price = extractor(html) if html else None
+                method = tier
+        except Blocked as e:
+            # Skip the rest of this tier (no idle waits or extractors on a challenge page)
+            logger.info("🧱 %s tier blocked by %s | URL: %s", tier, e.kind, url)
+            blocked = e
+            continue
+        except CircuitOpen as e:
+            logger.info("⚡ %s | URL: %s", e, url)
+            circuit_open = e
+            continue
+        if price:
+            return price, method, status
+    if blocked:
+        raise blocked
+    if circuit_open:
+        raise circuit_open
+    return None, method, status
+
+async def caster_city_price_scan(page, deadline=NO_DEADLINE):
     """Special handler for castercity.com pages."""
-    await page.wait_for_timeout(5000)
+    deadline.check()
+    await page.wait_for_timeout(deadline.timeout_ms(5000))
     wrapper = await page.query_selector(".summaryfull.entry-summaryfull")
     if not wrapper:
         return "Price wrapper not found"
@@ -368,19 +986,24 @@ async def caster_city_price_scan(page):
             continue
     return prices[0] if prices else "No valid price found in wrapper"
 
-async def menards_price_scan(page, url):
+async def menards_price_scan(page, url, prefer=None, deadline=NO_DEADLINE):
     """Special handler for menards.com pages with proxy fallbacks."""
+    price, method, status = await vendor_price_scan(
+        page,
+        url,
+        [("proxy", fetch_with_scraping_services, menards_price_from_html)],
+        menards_browser_tier,
+        prefer=prefer,
+        deadline=deadline,
+    )
+    return price or "No price found", method, status
 
-    html = fetch_with_scraping_services(url)
-    if html:
-        price = menards_price_from_html(html)
-        if price:
-            return price
-
-    # Proxy failed, try loading directly via Playwright
-    response = await page.goto(url, timeout=20000)
+async def menards_browser_tier(page, url, deadline=NO_DEADLINE):
+    """Load a Menards page directly via Playwright and read its price."""
+    response = await goto_checked(page, url, deadline.timeout_ms(20000))
     status = response.status if response else None
-    await page.wait_for_timeout(7000)
+    deadline.check()
+    await page.wait_for_timeout(deadline.timeout_ms(7000))
 
     selectors = [
         '#itemFinalPrice',  # hidden element with data-final-price attribute
@@ -390,17 +1013,18 @@ async def menards_price_scan(page, url):
     ]
 
     for sel in selectors:
+        deadline.check()
         try:
-            element = await page.wait_for_selector(sel, timeout=5000)
+            element = await page.wait_for_selector(sel, timeout=deadline.timeout_ms(5000))
             if element:
                 if "itemFinalPrice" in sel:
                     attr = await element.get_attribute("data-final-price")
-                    price = extract_price(attr or "")
+                    price = extract_price(with_currency(attr or ""))
                 else:
                     text = await element.inner_text()
                     price = extract_price(text or "")
                 if price:
-                    return price
+                    return price, "direct", status
         except Exception:
             continue
 
@@ -408,181 +1032,244 @@ async def menards_price_scan(page, url):
         meta = await page.query_selector('meta[property="product:price:amount"]')
         if meta:
             content = await meta.get_attribute("content")
-            price = extract_price(content or "")
+            price = extract_price(with_currency(content or ""))
             if price:
-                return price
+                return price, "direct", status
     except Exception:
         pass
 
-    fallback = await enhanced_semantic_price_scan(page)
-    return fallback or "No price found"
+    fallback = await enhanced_semantic_price_scan(page, deadline)
+    return fallback, "semantic", status
 
-def grainger_price_from_html(html):
+def grainger_price_from_html(html, fuzzy=True):
     """Extract the price from Grainger HTML using embedded JSON or fuzzy scan."""
-    price = initial_state_price_scan(html)
+    doc = PageArtifacts.of(html)
+    price = initial_state_price_scan(doc)
     if price:
         return price
-    price = script_price_scan(html)
+    price = script_price_scan(doc)
     if price:
         return price
-    return bs_price_scan(html)
+    return bs_price_scan(doc) if fuzzy else None
+
+
+GRAINGER_DRIVER_POOL = None
+_grainger_pool_lock = threading.Lock()
+
+def grainger_driver_pool():
+    """Return the shared Selenium driver pool, starting it on first use."""
+    global GRAINGER_DRIVER_POOL
+    with _grainger_pool_lock:
+        if GRAINGER_DRIVER_POOL is None:
+            from selenium_scrapy_grainger import DriverPool  # optional engine
+
+            GRAINGER_DRIVER_POOL = DriverPool(
+                size=SELENIUM_DRIVERS, max_pages=SELENIUM_MAX_PAGES, headless=HEADLESS
+            )
+        return GRAINGER_DRIVER_POOL
+
+def close_grainger_driver_pool():
+    global GRAINGER_DRIVER_POOL
+    with _grainger_pool_lock:
+        pool, GRAINGER_DRIVER_POOL = GRAINGER_DRIVER_POOL, None
+    if pool:
+        pool.close()
+
+def fetch_with_selenium_grainger(url, deadline=NO_DEADLINE, extractor=None):
+    """Load a Grainger page in the pooled Selenium drivers and return its HTML."""
+    if in_har_mode() or deadline.expired():
+        return None
+    domain = breaker_domain(url)
+    if not BREAKERS.allow(domain, "selenium"):
+        logger.debug("Skipping selenium for %s: circuit open", domain)
+        return None
+    try:
+        html = grainger_driver_pool().fetch_html(url, timeout=deadline.timeout(45))
+    except Exception as e:
+        logger.warning("Selenium fetch failed for %s: %s", url, e)
+        BREAKERS.record(domain, "selenium", False)
+        return None
+    BREAKERS.record(domain, "selenium", True)
+    archive_page(url, html, "selenium")
+    return html
 
 
-def puppeteer_grainger_fallback(url: str) -> str:
+def puppeteer_grainger_fallback(url: str, deadline: Deadline = NO_DEADLINE) -> str:
     """Invoke the Node.js fallback scraper for Grainger and return the price."""
+    if in_har_mode():
+        return "Fallback skipped in HAR mode"
+    if deadline.expired():
+        return "Fallback skipped: row time budget exhausted"
+    domain = breaker_domain(url)
+    if not BREAKERS.allow(domain, "puppeteer"):
+        return "Fallback skipped: circuit open"
     try:
         result = subprocess.run(
             ["node", "grainger-fallback.js", url],
             capture_output=True,
             text=True,
-            timeout=60,
+            timeout=deadline.timeout(60),
         )
         if result.returncode == 0:
-            return result.stdout.strip()
+            price = result.stdout.strip()
+            BREAKERS.record(domain, "puppeteer", bool(extract_price(price)))
+            return price
+        BREAKERS.record(domain, "puppeteer", False)
         return f"Fallback error: {result.stderr.strip()}"
     except Exception as e:
+        BREAKERS.record(domain, "puppeteer", False)
         return f"Exception in fallback: {str(e)}"
 
 
-def node_fallback_price(url: str) -> str:
+def node_fallback_price(url: str, deadline: Deadline = NO_DEADLINE) -> str:
     """Generic Node.js fallback using Puppeteer and BrightData."""
+    if in_har_mode():
+        return "node-skipped: HAR mode"
+    if deadline.expired():
+        return "node-skipped: row time budget exhausted"
+    domain = breaker_domain(url)
+    if not BREAKERS.allow(domain, "node-fallback"):
+        return "node-skipped: circuit open"
     try:
         result = subprocess.run(
             ["node", "fallback-scraper.js", url],
             capture_output=True,
             text=True,
-            timeout=60,
+            timeout=deadline.timeout(60),
         )
         if result.returncode == 0:
-            return result.stdout.strip()
+            price = result.stdout.strip()
+            BREAKERS.record(domain, "node-fallback", bool(extract_price(price)))
+            return price
+        BREAKERS.record(domain, "node-fallback", False)
         return f"node-error: {result.stderr.strip()}"
     except Exception as e:
+        BREAKERS.record(domain, "node-fallback", False)
         return f"node-exception: {str(e)}"
 
-async def grainger_price_scan(page, url):
+async def grainger_price_scan(page, url, prefer=None, deadline=NO_DEADLINE):
     """Special handler for grainger.com pages with proxy fallback."""
-    html = fetch_with_scraping_services(url)
-    if html:
-        price = grainger_price_from_html(html)
-        if price:
-            return price, "proxy", None
-
-    response = await page.goto(url, timeout=20000)
-    status = response.status if response else None
+    fallback_price = None
+    if prefer == "puppeteer":
+        fallback_price = await asyncio.to_thread(puppeteer_grainger_fallback, url, deadline)
+        if extract_price(fallback_price or ""):
+            return fallback_price, "puppeteer", None
+
+    fetchers = [("proxy", fetch_with_scraping_services, grainger_price_from_html)]
+    if GRAINGER_ENGINE == "selenium":
+        fetchers.insert(
+            0, ("selenium", fetch_with_selenium_grainger, grainger_price_from_html)
+        )
+    blocked = None
     try:
-        await page.wait_for_load_state("networkidle", timeout=10000)
-    except Exception:
-        await page.wait_for_timeout(5000)
-    page_html = await page.content()
-    price = grainger_price_from_html(page_html)
+        price, method, status = await vendor_price_scan(
+            page,
+            url,
+            fetchers,
+            lambda page, url, deadline: browser_price_tier(
+                page, url, grainger_price_from_html, deadline=deadline
+            ),
+            prefer=prefer,
+            deadline=deadline,
+        )
+    except Blocked as e:
+        blocked, price, status = e, None, e.status
+    except CircuitOpen as e:
+        blocked, price, status = e, None, None
     if price:
-        return price, "direct", status
-    fallback = await enhanced_semantic_price_scan(page)
-    if fallback:
-        return fallback, "semantic", status
+        return price, method, status
 
     # If still no price found, try Puppeteer fallback
-    fallback_price = await asyncio.to_thread(puppeteer_grainger_fallback, url)
+    if fallback_price is None:
+        deadline.check()
+        fallback_price = await asyncio.to_thread(puppeteer_grainger_fallback, url, deadline)
+    if blocked and not extract_price(fallback_price or ""):
+        raise blocked
     return (fallback_price or "No price found", "puppeteer", status)
 
 
-def msc_price_from_html(html):
+def msc_price_from_html(html, fuzzy=True):
     """Extract the price from MSC Direct HTML using JSON-LD or fuzzy scan."""
-    price = script_price_scan(html)
+    doc = PageArtifacts.of(html)
+    price = script_price_scan(doc)
     if price:
         return price
-    return bs_price_scan(html)
+    return bs_price_scan(doc) if fuzzy else None
 
 
-async def msc_price_scan(page, url):
+async def msc_price_scan(page, url, prefer=None, deadline=NO_DEADLINE):
     """Special handler for MSC Direct pages with proxy fallback."""
-    html = fetch_with_scraping_services(url)
-    if html:
-        price = msc_price_from_html(html)
-        if price:
-            return price, "proxy", None
-
-    response = await page.goto(url, timeout=20000)
-    status = response.status if response else None
-    try:
-        await page.wait_for_load_state("networkidle", timeout=10000)
-    except Exception:
-        await page.wait_for_timeout(5000)
-    page_html = await page.content()
-    price = msc_price_from_html(page_html)
-    if price:
-        return price, "direct", status
-    fallback = await enhanced_semantic_price_scan(page)
-    return (fallback or "No price found", "semantic", status)
+    price, method, status = await vendor_price_scan(
+        page,
+        url,
+        [("proxy", fetch_with_scraping_services, msc_price_from_html)],
+        lambda page, url, deadline: browser_price_tier(
+            page, url, msc_price_from_html, deadline=deadline
+        ),
+        prefer=prefer,
+        deadline=deadline,
+    )
+    return (price or "No price found", method, status)
 
-async def zoro_price_scan(page, url):
+async def zoro_price_scan(page, url, prefer=None, deadline=NO_DEADLINE):
     """Handle price scraping for zoro.com with multiple fallbacks."""
-    html = fetch_with_scraping_services(url)
-    if html:
-        price = zoro_price_from_html(html)
-        if price:
-            return price, "proxy", None
-
-    html = fetch_with_brightdata_browser(url)
-    if html:
-        price = zoro_price_from_html(html)
-        if price:
-            return price, "brightdata", None
-
-    response = await page.goto(url, timeout=30000)
-    status = response.status if response else None
-    try:
-        await page.wait_for_load_state("networkidle", timeout=15000)
-    except Exception:
-        await page.wait_for_timeout(8000)
-    page_html = await page.content()
-    price = zoro_price_from_html(page_html)
-    if price:
-        return price, "direct", status
-    fallback = await enhanced_semantic_price_scan(page)
-    return (fallback or "No price found", "semantic", status)
+    price, method, status = await vendor_price_scan(
+        page,
+        url,
+        [
+            ("proxy", fetch_with_scraping_services, zoro_price_from_html),
+            ("brightdata", fetch_with_brightdata_browser, zoro_price_from_html),
+        ],
+        lambda page, url, deadline: browser_price_tier(
+            page,
+            url,
+            zoro_price_from_html,
+            goto_timeout=30000,
+            idle_timeout=15000,
+            idle_wait=8000,
+            deadline=deadline,
+        ),
+        prefer=prefer,
+        deadline=deadline,
+    )
+    return (price or "No price found", method, status)
 
 
-def caster_depot_price_from_html(html):
+def caster_depot_price_from_html(html, fuzzy=True):
     """Extract the price from Caster Depot HTML using typical price selectors."""
-    soup = BeautifulSoup(html, "html.parser")
-    el = soup.select_one(".price-box .price")
+    doc = PageArtifacts.of(html)
+    el = doc.soup.select_one(".price-box .price")
     if el:
         price = extract_price(el.get_text() or "")
         if price:
             return price
-    price = script_price_scan(html)
+    price = script_price_scan(doc)
     if price:
         return price
-    return bs_price_scan(html)
+    return bs_price_scan(doc) if fuzzy else None
 
 
-async def caster_depot_price_scan(page, url):
+async def caster_depot_price_scan(page, url, prefer=None, deadline=NO_DEADLINE):
     """Special handler for casterdepot.com pages with proxy fallback."""
-    html = fetch_with_scraping_services(url)
-    if html:
-        price = caster_depot_price_from_html(html)
-        if price:
-            return price, "proxy", None
-
-    response = await page.goto(url, timeout=20000)
-    status = response.status if response else None
-    try:
-        await page.wait_for_load_state("networkidle", timeout=10000)
-    except Exception:
-        await page.wait_for_timeout(5000)
-    page_html = await page.content()
-    price = caster_depot_price_from_html(page_html)
-    if price:
-        return price, "direct", status
-    fallback = await enhanced_semantic_price_scan(page)
-    return (fallback or "No price found", "semantic", status)
+    price, method, status = await vendor_price_scan(
+        page,
+        url,
+        [("proxy", fetch_with_scraping_services, caster_depot_price_from_html)],
+        lambda page, url, deadline: browser_price_tier(
+            page, url, caster_depot_price_from_html, deadline=deadline
+        ),
+        prefer=prefer,
+        deadline=deadline,
+    )
+    return (price or "No price found", method, status)
 
-async def harbor_freight_price_scan(url):
+async def harbor_freight_price_scan(url, deadline=NO_DEADLINE):
     """Fetch price data from Harbor Freight's Dynamic Yield endpoint."""
+    if in_har_mode():
+        return "Skipped: Harbor Freight is fetched without the browser"
 
     def _fetch():
-        return hf_fetch_price(url)
+        return hf_fetch_price(url, timeout=deadline.timeout(15))
 
     try:
         price = await asyncio.to_thread(_fetch)
@@ -590,56 +1277,155 @@ async def harbor_freight_price_scan(url):
     except Exception as e:
         return f"Error: {e}"
 
-async def fetch_price_from_page(page, url, selector=None, force_selector_only=False, force_node_fallback=False):
-    """Return the price text from the given URL using optional CSS selector."""
-    page_html = ""
+async def load_rendered(url, doc):
+    """Serialize the page's DOM for the markup tiers and archive it."""
+    await doc.load()
+    await asyncio.to_thread(archive_page, url, doc.html, "rendered", doc.status)
+
+async def failure_snippet(url, doc, timeout=2):
+    """Return the start of the page for the Error Log, loading it if still possible."""
+    if not doc.loaded and doc.page is not None:
+        try:
+            await asyncio.wait_for(load_rendered(url, doc), timeout)
+        except Exception:
+            return ""
+    return doc.snippet()
+
+async def fetch_price_from_page(
+    page,
+    url,
+    selector=None,
+    force_selector_only=False,
+    force_node_fallback=False,
+    deadline=NO_DEADLINE,
+):
+    """Return the price text from the given URL using optional CSS selector.
+
+    Every tier draws its timeouts from ``deadline``; once it expires the
+    remaining tiers are skipped and a ``deadline`` result is returned. The
+    rendered DOM is only serialized and parsed once a tier needs the markup.
+    """
+    doc = PageArtifacts()
     try:
         if force_node_fallback:
-            price = await asyncio.to_thread(node_fallback_price, url)
+            price = await asyncio.to_thread(node_fallback_price, url, deadline)
             return price or "No price found", None, None, "node-fallback"
 
         domain = urlparse(url).netloc.lower()
         if "msc.com" in domain or "mscdirect.com" in domain:
-            price, method, status = await msc_price_scan(page, url)
+            price, method, status = await msc_price_scan(
+                page, url, prefer=preferred_tier(url, "msc"), deadline=deadline
+            )
             return price, status, None, f"msc-{method}"
         if "menards.com" in domain:
-            price = await menards_price_scan(page, url)
-            return price, None, None, "menards"
+            price, method, status = await menards_price_scan(
+                page, url, prefer=preferred_tier(url, "menards"), deadline=deadline
+            )
+            return price, status, None, f"menards-{method}"
 
         if "harborfreight.com" in domain:
-            price = await harbor_freight_price_scan(url)
+            price = await harbor_freight_price_scan(url, deadline)
             return price, None, None, "harborfreight"
 
         if "grainger.com" in domain:
-            price, method, status = await grainger_price_scan(page, url)
+            price, method, status = await grainger_price_scan(
+                page, url, prefer=preferred_tier(url, "grainger"), deadline=deadline
+            )
             return price, status, None, f"grainger-{method}"
 
         if "zoro.com" in domain:
-            price, method, status = await zoro_price_scan(page, url)
+            price, method, status = await zoro_price_scan(
+                page, url, prefer=preferred_tier(url, "zoro"), deadline=deadline
+            )
             return price, status, None, f"zoro-{method}"
 
         if "northerntool.com" in domain:
-            nt_price = await nt_price_from_page(page, url)
+            nt_price = await nt_price_from_page(
+                page,
+                url,
+                json_fallback=not in_har_mode(),
+                timeout=deadline.remaining(),
+            )
+            # The WCS price service returns bare numbers ("89.99")
+            nt_price = with_currency(nt_price) if nt_price else None
             return nt_price or "No price found", None, None, "northerntool"
 
         if "casterdepot.com" in domain:
-            price, method, status = await caster_depot_price_scan(page, url)
+            price, method, status = await caster_depot_price_scan(
+                page, url, prefer=preferred_tier(url, "casterdepot"), deadline=deadline
+            )
             return price, status, None, f"casterdepot-{method}"
 
-        response = await page.goto(url, timeout=20000)
+        # Whatever won last time for this URL (or vendor) is tried first and
+        # the full chain below only runs if it misses.
+        memo = STRATEGY_MEMO.lookup(url)
+        learned_method = memo.get("method")
+        if learned_method == "node-fallback" and not selector:
+            fallback = await asyncio.to_thread(node_fallback_price, url, deadline)
+            if extract_price(fallback or ""):
+                return fallback, None, None, "node-fallback"
+
+        # Static tier: many shops render the price server-side and a plain
+        # GET costs a fraction of a browser navigation. Domains where it
+        # missed are skipped until STATIC_RECHECK_DAYS have passed.
+        try_static = (
+            STATIC_FIRST
+            and not in_har_mode()
+            and not force_selector_only
+            and "castercity.com" not in domain
+            and (
+                learned_method == "static"
+                or not STRATEGY_MEMO.browser_required(url, STATIC_RECHECK_DAYS * 86400)
+            )
+        )
+        if try_static:
+            price, static_status, scanned = await asyncio.to_thread(
+                static_price_attempt, url, selector, deadline
+            )
+            if price:
+                STRATEGY_MEMO.set_browser_required(url, False)
+                return price, static_status, None, "static"
+            if scanned:
+                # Only a page that came back as HTML says the domain needs a browser
+                STRATEGY_MEMO.set_browser_required(url, True)
+
+        deadline.check()
+        response = await goto_checked(page, url, deadline.timeout_ms(20000))
         status = response.status if response else None
-        await page.wait_for_timeout(3000)
-        page_html = await page.content()
+        doc = PageArtifacts(page=page, response=response)
 
         if "castercity.com" in domain:
-            price = await caster_city_price_scan(page)
+            await page.wait_for_timeout(deadline.timeout_ms(3000))
+            price = await caster_city_price_scan(page, deadline)
             return price, status, None, "castercity"
 
+        if not selector:
+            learned_selector = memo.get("selector")
+            if learned_selector:
+                price = await learned_selector_price(
+                    page, learned_selector, deadline=deadline
+                )
+                if price:
+                    return price, status, None, learned_method or "semantic"
+            if learned_method in ("script", "fuzzy"):
+                await load_rendered(url, doc)
+                if learned_method == "script":
+                    price = script_price_scan(doc)
+                else:
+                    price = extract_price(doc.html) or bs_price_scan(doc)
+                if price:
+                    return price, status, None, learned_method
+
+        deadline.check()
+        await page.wait_for_timeout(deadline.timeout_ms(3000))
+        # The DOM may have changed while waiting
+        doc = PageArtifacts(page=page, response=response)
+
         # Tier 1: Specific selector from sheet
         if selector:
             element = None
             try:
-                await page.wait_for_selector(selector, timeout=6000)
+                await page.wait_for_selector(selector, timeout=deadline.timeout_ms(6000))
                 element = await page.query_selector(selector)
             except Exception as sel_error:
                 logger.debug("Selector failed for %s: %s", selector, sel_error)
@@ -656,76 +1442,609 @@ async def fetch_price_from_page(page, url, selector=None, force_selector_only=Fa
             else:
                 logger.debug("Selector not found: %s", selector)
             if force_selector_only:
-                fallback = await asyncio.to_thread(node_fallback_price, url)
+                await load_rendered(url, doc)
+                fallback = await asyncio.to_thread(node_fallback_price, url, deadline)
                 return (
                     fallback or "No price found",
                     status,
-                    page_html[:300],
+                    doc.snippet(),
                     "node-fallback",
                 )
             # Fall through to semantic scan if selector didn't yield a price
 
         # Tier 2: Semantic scan
-        price = await enhanced_semantic_price_scan(page)
+        price, element, pattern = await semantic_price_match(page, deadline)
         if price:
+            learned = await concrete_selector(element, pattern)
+            STRATEGY_MEMO.stage_selector(url, learned)
             return price, status, None, "semantic"
 
         # Tier 3: Look inside script tags for price data
-        script_price = script_price_scan(page_html)
+        await load_rendered(url, doc)
+        script_price = script_price_scan(doc)
         if script_price:
             return script_price, status, None, "script"
 
         # Tier 4: Fuzzy content scan
-        text_price = extract_price(page_html)
+        text_price = extract_price(doc.html)
         if not text_price:
-            text_price = bs_price_scan(page_html)
+            text_price = bs_price_scan(doc)
         if text_price:
             return text_price, status, None, "fuzzy"
 
-        fallback = await asyncio.to_thread(node_fallback_price, url)
+        fallback = await asyncio.to_thread(node_fallback_price, url, deadline)
         return (
             fallback or "No price found",
             status,
-            page_html[:300],
+            doc.snippet(),
             "node-fallback",
         )
 
+    except DeadlineExceeded:
+        return (
+            "Timeout: row time budget exhausted",
+            None,
+            await failure_snippet(url, doc),
+            "deadline",
+        )
+    except CircuitOpen as e:
+        # Not retried: the breaker would still be open for the retry
+        logger.warning("⚡ Skipped, %s for %.0fs | URL: %s", e, e.retry_in, url)
+        if BRIGHTDATA_BROWSER_URL and BRIGHTDATA_API_TOKEN and not deadline.expired():
+            fallback = await asyncio.to_thread(node_fallback_price, url, deadline)
+            if extract_price(fallback or ""):
+                return fallback, None, None, "node-fallback"
+        last_block = f" after {e.last_block} blocks" if e.last_block else ""
+        return f"Skipped: {e}{last_block}", None, "", "circuit-open"
+    except Blocked as e:
+        logger.warning("🧱 Blocked by %s | URL: %s", e.kind, url)
+        # Only an unblocking browser is worth trying after a block
+        if BRIGHTDATA_BROWSER_URL and BRIGHTDATA_API_TOKEN and not deadline.expired():
+            fallback = await asyncio.to_thread(node_fallback_price, url, deadline)
+            if extract_price(fallback or ""):
+                return fallback, None, None, "node-fallback"
+        if e.html and not doc.loaded:
+            doc = PageArtifacts(e.html)
+        return f"Blocked: {e.kind}", e.status, await failure_snippet(url, doc), f"blocked:{e.kind}"
     except PlaywrightTimeoutError:
-        fallback = await asyncio.to_thread(node_fallback_price, url)
-        if fallback:
+        if deadline.expired():
+            # A Playwright timeout capped by the row budget
+            return (
+                "Timeout: row time budget exhausted",
+                None,
+                await failure_snippet(url, doc),
+                "deadline",
+            )
+        # node_fallback_price reports its own failures as text, so only a
+        # price replaces the timeout; otherwise the row stays retryable
+        fallback = await asyncio.to_thread(node_fallback_price, url, deadline)
+        if extract_price(fallback or ""):
             return fallback, None, None, "node-fallback"
-        return "Timeout", None, page_html[:300], "timeout"
+        return "Timeout", None, await failure_snippet(url, doc), "timeout"
     except Exception as e:
-        fallback = await asyncio.to_thread(node_fallback_price, url)
-        if fallback:
+        fallback = await asyncio.to_thread(node_fallback_price, url, deadline)
+        if extract_price(fallback or ""):
             return fallback, None, None, "node-fallback"
-        return f"Error: {str(e)}", None, page_html[:300], "exception"
+        return f"Error: {str(e)}", None, await failure_snippet(url, doc), "exception"
 
-async def scrape_all(rows, concurrency=CONCURRENCY):
-    """Scrape prices for each row concurrently using a pool of pages."""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=HEADLESS)
-        context = await browser.new_context(
-            ignore_https_errors=True,
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/113.0.0.0 Safari/537.36"
+def row_url(row):
+    return row[1].strip() if len(row) > 1 else ""
+
+def row_is_forced(row):
+    notes = row[3].lower() if len(row) > 3 else ""
+    return "forceselectoronly" in notes or "forcenodefallback" in notes
+
+async def prefetch_bulk_prices(rows):
+    """Return ``{url: (price, method)}`` for rows priced by catalog engines.
+
+    Rows found here skip the browser entirely; anything missing falls back
+    to the normal per-row chain.
+    """
+    bulk = {}
+    if CASTER_CITY_BULK and not in_har_mode():
+        urls = {
+            row_url(row)
+            for row in rows
+            if "castercity.com" in urlparse(row_url(row)).netloc.lower()
+            and not row_is_forced(row)
+        }
+        if urls:
+            try:
+                found = await asyncio.to_thread(
+                    caster_city_bulk_prices, urls, CASTER_CITY_BASE_URL
+                )
+                bulk.update({url: (price, "castercity-bulk") for url, price in found.items()})
+                logger.info(
+                    "📦 Caster City catalog priced %d of %d URLs", len(found), len(urls)
+                )
+            except Exception as e:
+                logger.warning("Caster City bulk pricing failed: %s", e)
+    if not in_har_mode():
+        bulk.update(await harvest_listing_prices(rows))
+    if SCRAPY_ENGINE and not in_har_mode():
+        bulk.update(await scrapy_prefetch_prices(rows, skip=bulk))
+    return bulk
+
+# Product-page extractors reused on category listing tiles, by vendor domain
+LISTING_EXTRACTORS = {
+    "casterdepot.com": ("casterdepot", caster_depot_price_from_html),
+}
+
+def fetch_listing_direct(url):
+    return fetch_static_html(url)[1]
+
+def archive_listing_page(urls, page_url, html, found):
+    """Note a harvested listing page under each sheet URL priced from it."""
+    if ARCHIVE is None or HAR_REPLAY_DIR:
+        return
+    matched = [url for url in urls if normalize_product_url(url) in found]
+    if not matched:
+        return
+    try:
+        digest = ARCHIVE.put(html)
+        for url in matched:
+            ARCHIVE.note_page(url, digest, "listing", page_url=page_url)
+    except OSError as e:
+        logger.debug("Could not archive listing %s: %s", page_url, e)
+
+async def harvest_listing_prices(rows):
+    """Return ``{url: (price, method)}`` for rows covered by listing pages."""
+    listings = load_listings(HARVEST_LISTINGS_FILE)
+    by_vendor = {}
+    for row in rows:
+        url = row_url(row)
+        vendor = vendor_for(url)
+        if vendor in listings and vendor in LISTING_EXTRACTORS and not row_is_forced(row):
+            by_vendor.setdefault(vendor, set()).add(url)
+
+    bulk = {}
+    for vendor, urls in by_vendor.items():
+        label, extractor = LISTING_EXTRACTORS[vendor]
+        # Tiles are priced from structured markup only; one without is skipped
+        tile_price = functools.partial(extractor, fuzzy=False)
+        fetchers = [
+            fetch_listing_direct,
+            functools.partial(
+                fetch_with_scraping_services, extractor=listing_judge(vendor, tile_price)
             ),
+        ]
+        try:
+            prices = await asyncio.to_thread(
+                harvest_vendor,
+                vendor,
+                listings[vendor],
+                fetchers,
+                tile_price,
+                urls,
+                functools.partial(archive_listing_page, urls),
+            )
+        except Exception as e:
+            logger.warning("Listing harvest failed for %s: %s", vendor, e)
+            continue
+        for url in urls:
+            price = prices.get(normalize_product_url(url))
+            if price:
+                bulk[url] = (price, f"{label}-listing")
+        logger.info(
+            "📦 %s listings priced %d of %d rows",
+            vendor,
+            sum(1 for url in urls if url in bulk),
+            len(urls),
         )
+    return bulk
+
+def harbor_freight_price_from_json(text):
+    """Read the price from a Harbor Freight Dynamic Yield response body."""
+    price = json.loads(text).get("feedProperties", {}).get("price")
+    return f"${price}" if price else None
+
+def northern_tool_price_from_json(text):
+    """Read the price from a Northern Tool WCS price response body."""
+    price = nt_parse_price(json.loads(text))
+    return extract_price(with_currency(price)) if price else None
+
+# Product-page extractors by vendor domain
+VENDOR_HTML_EXTRACTORS = {
+    "msc.com": ("msc", msc_price_from_html),
+    "mscdirect.com": ("msc", msc_price_from_html),
+    "menards.com": ("menards", menards_price_from_html),
+    "grainger.com": ("grainger", grainger_price_from_html),
+    "zoro.com": ("zoro", zoro_price_from_html),
+    "casterdepot.com": ("casterdepot", caster_depot_price_from_html),
+}
+
+# The Scrapy engine sees pages that were not rendered, so only structured
+# data and the vendors' own selectors count there, never the fuzzy text scan
+SCRAPY_HTML_EXTRACTORS = {
+    vendor: (label, functools.partial(extractor, fuzzy=False))
+    for vendor, (label, extractor) in VENDOR_HTML_EXTRACTORS.items()
+}
+
+def scrapy_job(idx, row):
+    """Return the Scrapy job for a row that needs no browser, else None.
+
+    Harbor Freight and Northern Tool are priced from their JSON endpoints.
+    Other rows are crawled as static HTML unless their domain was recently
+    marked as needing a browser.
+    """
+    url = row_url(row)
+    domain = urlparse(url).netloc.lower()
+    if not url or row_is_forced(row) or "castercity.com" in domain:
+        return None
+    job = {"idx": idx, "url": url, "fetch_url": url, "html": False}
+    if "harborfreight.com" in domain:
+        job.update(
+            fetch_url=hf_build_dy_url(url),
+            parse=harbor_freight_price_from_json,
+            method="harborfreight-scrapy",
+        )
+        return job
+    if "northerntool.com" in domain:
+        part = nt_extract_part_number(url)
+        if not part:
+            return None
+        job.update(
+            fetch_url=NT_JSON_TEMPLATE.format(part=part),
+            headers={"Accept": "application/json"},
+            parse=northern_tool_price_from_json,
+            method="northerntool-scrapy",
+        )
+        return job
+    if STRATEGY_MEMO.browser_required(url, STATIC_RECHECK_DAYS * 86400):
+        return None
+    job["html"] = True
+    for vendor, (label, extractor) in SCRAPY_HTML_EXTRACTORS.items():
+        if domain == vendor or domain.endswith("." + vendor):
+            job.update(parse=extractor, method=f"{label}-scrapy")
+            return job
+    selector = row[2].strip() if len(row) > 2 else ""
+    job.update(
+        parse=functools.partial(static_price_from_html, selector=selector or None),
+        method="static-scrapy",
+    )
+    return job
+
+def scrapy_settings():
+    return {
+        "CONCURRENT_REQUESTS": max(CONCURRENCY * 8, 32),
+        "CONCURRENT_REQUESTS_PER_DOMAIN": SCRAPY_PER_DOMAIN,
+        "HTTPCACHE_DIR": os.path.abspath(os.path.join(STATE_DIR, "httpcache")),
+        "HTTPCACHE_ENABLED": SCRAPY_CACHE_HOURS > 0,
+        "HTTPCACHE_EXPIRATION_SECS": int(SCRAPY_CACHE_HOURS * 3600),
+    }
+
+async def scrapy_prefetch_prices(rows, skip=()):
+    """Return ``{url: (price, method)}`` for rows priced by the Scrapy engine.
+
+    Misses go through the browser pass as usual; HTML misses also mark the
+    domain as needing a browser so later runs stop crawling it.
+    """
+    jobs = []
+    seen = set(skip)
+    for idx, row in enumerate(rows):
+        url = row_url(row)
+        if url in seen:
+            continue
+        job = scrapy_job(idx, row)
+        if job:
+            seen.add(url)
+            jobs.append(job)
+    if not jobs:
+        return {}
+
+    from scrapy_engine import crawl  # optional engine, imported on demand
+
+    archive = None
+    if ARCHIVE and not HAR_REPLAY_DIR:
+        archive = {
+            "root": ARCHIVE.root,
+            "max_bytes": ARCHIVE.max_bytes,
+            "codec": ARCHIVE.codec,
+            "run_id": ARCHIVE.run_id,
+        }
+    started = time.perf_counter()
+    try:
+        results = await asyncio.to_thread(crawl, jobs, scrapy_settings(), archive)
+    except Exception as e:
+        logger.warning("Scrapy engine failed: %s", e)
+        return {}
+
+    bulk = {}
+    static_ok = {}
+    for job in jobs:
+        url = job["url"]
+        result, status, snippet, method = results.get(
+            job["idx"], ("No result", None, None, job["method"])
+        )
+        price = extract_price(result or "")
+        if price:
+            bulk[url] = (price, method)
+        else:
+            logger.debug(
+                "Scrapy miss via %s | URL: %s | Status: %s | %s", method, url, status, result
+            )
+        if job["html"] and (price or status == 200):
+            domain = urlparse(url).netloc.lower()
+            static_ok[domain] = (url, bool(price) or static_ok.get(domain, (url, False))[1])
+    for url, ok in static_ok.values():
+        STRATEGY_MEMO.set_browser_required(url, not ok)
+    logger.info(
+        "🕷️ Scrapy engine priced %d of %d rows in %.1fs",
+        len(bulk),
+        len(jobs),
+        time.perf_counter() - started,
+    )
+    return bulk
+
+CONTEXT_OPTIONS = {
+    "ignore_https_errors": True,
+    "user_agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/113.0.0.0 Safari/537.36"
+    ),
+}
+
+def har_path_for(har_dir, url):
+    """Return the HAR archive path for a URL, stable across sheet reorders."""
+    # Ports and credentials in the netloc must not reach the file name
+    domain = re.sub(r"[^a-z0-9.-]+", "_", urlparse(url).netloc.lower()) or "no-domain"
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(har_dir, f"{domain}-{digest}.har")
+
+async def new_har_context(browser, url):
+    """Create a per-row context that records to or replays from a HAR file."""
+    if HAR_RECORD_DIR:
+        os.makedirs(HAR_RECORD_DIR, exist_ok=True)
+        context = await browser.new_context(
+            **CONTEXT_OPTIONS,
+            record_har_path=har_path_for(HAR_RECORD_DIR, url),
+            record_har_content="embed",
+        )
+    else:
+        context = await browser.new_context(**CONTEXT_OPTIONS)
+        har_file = har_path_for(HAR_REPLAY_DIR, url)
+        if os.path.exists(har_file):
+            await context.route_from_har(har_file, not_found="abort")
+        else:
+            logger.warning("No HAR archive for %s; aborting all requests", url)
+            await context.route("**/*", lambda route: route.abort())
+    if STEALTH_MODE:
+        await context.add_init_script(STEALTH_JS)
+    return context
+
+class BrowserSession:
+    """Playwright browser, context and idle pages that outlive a single run.
+
+    ``scrape_all`` borrows pages with :meth:`take_pages` and hands them back
+    with :meth:`return_pages`. A one-off run closes the session afterwards,
+    while daemon mode keeps it warm across runs. A browser that crashed or
+    disconnected is relaunched on the next :meth:`take_pages`.
+    """
 
-        results = [None] * len(rows)
-        errors = []
+    def __init__(self):
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.restarts = 0
+        self._idle = []
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        self.playwright = await async_playwright().start()
+        await self._launch()
+        return self
+
+    async def _launch(self):
+        self.browser = await self.playwright.chromium.launch(
+            headless=HEADLESS,
+            proxy={"server": BROWSER_PROXY} if BROWSER_PROXY else None,
+        )
+        self.context = await self.browser.new_context(**CONTEXT_OPTIONS)
+        self._idle = []
 
-        # Create a pool of pages according to the desired concurrency
-        page_pool = asyncio.Queue()
-        for _ in range(concurrency):
-            new_page = await context.new_page()
+    def connected(self):
+        return bool(self.browser and self.browser.is_connected())
+
+    async def ensure(self):
+        """Relaunch the browser if it is gone."""
+        async with self._lock:
+            if self.connected():
+                return
+            logger.warning("♻️ Browser disconnected; relaunching")
+            self.restarts += 1
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+            await self._launch()
+
+    async def take_pages(self, count):
+        await self.ensure()
+        pages = []
+        while len(pages) < count and self._idle:
+            page = self._idle.pop()
+            if not page.is_closed():
+                pages.append(page)
+        while len(pages) < count:
+            page = await self.context.new_page()
             if STEALTH_MODE:
-                await new_page.add_init_script(STEALTH_JS)
-            page_pool.put_nowait(new_page)
+                await page.add_init_script(STEALTH_JS)
+            pages.append(page)
+        return pages
+
+    async def return_pages(self, pages):
+        for page in pages:
+            if page.is_closed():
+                continue
+            if self.connected():
+                self._idle.append(page)
+
+    async def close(self):
+        for page in self._idle:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        self._idle = []
+        for closer in (self.context, self.browser):
+            try:
+                if closer:
+                    await closer.close()
+            except Exception:
+                pass
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+# Extra time a row may take past its budget before it is cancelled outright
+DEADLINE_GRACE = 5.0
+
+async def scrape_all(
+    rows,
+    concurrency=CONCURRENCY,
+    row_budget=None,
+    run_budget=None,
+    on_result=None,
+    session=None,
+):
+    """Scrape prices for each row concurrently using a pool of pages.
+
+    ``row_budget`` caps the time spent on one row and ``run_budget`` the
+    whole run (seconds, ``0`` for no limit; defaults come from
+    ``ROW_BUDGET``/``RUN_BUDGET``). Once the run budget is spent no new rows
+    are started and the rows still waiting are reported as skipped.
+
+    Returns ``(results, errors)`` for the sheet. If ``on_result`` is given it
+    receives one record dict per row as soon as that row finishes, and
+    nothing is collected (both lists come back empty). A :class:`BrowserSession`
+    passed as ``session`` is reused and left open; otherwise one is started
+    for this run.
+    """
+    row_budget = ROW_BUDGET if row_budget is None else row_budget
+    run_budget = RUN_BUDGET if run_budget is None else run_budget
+    run_deadline = Deadline(run_budget)
+    RENDER_STATS.reset()
+    GOVERNOR.begin_run(len(rows))
+    if ARCHIVE and not HAR_REPLAY_DIR:
+        ARCHIVE.begin_run()
+    # Catalog and crawler engines price what they can before the browser pass
+    bulk_prices = await prefetch_bulk_prices(rows)
+    async with contextlib.AsyncExitStack() as stack:
+        if session is None:
+            session = await stack.enter_async_context(BrowserSession())
+            # A warm session (daemon mode) keeps its Selenium drivers too
+            stack.push_async_callback(asyncio.to_thread, close_grainger_driver_pool)
+        else:
+            await session.ensure()
+        browser = session.browser
+        har_mode = in_har_mode()
 
-        async def scrape_row(idx, row):
+        results = [] if on_result else [None] * len(rows)
+        errors = []
+        skipped = 0
+        recovered = 0
+        retries = RetryScheduler(
+            max_attempts=RETRY_ATTEMPTS,
+            base_delay=RETRY_BASE_DELAY,
+            max_delay=RETRY_MAX_DELAY,
+            per_domain=RETRY_PER_DOMAIN,
+        )
+
+        # Single flight: rows for the same product (by url_canon.product_key),
+        # selector and flags share the first row's fetch. Later rows register
+        # as followers instead of waiting, so no worker blocks on a leader
+        # that is parked in the retry queue. A settled flight is dropped and
+        # only its price and status are kept for late duplicates, so a long
+        # streamed run does not hold every page snippet.
+        flights = {}
+        flight_of = {}
+        settled = {}
+        shared = 0
+
+        def emit(idx, vendor, url, selector, price, method="", status=None,
+                 error=None, snippet=None, elapsed=None, attempts=1):
+            outcome = dict(
+                price=price, method=method, status=status, error=error,
+                snippet=snippet, elapsed=elapsed, attempts=attempts,
+            )
+            record(idx, vendor, url, selector, **outcome)
+            key = flight_of.pop(idx, None)
+            if key is not None:
+                for follower in flights.pop(key):
+                    record(*follower, **outcome)
+                settled[key] = dict(
+                    price=price, method=method, status=status, error=error, attempts=attempts
+                )
+
+        def join_flight(idx, vendor, url, selector, flags):
+            """Return True if another row already covers this product."""
+            nonlocal shared
+            key = (product_key(url), selector, flags)
+            if key in settled:
+                shared += 1
+                record(idx, vendor, url, selector, **settled[key])
+                return True
+            followers = flights.get(key)
+            if followers is None:
+                flights[key] = []
+                flight_of[idx] = key
+                return False
+            shared += 1
+            followers.append((idx, vendor, url, selector))
+            return True
+
+        def record(idx, vendor, url, selector, price, method="", status=None,
+                   error=None, snippet=None, elapsed=None, attempts=1):
+            GOVERNOR.row_done()
+            if ARCHIVE and not HAR_REPLAY_DIR:
+                try:
+                    ARCHIVE.record_result(url, price, method)
+                except OSError as e:
+                    logger.debug("Could not archive result for %s: %s", url, e)
+            if on_result:
+                on_result(
+                    {
+                        "row": idx,
+                        "vendor": vendor,
+                        "url": url,
+                        "selector": selector,
+                        "price": price,
+                        "method": method,
+                        "status": status,
+                        "error": error,
+                        "snippet": snippet,
+                        "elapsed": None if elapsed is None else round(elapsed, 2),
+                        "attempts": attempts,
+                    }
+                )
+                return
+            results[idx] = [price]
+            if error is not None:
+                if attempts > 1:
+                    error = f"{error} (after {attempts} attempts)"
+
+                errors.append(
+                    (vendor, url, status, selector or "semantic/fuzzy", method, error, snippet)
+                )
+
+        # Create a pool of pages according to the desired concurrency. In HAR
+        # mode every row needs its own context, so the pool only holds slots.
+        page_pool = asyncio.Queue()
+        pages = [] if har_mode else await session.take_pages(concurrency)
+        # Hand the pages back even if the run fails or is cancelled
+        stack.push_async_callback(session.return_pages, pages)
+        for slot in pages or [None] * concurrency:
+            page_pool.put_nowait(slot)
+
+        async def scrape_row(idx, row, attempt=0):
+            nonlocal skipped, recovered
             vendor = row[0].strip() if len(row) > 0 else ""
             url = row[1].strip() if len(row) > 1 else ""
             selector = row[2].strip() if len(row) > 2 else ""
@@ -735,7 +2054,19 @@ async def scrape_all(rows, concurrency=CONCURRENCY):
             force_node_fallback = "forcenodefallback" in flags
 
             if not url:
-                results[idx] = [""]
+                emit(idx, vendor, url, selector, "")
+                return
+
+            if attempt == 0 and join_flight(
+                idx, vendor, url, selector, (force_selector_only, force_node_fallback)
+            ):
+                logger.info("🔗 Sharing the fetch of an identical product | URL: %s", url)
+                return
+
+            if url in bulk_prices:
+                price, method = bulk_prices[url]
+                emit(idx, vendor, url, selector, price, method)
+                logger.info("✅ Price found: %s via %s | URL: %s", price, method, url)
                 return
 
             logger.info(
@@ -746,71 +2077,742 @@ async def scrape_all(rows, concurrency=CONCURRENCY):
                 notes,
             )
 
-            page = await page_pool.get()
+            slot = await page_pool.get()
+            if run_deadline.expired():
+                await page_pool.put(slot)
+                skipped += 1
+                emit(
+                    idx,
+                    vendor,
+                    url,
+                    selector,
+                    "",
+                    "run-budget",
+                    error="Skipped: run time budget exhausted",
+                    snippet="",
+                )
+                return
+
+            started = time.perf_counter()
+            deadline = run_deadline.child(row_budget)
+            profile_label = f"row {idx} {url}"
+            if PROFILER:
+                PROFILER.label(profile_label)
+            if HAR_REPLAY_DIR and not os.path.exists(har_path_for(HAR_REPLAY_DIR, url)):
+                # Nothing was recorded for this row; replay never goes online
+                await page_pool.put(slot)
+                logger.warning("⚠️ No HAR archive for %s; skipping the row", url)
+                emit(
+                    idx,
+                    vendor,
+                    url,
+                    selector,
+                    "",
+                    "har-missing",
+                    error="No HAR archive recorded for this URL",
+                    snippet="",
+                )
+                return
+
+            har_context = None
             try:
-                result, status, snippet, method = await fetch_price_from_page(
+                page = slot
+                if har_mode:
+                    har_context = await new_har_context(browser, url)
+                    page = await har_context.new_page()
+                fetch = fetch_price_from_page(
                     page,
                     url,
                     selector,
                     force_selector_only=force_selector_only,
                     force_node_fallback=force_node_fallback,
+                    deadline=deadline,
                 )
+                remaining = deadline.remaining()
+                if remaining is None:
+                    result, status, snippet, method = await fetch
+                else:
+                    # Backstop for calls that cannot observe the deadline
+                    try:
+                        result, status, snippet, method = await asyncio.wait_for(
+                            fetch, remaining + DEADLINE_GRACE
+                        )
+                    except asyncio.TimeoutError:
+                        result, status, snippet, method = (
+                            "Timeout: row time budget exhausted",
+                            None,
+                            None,
+                            "deadline",
+                        )
             finally:
-                await page_pool.put(page)
+                if har_context:
+                    # Closing the context flushes the recorded HAR to disk
+                    await har_context.close()
+                await page_pool.put(slot)
+            elapsed = time.perf_counter() - started
+            if PROFILER:
+                PROFILER.row_done(profile_label, elapsed)
+                PROFILER.label("event loop")
 
             parsed = extract_price(result or "")
             if parsed:
                 logger.info(
-                    "✅ Price found: %s via %s | Selector used: %s | URL: %s",
+                    "✅ Price found: %s via %s in %.1fs | Selector used: %s | URL: %s",
                     parsed,
                     method,
+                    elapsed,
                     selector or "", 
                     url,
                 )
-                results[idx] = [parsed]
+                emit(
+                    idx, vendor, url, selector, parsed, method, status,
+                    elapsed=elapsed, attempts=attempt + 1,
+                )
+                recovered += attempt > 0
+                if not (force_selector_only or force_node_fallback):
+                    STRATEGY_MEMO.remember(url, method)
             else:
-                results[idx] = [""]
-                errors.append(
-                    (
-                        vendor,
-                        url,
-                        status,
-                        selector or "semantic/fuzzy",
+                failure = {
+                    "method": method,
+                    "status": status,
+                    "error": result or "",
+                    "snippet": snippet,
+                    "elapsed": elapsed,
+                    "attempts": attempt + 1,
+                }
+                kind = classify_failure(status, method, result)
+                delay = None
+                if not run_deadline.expired():
+                    delay = retries.offer(
+                        (idx, row, attempt + 1, failure), breaker_domain(url), kind, attempt
+                    )
+                if delay is not None:
+                    logger.warning(
+                        "🔁 %s via %s in %.1fs; retrying in %.0fs | URL: %s",
+                        kind,
                         method,
-                        result,
-                        snippet,
+                        elapsed,
+                        delay,
+                        url,
                     )
-                )
+                    return
+                emit(idx, vendor, url, selector, "", **failure)
                 logger.error(
-                    "❌ Failed via %s | URL: %s | Status: %s | Snippet: %s",
+                    "❌ Failed via %s in %.1fs | URL: %s | Status: %s | Snippet: %s",
                     method,
+                    elapsed,
                     url,
                     status,
                     snippet,
                 )
 
-        tasks = [asyncio.create_task(scrape_row(i, row)) for i, row in enumerate(rows)]
-        task_results = await asyncio.gather(*tasks, return_exceptions=True)
+        # A fixed set of workers pulls rows from a shared iterator, so large
+        # inputs do not create one pending task per row up front.
+        pending = enumerate(rows)
 
-        # Log any unexpected exceptions captured by asyncio.gather
-        for res in task_results:
-            if isinstance(res, Exception):
-                errors.append(("", "", None, "gather", "", str(res), ""))
-                logger.error("Unhandled exception during scraping: %s", res)
+        async def run_row(idx, row, attempt=0):
+            try:
+                await scrape_row(idx, row, attempt)
+            except Exception as e:
+                vendor = row[0].strip() if row else ""
+                emit(idx, vendor, row_url(row), "gather", "", error=str(e), snippet="")
+                logger.error("Unhandled exception during scraping: %s", e)
+
+        async def worker():
+            for idx, row in pending:
+                await run_row(idx, row)
+
+        await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+
+        # Deferred retries run once the main pass has freed every page
+        async def retry_worker():
+            while len(retries):
+                delay = retries.next_delay()
+                remaining = run_deadline.remaining()
+                if remaining is not None and delay > remaining:
+                    return
+                if delay:
+                    await asyncio.sleep(min(delay, 1.0))
+                    continue
+                item = retries.pop_due()
+                if item:
+                    idx, row, attempt, _ = item
+                    await run_row(idx, row, attempt)
+
+        if len(retries):
+            logger.info("🔁 Retrying %d rows after the main pass", len(retries))
+            await asyncio.gather(*(retry_worker() for _ in range(max(concurrency, 1))))
+            for idx, row, _, failure in retries.drain():
+                vendor = row[0].strip() if row else ""
+                selector = row[2].strip() if len(row) > 2 else ""
+                emit(idx, vendor, row_url(row), selector, "", **failure)
+                logger.error(
+                    "❌ Failed via %s; retry not started before the run budget ran out | URL: %s",
+                    failure["method"],
+                    row_url(row),
+                )
+            logger.info(
+                "🔁 Retried rows: %s | recovered: %d",
+                ", ".join(f"{kind} {count}" for kind, count in sorted(retries.kinds.items())),
+                recovered,
+            )
+
+        if shared:
+            logger.info("🔗 %d duplicate rows reused another row's fetch", shared)
+        if skipped:
+            logger.warning(
+                "⏳ Run budget of %ss exhausted; %d rows were not started",
+                run_budget,
+                skipped,
+            )
 
-        # Close all pages in the pool
-        while not page_pool.empty():
-            page = await page_pool.get()
-            await page.close()
+        STRATEGY_MEMO.save()
+        GOVERNOR.save()
+        for name, usage in GOVERNOR.summary().items():
+            remaining = usage["remaining"]
+            logger.info(
+                "💳 %s: %d requests, %g credits, %d throttled, %.1fs waiting for slots, "
+                "%d skipped%s",
+                name,
+                usage["requests"],
+                usage["credits"],
+                usage["throttled"],
+                usage["waited"],
+                usage["skipped"],
+                "" if remaining is None else f" | {remaining:g} credits left this month",
+            )
+
+        render = RENDER_STATS.summary()
+        if render["plain_hits"] or render["escalations"] or render["rendered"]:
+            saved = render["seconds_saved"]
+            logger.info(
+                "💸 Scraping services: %d plain hits, %d escalated, %d rendered | "
+                "~%d credits spent, ~%d saved%s",
+                render["plain_hits"],
+                render["escalations"],
+                render["rendered"],
+                render["credits_spent"],
+                render["credits_saved"],
+                "" if saved is None else f", ~{saved:.0f}s saved",
+            )
+        for domain, tier, breaker in BREAKERS.tripped():
+            logger.warning(
+                "⚡ Circuit %s for %s / %s | failures: %d, successes: %d, skipped calls: %d",
+                breaker.state,
+                domain,
+                tier,
+                breaker.failures,
+                breaker.successes,
+                breaker.skipped,
+            )
 
-        await context.close()
-        await browser.close()
         return results, errors
 
+async def profiled(coro):
+    """Await ``coro``, profiling the event loop when --profile is set."""
+    global PROFILER
+    if not PROFILE_PATH:
+        return await coro
+    PROFILER = AsyncProfiler(
+        interval=PROFILE_INTERVAL_MS / 1000, stall_threshold=PROFILE_STALL_MS / 1000
+    )
+    await PROFILER.start()
+    try:
+        return await coro
+    finally:
+        profiler, PROFILER = PROFILER, None
+        await profiler.stop()
+        path = PROFILE_PATH
+        if path == "auto":
+            stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(STATE_DIR, "profiles", f"run-{stamp}.speedscope.json")
+        profiler.write(path)
+        summary = profiler.summary(top=5)
+        logger.info(
+            "🔬 Profile written to %s | %.1fs wall, %.1fs CPU, %.1fs loop busy, "
+            "%d stalls (%.1fs)",
+            path,
+            summary["duration"],
+            summary["cpu_time"],
+            summary["loop_busy"],
+            summary["stall_count"],
+            summary["stall_seconds"],
+        )
+        for blocker in summary["top_blockers"]:
+            logger.info("🔬   loop blocked %.2fs in %s", blocker["seconds"], blocker["site"])
+        for row in summary["top_rows"]:
+            logger.info(
+                "🔬   %s: %.1fs wall, %.2fs loop, %.2fs thread CPU",
+                row["row"],
+                row["wall"],
+                row["loop"],
+                row["thread_cpu"],
+            )
+
+def run_scrape(rows, **kwargs):
+    """Run :func:`scrape_all` on a fresh event loop."""
+    return asyncio.run(profiled(scrape_all(rows, concurrency=CONCURRENCY, **kwargs)))
+
+HAR_ROWS_FILE = "rows.json"
+
+def replay_har_run():
+    """Re-run the recorded rows against their HAR archives and report timings."""
+    rows_file = os.path.join(HAR_REPLAY_DIR, HAR_ROWS_FILE)
+    with open(rows_file, encoding="utf-8") as fh:
+        rows = json.load(fh)
+
+    started = time.perf_counter()
+    prices, errors = run_scrape(rows)
+    elapsed = time.perf_counter() - started
+
+    found = sum(1 for price in prices if price and price[0])
+    logger.info(
+        "⏱️ HAR replay finished %d rows in %.2fs (%.2fs/row) | %d prices, %d errors",
+        len(rows),
+        elapsed,
+        elapsed / max(len(rows), 1),
+        found,
+        len(errors),
+    )
+
+def save_har_rows(rows):
+    """Keep the rows with the archives so a replay needs no Sheets access."""
+    os.makedirs(HAR_RECORD_DIR, exist_ok=True)
+    with open(os.path.join(HAR_RECORD_DIR, HAR_ROWS_FILE), "w", encoding="utf-8") as fh:
+        json.dump(rows, fh, indent=2)
+
+def bulk_file_run(input_path, output_path):
+    """Scrape URLs from a file or stdin and stream results to JSONL/CSV."""
+    rows = read_rows(input_path)
+    if HAR_RECORD_DIR:
+        save_har_rows(rows)
+
+    started = time.perf_counter()
+    found = 0
+    with ResultWriter(output_path) as writer:
+        def on_result(record):
+            nonlocal found
+            found += bool(record["price"])
+            writer.write(record)
+
+        run_scrape(rows, on_result=on_result)
+    logger.info(
+        "📄 Wrote %d results (%d prices) to %s in %.1fs",
+        writer.count,
+        found,
+        output_path,
+        time.perf_counter() - started,
+    )
+
+def archived_html_extractor(url):
+    """Return the vendor's HTML extractor for ``url``, or None for generic pages."""
+    domain = urlparse(url).netloc.lower()
+    for vendor, (_, extractor) in VENDOR_HTML_EXTRACTORS.items():
+        if domain == vendor or domain.endswith("." + vendor):
+            return extractor
+    return None
+
+def reextract_row(task):
+    """Run the current extractors over one URL's archived pages (pool worker).
+
+    As in the live static tier, a sheet selector is authoritative: when it
+    finds nothing, the page yields no price rather than a fuzzy match.
+    """
+    root, url, selector, pages = task
+    archive = HtmlArchive(root)
+    extractor = archived_html_extractor(url)
+    for entry in pages:
+        html = archive.get(entry["digest"])
+        if not html:
+            continue
+        doc = PageArtifacts(html)
+        if entry["source"] == "listing":
+            # A category page: only the tile linking to this product counts
+            vendor = vendor_for(url)
+            price = None
+            if vendor in LISTING_EXTRACTORS:
+                tile_price = functools.partial(LISTING_EXTRACTORS[vendor][1], fuzzy=False)
+                found = harvest_listing_page(
+                    html, entry.get("page_url") or url, LISTING_VENDORS[vendor], tile_price
+                )
+                price = found.get(normalize_product_url(url))
+        elif extractor:
+            price = extractor(doc)
+        elif selector:
+            price = static_price_from_html(doc, selector)
+        else:
+            price = static_price_from_html(doc) or extract_price(html) or bs_price_scan(doc)
+        if price:
+            return price, f"reextract:{entry['source']}"
+    return None, None
+
+def reextract_rows(rows, run_id=None):
+    """Re-price ``rows`` from an archived run without touching the network.
+
+    Returns one record per row, like a bulk-mode result. Rows whose archived
+    pages still yield nothing keep the price that run wrote, if any.
+    """
+    archive = ARCHIVE or HtmlArchive(HTML_ARCHIVE_DIR)
+    archived = archive.load_run(run_id)
+    tasks = []
+    for row in rows:
+        url = row_url(row)
+        selector = row[2].strip() if len(row) > 2 else ""
+        pages = archived.get(url, {}).get("pages", [])
+        tasks.append((archive.root, url, selector or None, pages))
+
+    workers = os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        outcomes = list(
+            pool.map(reextract_row, tasks, chunksize=max(len(tasks) // (workers * 4), 1))
+        )
+
+    records = []
+    for idx, (row, (price, method)) in enumerate(zip(rows, outcomes)):
+        url = row_url(row)
+        if not price:
+            previous = archived.get(url, {}).get("result") or {}
+            price = previous.get("price") if extract_price(previous.get("price") or "") else ""
+            method = "archived-result" if price else "not-archived"
+        records.append(
+            {
+                "row": idx,
+                "vendor": row[0].strip() if row else "",
+                "url": url,
+                "selector": row[2].strip() if len(row) > 2 else "",
+                "price": price,
+                "method": method,
+                "error": None if price else "No archived page yielded a price",
+            }
+        )
+    return records
+
+def reextract_run(run_id, input_path=None, output_path="-"):
+    """Rebuild a price column from archived pages with the current extractors."""
+    started = time.perf_counter()
+    service = None
+    if input_path:
+        rows = read_rows(input_path)
+    else:
+        service = get_sheets_service()
+        rows = get_links_from_sheet(service)
+    records = reextract_rows(rows, run_id)
+
+    if service is None:
+        with ResultWriter(output_path) as writer:
+            for record in records:
+                writer.write(record)
+    else:
+        col_letter = get_next_col_letter(service)
+        write_prices(service, col_letter, [[record["price"]] for record in records])
+        write_timestamp_header(service, col_letter)
+
+    methods = [record["method"] for record in records]
+    reextracted = sum(1 for method in methods if method.startswith("reextract:"))
+    logger.info(
+        "♻️ Re-extracted %d of %d rows from archived pages in %.1fs "
+        "(%d kept the archived price, %d not archived)",
+        reextracted,
+        len(records),
+        time.perf_counter() - started,
+        methods.count("archived-result"),
+        methods.count("not-archived"),
+    )
+
+def price_report(service):
+    """Flag suspicious prices across every price column of the links tab."""
+    # pandas is only imported for the report, not on every scraper start
+    from price_analytics import build_report, history_from_values, write_report
+
+    values = (
+        service.spreadsheets()
+        .values()
+        .get(spreadsheetId=SPREADSHEET_ID, range=LINKS_TAB)
+        .execute()
+        .get("values", [])
+    )
+    info, cells = history_from_values(values)
+    summary, flagged = build_report(
+        info,
+        cells,
+        window=PRICE_REPORT_WINDOW,
+        jump=PRICE_JUMP_FACTOR,
+        change=PRICE_CHANGE_ALERT,
+    )
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    path = os.path.join(STATE_DIR, "reports", f"prices-{stamp}.csv")
+    write_report(flagged, summary, path)
+    flags = summary["flags"]
+    logger.info(
+        "📈 Price report: %d rows x %d runs in %.2fs | %d jumps, %d changes, %d lost, "
+        "%d new | %s",
+        summary["rows"],
+        summary["runs"],
+        summary["seconds"],
+        flags["jump"],
+        flags["change"],
+        flags["lost"],
+        flags["new"],
+        path,
+    )
+    for row in flagged[flagged["flags"].str.contains("jump")].head(5).itertuples():
+        logger.warning(
+            "📈 Row %d %s: %.2f vs median %.2f (x%.1f) | %s",
+            row.row,
+            row.vendor,
+            row.latest,
+            row.median,
+            row.ratio,
+            row.url,
+        )
+    return summary
+
+HAR_RESULTS_FILE = "results.jsonl"
+
+async def sheet_run(service, session=None):
+    """Scrape the links tab and write the results to a new sheet column.
+
+    A recording run skips every non-browser tier, so its prices are not a
+    normal snapshot: they go to ``results.jsonl`` next to the HAR files and
+    the sheet is left untouched.
+    """
+    rows = await asyncio.to_thread(get_links_from_sheet, service)
+
+    if HAR_RECORD_DIR:
+        save_har_rows(rows)
+        results_path = os.path.join(HAR_RECORD_DIR, HAR_RESULTS_FILE)
+        with ResultWriter(results_path) as writer:
+            await profiled(
+                scrape_all(
+                    rows, concurrency=CONCURRENCY, session=session, on_result=writer.write
+                )
+            )
+        logger.info("📼 Recording run: wrote %d results to %s, not the sheet", writer.count, results_path)
+        return [], []
+
+    col_letter = await asyncio.to_thread(get_next_col_letter, service)
+    prices, errors = await profiled(
+        scrape_all(rows, concurrency=CONCURRENCY, session=session)
+    )
+
+    await asyncio.to_thread(write_prices, service, col_letter, prices)
+    await asyncio.to_thread(write_timestamp_header, service, col_letter)
+    await asyncio.to_thread(log_errors, service, errors)
+    if PRICE_REPORT:
+        try:
+            await asyncio.to_thread(price_report, service)
+        except Exception as e:
+            logger.warning("Price report failed: %s", e)
+    return prices, errors
+
+class ScraperDaemon:
+    """Long-running scraper with a warm browser, a schedule and a local API.
+
+    The browser session, HTTP connection pools, Sheets client and in-memory
+    caches survive between runs. Sheet runs start on the schedule or via
+    ``POST /run``; ``/scrape`` checks ad-hoc URLs on pages from the same
+    session.
+    """
+
+    def __init__(self, host=DAEMON_HOST, port=DAEMON_PORT, every=None, at=()):
+        self.every = every
+        self.at = list(at)
+        self.session = BrowserSession()
+        self.service = None
+        self.metrics = Metrics()
+        self.api = ApiServer(
+            {
+                ("GET", "/health"): self.health,
+                ("GET", "/metrics"): self.render_metrics,
+                ("POST", "/run"): self.trigger_run,
+                ("GET", "/scrape"): self.scrape,
+                ("POST", "/scrape"): self.scrape,
+            },
+            host=host,
+            port=port,
+            token=DAEMON_TOKEN,
+        )
+        self.started = datetime.datetime.now()
+        self.last_run = None
+        self.run_task = None
+        self.adhoc_slots = asyncio.Semaphore(CONCURRENCY)
+        self._stop = asyncio.Event()
+
+    def running(self):
+        return self.run_task is not None and not self.run_task.done()
+
+    def next_run(self):
+        return next_run_time(
+            datetime.datetime.now(), self.every, self.at, self.last_run, self.started
+        )
+
+    def start_run(self, reason):
+        if self.running():
+            return False
+        self.last_run = datetime.datetime.now()
+        self.run_task = asyncio.create_task(self._sheet_run(reason))
+        return True
+
+    async def _sheet_run(self, reason):
+        logger.info("🗓️ Starting %s sheet run", reason)
+        started = time.perf_counter()
+        try:
+            if self.service is None:
+                self.service = await asyncio.to_thread(get_sheets_service)
+            prices, errors = await sheet_run(self.service, self.session)
+        except Exception:
+            self.metrics.inc("run_failures_total", help_text="Sheet runs that raised")
+            logger.exception("❌ %s sheet run failed", reason.capitalize())
+            return
+        finally:
+            elapsed = time.perf_counter() - started
+            self.metrics.inc("runs_total", help_text="Sheet runs started")
+            self.metrics.set("last_run_seconds", elapsed, "Duration of the last sheet run")
+            self.metrics.set(
+                "last_run_timestamp", time.time(), "Unix time the last sheet run ended"
+            )
+        found = sum(1 for price in prices if price and price[0])
+        self.metrics.inc("rows_total", len(prices), "Rows scraped by sheet runs")
+        self.metrics.inc("prices_total", found, "Prices found by sheet runs")
+        self.metrics.inc("row_errors_total", len(errors), "Rows logged to the error tab")
+        logger.info(
+            "✅ %s sheet run finished in %.1fs | %d prices, %d errors",
+            reason.capitalize(),
+            elapsed,
+            found,
+            len(errors),
+        )
+
+    async def scheduler(self):
+        while not self._stop.is_set():
+            due = self.next_run()
+            if due is None:
+                return
+            delay = max((due - datetime.datetime.now()).total_seconds(), 0)
+            try:
+                await asyncio.wait_for(self._stop.wait(), delay)
+                return
+            except asyncio.TimeoutError:
+                pass
+            if not self.start_run("scheduled"):
+                # Still busy: count this slot as done and wait for the next one
+                logger.warning("⏭️ Skipping scheduled run; previous run still going")
+                self.last_run = datetime.datetime.now()
+
+    async def health(self, query, body):
+        due = self.next_run()
+        connected = self.session.connected()
+        return (200 if connected else 503), {
+            "status": "ok" if connected else "browser-down",
+            "browser_connected": connected,
+            "uptime_seconds": round((datetime.datetime.now() - self.started).total_seconds()),
+            "running": self.running(),
+            "last_run": self.last_run.isoformat(timespec="seconds") if self.last_run else None,
+            "next_run": due.isoformat(timespec="seconds") if due else None,
+        }
+
+    async def render_metrics(self, query, body):
+        self.metrics.set("run_in_progress", int(self.running()), "1 while a sheet run is going")
+        self.metrics.set(
+            "browser_restarts", self.session.restarts, "Times the browser was relaunched"
+        )
+        return 200, self.metrics.render()
+
+    async def trigger_run(self, query, body):
+        if not self.start_run("requested"):
+            return 409, {"error": "a run is already in progress"}
+        return 202, {"status": "started"}
+
+    async def scrape(self, query, body):
+        if not isinstance(body, dict):
+            return 400, {"error": "body must be a JSON object"}
+        urls = body.get("urls") or []
+        # A bare string would otherwise be queued one character at a time
+        if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+            return 400, {"error": "urls must be a list of strings"}
+        for name in ("url", "selector"):
+            if not isinstance(body.get(name) or "", str):
+                return 400, {"error": f"{name} must be a string"}
+        urls = [url.strip() for url in urls if url.strip()]
+        urls += [body["url"]] if body.get("url") else []
+        if query.get("url"):
+            urls.append(query["url"])
+        selector = body.get("selector") or query.get("selector") or None
+        if not urls:
+            return 400, {"error": "pass url or urls"}
+        if len(urls) > DAEMON_MAX_URLS:
+            return 400, {"error": f"at most {DAEMON_MAX_URLS} urls per request"}
+        results = await asyncio.gather(*(self._scrape_one(url, selector) for url in urls))
+        return 200, {"results": results}
+
+    async def _scrape_one(self, url, selector):
+        async with self.adhoc_slots:
+            started = time.perf_counter()
+            (page,) = await self.session.take_pages(1)
+            try:
+                deadline = Deadline(ROW_BUDGET)
+                result, status, _, method = await asyncio.wait_for(
+                    fetch_price_from_page(page, url, selector, deadline=deadline),
+                    (deadline.remaining() or 0) + DEADLINE_GRACE if ROW_BUDGET else None,
+                )
+            except asyncio.TimeoutError:
+                result, status, method = "Timeout: row time budget exhausted", None, "deadline"
+            finally:
+                await self.session.return_pages([page])
+            elapsed = time.perf_counter() - started
+        price = extract_price(result)
+        if price:
+            STRATEGY_MEMO.remember(url, method)
+        self.metrics.inc("adhoc_requests_total", help_text="URLs checked via /scrape")
+        self.metrics.inc("adhoc_seconds_total", elapsed, "Time spent on /scrape URLs")
+        logger.info("🔎 Ad-hoc %s -> %s via %s in %.1fs", url, price or result, method, elapsed)
+        return {
+            "url": url,
+            "price": price or "",
+            "error": "" if price else result,
+            "method": method,
+            "status": status,
+            "elapsed": round(elapsed, 2),
+        }
+
+    def stop(self):
+        self._stop.set()
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except NotImplementedError:
+                pass
+        await self.session.start()
+        await self.api.start()
+        due = self.next_run()
+        logger.info(
+            "🛰️ Daemon listening on http://%s:%d | next run: %s",
+            self.api.host,
+            self.api.port,
+            due.isoformat(timespec="minutes") if due else "on request",
+        )
+        scheduler = asyncio.create_task(self.scheduler())
+        try:
+            await self._stop.wait()
+        finally:
+            logger.info("🛑 Daemon shutting down")
+            scheduler.cancel()
+            await self.api.close()
+            if self.running():
+                self.run_task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await self.run_task
+            await self.session.close()
+            await asyncio.to_thread(close_grainger_driver_pool)
+
 # === MAIN ===
 def main():
     """Entry point to fetch prices and update the spreadsheet."""
-    global HEADLESS
+    global HEADLESS, HAR_RECORD_DIR, HAR_REPLAY_DIR, ROW_BUDGET, RUN_BUDGET, SCRAPY_ENGINE
+    global GRAINGER_ENGINE, PROFILE_PATH
 
     parser = argparse.ArgumentParser(description="Run the price scraper")
     group = parser.add_mutually_exclusive_group()
@@ -827,19 +2829,135 @@ def main():
         help="Run browser with UI",
     )
     parser.set_defaults(headless=HEADLESS_ENV)
+    har_group = parser.add_mutually_exclusive_group()
+    har_group.add_argument(
+        "--record-har",
+        metavar="DIR",
+        help="Save each row's browser traffic to a HAR file in DIR "
+        "(results go to DIR/results.jsonl, not the sheet)",
+    )
+    har_group.add_argument(
+        "--replay-har",
+        metavar="DIR",
+        help="Serve browser traffic from HAR files in DIR instead of the network",
+    )
+    parser.add_argument(
+        "--scrapy",
+        dest="scrapy_engine",
+        action="store_true",
+        default=SCRAPY_ENGINE,
+        help="Crawl HTTP-only vendors and static-HTML rows with Scrapy first",
+    )
+    parser.add_argument(
+        "--grainger-engine",
+        choices=("playwright", "selenium"),
+        default=GRAINGER_ENGINE,
+        help="Add a pooled Selenium tier ahead of the proxies for Grainger rows",
+    )
+    parser.add_argument(
+        "--input",
+        metavar="FILE",
+        help="Read URLs (url[,selector[,notes]]) from FILE or - for stdin instead of Sheets",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="FILE",
+        default="-",
+        help="With --input, write results to FILE (.csv or .jsonl; default stdout)",
+    )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="auto",
+        metavar="FILE",
+        help="Profile the event loop and write a speedscope file "
+        "(default .scraper_state/profiles/run-<time>.speedscope.json)",
+    )
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="Only write the price-history report for the links tab",
+    )
+    parser.add_argument(
+        "--reextract",
+        nargs="?",
+        const="latest",
+        metavar="RUN",
+        help="Re-price rows offline from the HTML archive of RUN (default: the latest run)",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Stay running with a warm browser, serve the local API and run on a schedule",
+    )
+    parser.add_argument(
+        "--daemon-host", default=DAEMON_HOST, help="Address the daemon API listens on"
+    )
+    parser.add_argument(
+        "--daemon-port", type=int, default=DAEMON_PORT, help="Port the daemon API listens on"
+    )
+    parser.add_argument(
+        "--every",
+        type=float,
+        default=DAEMON_EVERY_MINUTES,
+        metavar="MINUTES",
+        help="With --daemon, run the sheet scrape every MINUTES",
+    )
+    parser.add_argument(
+        "--at",
+        default=DAEMON_AT,
+        metavar="HH:MM,...",
+        help="With --daemon, run the sheet scrape daily at these local times",
+    )
+    parser.add_argument(
+        "--row-budget",
+        type=float,
+        default=ROW_BUDGET,
+        metavar="SECONDS",
+        help="Maximum time spent on one row across all tiers (0 for no limit)",
+    )
+    parser.add_argument(
+        "--run-budget",
+        type=float,
+        default=RUN_BUDGET,
+        metavar="SECONDS",
+        help="Stop starting new rows after this many seconds (0 for no limit)",
+    )
     args = parser.parse_args()
     HEADLESS = args.headless
+    ROW_BUDGET = args.row_budget
+    RUN_BUDGET = args.run_budget
+    SCRAPY_ENGINE = args.scrapy_engine
+    GRAINGER_ENGINE = args.grainger_engine
+    PROFILE_PATH = args.profile
+    HAR_RECORD_DIR = args.record_har
+    HAR_REPLAY_DIR = args.replay_har
 
     logger.info("🔁 Starting scraper-v1.0...")
-    service = get_sheets_service()
-    rows = get_links_from_sheet(service)
-    col_letter = get_next_col_letter(service)
-
-    prices, errors = asyncio.run(scrape_all(rows, concurrency=CONCURRENCY))
+    if HAR_REPLAY_DIR:
+        replay_har_run()
+        return
+    if args.report:
+        price_report(get_sheets_service())
+        return
+    if args.reextract:
+        run_id = None if args.reextract == "latest" else args.reextract
+        reextract_run(run_id, args.input, args.output)
+        return
+    if args.input:
+        bulk_file_run(args.input, args.output)
+        return
+    if args.daemon:
+        every = datetime.timedelta(minutes=args.every) if args.every else None
+        asyncio.run(
+            ScraperDaemon(
+                args.daemon_host, args.daemon_port, every, parse_times(args.at)
+            ).serve()
+        )
+        return
 
-    write_prices(service, col_letter, prices)
-    write_timestamp_header(service, col_letter)
-    log_errors(service, errors)
+    service = get_sheets_service()
+    asyncio.run(sheet_run(service))
     logger.info("✅ Scraping complete.")
 
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+"""Scrapy crawl for rows that can be priced without a browser.
+
+Each job is a dict with ``idx``, ``url`` (the sheet URL), ``fetch_url`` (the
+page or JSON endpoint to download), ``parse`` (a picklable callable turning
+the response text into a price or None), ``method`` and optional
+``headers`` and ``html`` flag. :func:`crawl` returns
+``{idx: (price, status, snippet, method)}``, the same shape
+``fetch_price_from_page`` hands to ``scrape_all``. HTML pages can be added
+to the parent's :class:`html_archive.HtmlArchive` run for ``--reextract``.
+
+The Twisted reactor cannot be restarted and does not mix with the asyncio
+loop, so every crawl runs in a child process. The child is spawned, not
+forked: in daemon mode the parent already runs Playwright, the profiler's
+sampler and executor threads, none of which survive a fork safely.
+"""
+
+import logging
+import multiprocessing
+import queue as queue_module
+from typing import Dict, List, Optional
+
+DEFAULT_SETTINGS = {
+    "AUTOTHROTTLE_ENABLED": True,
+    "AUTOTHROTTLE_START_DELAY": 0.5,
+    "AUTOTHROTTLE_MAX_DELAY": 10.0,
+    "AUTOTHROTTLE_TARGET_CONCURRENCY": 4.0,
+    "CONCURRENT_REQUESTS": 64,
+    "CONCURRENT_REQUESTS_PER_DOMAIN": 8,
+    "DOWNLOAD_TIMEOUT": 20,
+    "RETRY_ENABLED": True,
+    "RETRY_TIMES": 2,
+    "RETRY_HTTP_CODES": [500, 502, 503, 504, 522, 524, 408, 429],
+    # Off by default: a cached page would report the last run's price as fresh
+    "HTTPCACHE_ENABLED": False,
+    "HTTPCACHE_DIR": ".scraper_state/httpcache",
+    "HTTPCACHE_EXPIRATION_SECS": 3600,
+    "HTTPCACHE_IGNORE_HTTP_CODES": [403, 404, 408, 429, 500, 502, 503, 504],
+    "ROBOTSTXT_OBEY": False,
+    "COOKIES_ENABLED": False,
+    "TELNETCONSOLE_ENABLED": False,
+    "LOG_LEVEL": "WARNING",
+    "REQUEST_FINGERPRINTER_IMPLEMENTATION": "2.7",
+    "USER_AGENT": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/113.0.0.0 Safari/537.36"
+    ),
+}
+
+
+def _run_crawl(
+    jobs: List[dict], settings: dict, results_queue, archive: Optional[dict] = None
+) -> None:
+    import scrapy
+    from scrapy.crawler import CrawlerProcess
+
+    results = {}
+    store = None
+    if archive:
+        from html_archive import HtmlArchive
+
+        store = HtmlArchive(archive["root"], archive["max_bytes"], archive["codec"])
+        store.run_id = archive["run_id"]
+
+    class PriceSpider(scrapy.Spider):
+        name = "prices"
+
+        def start_requests(self):
+            for job in jobs:
+                yield scrapy.Request(
+                    job["fetch_url"],
+                    headers=job.get("headers"),
+                    callback=self.parse_price,
+                    errback=self.failed,
+                    cb_kwargs={"job": job},
+                    meta={"handle_httpstatus_all": True},
+                    dont_filter=True,
+                )
+
+        def parse_price(self, response, job):
+            snippet = response.text[:300] if hasattr(response, "text") else ""
+            if response.status != 200:
+                results[job["idx"]] = (
+                    f"HTTP {response.status}",
+                    response.status,
+                    snippet,
+                    job["method"],
+                )
+                return
+            if store is not None and job.get("html"):
+                try:
+                    store.record_page(job["url"], response.text, "scrapy", response.status)
+                except OSError as e:
+                    self.logger.debug("Could not archive %s: %s", job["url"], e)
+            try:
+                price = job["parse"](response.text)
+            except Exception as e:
+                price = None
+                snippet = f"{type(e).__name__}: {e}"
+            results[job["idx"]] = (
+                price or "No price found",
+                response.status,
+                None if price else snippet,
+                job["method"],
+            )
+
+        def failed(self, failure):
+            job = failure.request.cb_kwargs["job"]
+            results[job["idx"]] = (
+                f"Error: {failure.getErrorMessage()}",
+                None,
+                None,
+                job["method"],
+            )
+
+    # Replace the handlers inherited from the parent so LOG_LEVEL applies
+    logging.root.handlers.clear()
+    process = CrawlerProcess(settings)
+    process.crawl(PriceSpider)
+    process.start()
+    results_queue.put(results)
+
+
+def crawl(
+    jobs: List[dict], settings: Optional[dict] = None, archive: Optional[dict] = None
+) -> Dict[int, tuple]:
+    """Download and parse every job with Scrapy; see the module docstring.
+
+    ``archive`` holds the ``root``, ``max_bytes``, ``codec`` and ``run_id``
+    of the archive run that HTML pages are recorded in.
+    """
+    if not jobs:
+        return {}
+    ctx = multiprocessing.get_context("spawn")
+    results_queue = ctx.Queue()
+    proc = ctx.Process(
+        target=_run_crawl,
+        args=(jobs, {**DEFAULT_SETTINGS, **(settings or {})}, results_queue, archive),
+    )
+    proc.start()
+    try:
+        while True:
+            try:
+                return results_queue.get(timeout=1)
+            except queue_module.Empty:
+                if not proc.is_alive():
+                    try:
+                        return results_queue.get_nowait()
+                    except queue_module.Empty:
+                        raise RuntimeError(
+                            f"Scrapy crawl exited with code {proc.exitcode}"
+                        ) from None
+    finally:
+        proc.join(timeout=5)
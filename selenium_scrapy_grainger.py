@@ -1,5 +1,14 @@
+import atexit
 import json
+import os
+import queue
 import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional
+
 from scrapy import Selector
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -9,6 +18,9 @@ from webdriver_manager.chrome import ChromeDriverManager
 
 GRAINGER_URL = "https://www.grainger.com/product/MYTON-INDUSTRIES-Bulk-Container-7-cu-ft-4LMC3"
 
+_driver_path = None
+_driver_path_lock = threading.Lock()
+
 
 def extract_price(html: str) -> str | None:
     sel = Selector(text=html)
@@ -30,20 +42,175 @@ def extract_price(html: str) -> str | None:
     return None
 
 
-def fetch_price(url: str) -> str | None:
+def driver_path() -> str:
+    """Resolve the chromedriver binary once per process.
+
+    ``CHROMEDRIVER_PATH`` skips webdriver-manager entirely.
+    """
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = os.environ.get("CHROMEDRIVER_PATH") or ChromeDriverManager().install()
+        return _driver_path
+
+
+def new_driver(headless: bool = True) -> webdriver.Chrome:
     opts = Options()
-    opts.add_argument("--headless")
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=opts)
-    try:
-        driver.get(url)
-        WebDriverWait(driver, 20).until(lambda d: d.execute_script("return document.readyState") == "complete")
-        html = driver.page_source
-    finally:
-        driver.quit()
-    return extract_price(html)
+    if headless:
+        opts.add_argument("--headless=new")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--window-size=1366,900")
+    return webdriver.Chrome(service=Service(driver_path()), options=opts)
+
+
+class DriverPool:
+    """Long-lived Chrome drivers shared by concurrent fetches.
+
+    Drivers start lazily up to ``size``. Each one is quit and replaced after
+    ``max_pages`` page loads (0 keeps it forever) or after any error, so a
+    leaking or wedged browser does not outlive a few pages.
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 50, headless: bool = True):
+        self.size = max(1, size)
+        self.max_pages = max_pages
+        self.headless = headless
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._started = 0
+        self._closed = False
+
+    def _acquire(self, timeout: Optional[float]):
+        give_up = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                start = self._started < self.size
+                if start:
+                    self._started += 1
+            if start:
+                try:
+                    return [new_driver(self.headless), 0]
+                except Exception:
+                    with self._lock:
+                        self._started -= 1
+                    raise
+            # Poll so a slot freed by a recycled driver is noticed too
+            wait = 0.5 if give_up is None else min(0.5, give_up - time.monotonic())
+            if wait <= 0:
+                raise TimeoutError("No idle WebDriver available")
+            try:
+                return self._idle.get(timeout=wait)
+            except queue.Empty:
+                continue
+
+    def _release(self, slot, broken: bool = False) -> None:
+        driver, pages = slot
+        if broken or self._closed or (self.max_pages and pages >= self.max_pages):
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            with self._lock:
+                self._started -= 1
+            return
+        self._idle.put(slot)
+
+    @contextmanager
+    def driver(self, timeout: Optional[float] = None):
+        """Borrow a driver; it counts as one page load when returned."""
+        slot = self._acquire(timeout)
+        broken = True
+        try:
+            yield slot[0]
+            broken = False
+        finally:
+            slot[1] += 1
+            self._release(slot, broken)
+
+    def fetch_html(self, url: str, timeout: float = 30) -> str:
+        """Load ``url`` and return the rendered page source."""
+        started = time.monotonic()
+        with self.driver(timeout) as driver:
+            remaining = max(1.0, timeout - (time.monotonic() - started))
+            driver.set_page_load_timeout(remaining)
+            driver.get(url)
+            WebDriverWait(driver, remaining).until(
+                lambda d: d.execute_script("return document.readyState") == "complete"
+            )
+            return driver.page_source
+
+    def fetch_prices(
+        self,
+        urls: Iterable[str],
+        extractor: Callable[[str], Optional[str]] = extract_price,
+        timeout: float = 30,
+    ) -> Dict[str, Optional[str]]:
+        """Return ``{url: price}`` for ``urls``, spread across the pool."""
+        urls = list(dict.fromkeys(urls))
+
+        def one(url):
+            try:
+                return extractor(self.fetch_html(url, timeout))
+            except Exception:
+                return None
+
+        with ThreadPoolExecutor(max_workers=self.size) as executor:
+            return dict(zip(urls, executor.map(one, urls)))
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                driver, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            with self._lock:
+                self._started -= 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def default_pool() -> DriverPool:
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DriverPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+def fetch_price(url: str, pool: Optional[DriverPool] = None) -> str | None:
+    return extract_price((pool or default_pool()).fetch_html(url))
+
+
+def fetch_prices(urls: Iterable[str], pool: Optional[DriverPool] = None) -> Dict[str, Optional[str]]:
+    return (pool or default_pool()).fetch_prices(urls)
 
 
 if __name__ == "__main__":
-    price = fetch_price(GRAINGER_URL)
-    print("Price:", price)
\ No newline at end of file
+    import sys
+
+    with DriverPool(size=2) as pool:
+        for url, price in pool.fetch_prices(sys.argv[1:] or [GRAINGER_URL]).items():
+            print(f"{url}: {price}")
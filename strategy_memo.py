@@ -0,0 +1,131 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Methods tried before the browser that cost up to a minute when they miss.
+# Only a URL's own entry selects them; other products on the domain would
+# otherwise all start with the slow call.
+URL_ONLY_METHODS = {"node-fallback", "grainger-puppeteer"}
+
+
+def memo_domain(url: str) -> str:
+    domain = urlparse(url).netloc.lower()
+    return domain[4:] if domain.startswith("www.") else domain
+
+
+class StrategyMemo:
+    """Persisted record of the extraction method that last worked.
+
+    Entries are kept per URL and per domain. Each holds the method string
+    returned by ``fetch_price_from_page`` and, for semantic hits, the concrete
+    CSS selector that matched. A URL entry wins over its domain entry, so a
+    selector learned on one product is tried on the vendor's other products
+    until they record their own. Methods in :data:`URL_ONLY_METHODS` are
+    recorded per URL only.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.urls = {}
+        self.domains = {}
+        self._staged = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    data = json.load(fh)
+                self.urls = data.get("urls", {})
+                self.domains = data.get("domains", {})
+            except Exception as e:
+                logger.warning("Ignoring unreadable strategy memo %s: %s", path, e)
+
+    def lookup(self, url: str) -> dict:
+        """Return the memo entry for ``url``, falling back to its domain."""
+        with self._lock:
+            entry = self.urls.get(url)
+            if not entry:
+                entry = self.domains.get(memo_domain(url)) or {}
+                if entry.get("method") in URL_ONLY_METHODS:
+                    entry = {}  # written before these were kept per URL
+            return dict(entry)
+
+    def stage_selector(self, url: str, selector: Optional[str]) -> None:
+        """Hold the selector of a semantic hit until :meth:`remember` records it."""
+        if selector:
+            with self._lock:
+                self._staged[url] = selector
+
+    def remember(self, url: str, method: str, selector: Optional[str] = None) -> None:
+        """Record ``method`` (and optionally ``selector``) as the winner for ``url``.
+
+        Without ``selector``, one staged for ``url`` by :meth:`stage_selector`
+        is used. Each call counts one hit.
+        """
+        now = int(time.time())
+        with self._lock:
+            selector = selector or self._staged.pop(url, None)
+            tables = [(self.urls, url)]
+            if method not in URL_ONLY_METHODS:
+                tables.append((self.domains, memo_domain(url)))
+            for table, key in tables:
+                entry = table.setdefault(key, {})
+                if selector:
+                    entry["selector"] = selector
+                elif entry.get("method") != method:
+                    entry.pop("selector", None)
+                entry["method"] = method
+                entry["updated"] = now
+                entry["hits"] = entry.get("hits", 0) + 1
+            self._dirty = True
+
+    def browser_required(self, url: str, recheck_after: float) -> bool:
+        """Return True if the domain recently needed a browser for prices."""
+        return self._marked(url, "browser_required", recheck_after)
+
+    def set_browser_required(self, url: str, required: bool) -> None:
+        """Record whether a plain HTTP fetch was enough for ``url``'s domain."""
+        self._mark(url, "browser_required", required)
+
+    def render_required(self, url: str, recheck_after: float) -> bool:
+        """Return True if scraping services recently had to render the domain."""
+        return self._marked(url, "render_required", recheck_after)
+
+    def set_render_required(self, url: str, required: bool) -> None:
+        """Record whether a non-rendered service fetch was enough for the domain."""
+        self._mark(url, "render_required", required)
+
+    def _marked(self, url: str, flag: str, recheck_after: float) -> bool:
+        with self._lock:
+            marked = self.domains.get(memo_domain(url), {}).get(flag)
+        return bool(marked) and time.time() - marked < recheck_after
+
+    def _mark(self, url: str, flag: str, required: bool) -> None:
+        with self._lock:
+            entry = self.domains.setdefault(memo_domain(url), {})
+            if required:
+                entry[flag] = int(time.time())
+            elif entry.pop(flag, None) is None:
+                return
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the memo to disk if it changed."""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            data = {"urls": self.urls, "domains": self.domains}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump(data, fh, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+            self._dirty = False
@@ -0,0 +1,17 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture(scope="session")
+def scraper():
+    """scraper-v1.0.py, whose file name is not a valid module name."""
+    spec = importlib.util.spec_from_file_location("scraper_v1", ROOT / "scraper-v1.0.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,42 @@
+import asyncio
+
+from async_profiler import AsyncProfiler
+
+
+def test_stop_restores_the_loop_executor():
+    async def run():
+        loop = asyncio.get_running_loop()
+        await asyncio.to_thread(lambda: None)  # create the loop's own executor
+        original = loop._default_executor
+
+        for _ in range(2):  # back-to-back runs, as in daemon mode
+            profiler = AsyncProfiler(interval=0.001)
+            await profiler.start()
+            profiler.label("row 2")
+            seen = await asyncio.to_thread(lambda: dict(profiler.thread_labels))
+            await profiler.stop()
+            assert "row 2" in seen.values()
+            assert loop._default_executor is original
+
+            # Work after the run no longer reports to the stopped profiler
+            charged = dict(profiler.thread_cpu)
+            await asyncio.to_thread(lambda: None)
+            assert dict(profiler.thread_cpu) == charged
+
+    asyncio.run(run())
+
+
+def test_labeling_threads_are_shut_down():
+    async def run():
+        profiler = AsyncProfiler(interval=0.001)
+        await profiler.start()
+        executor = profiler._executor
+        await asyncio.to_thread(lambda: None)
+        await profiler.stop()
+        return executor
+
+    executor = asyncio.run(run())
+    assert executor._shutdown
+    for thread in list(executor._threads):
+        thread.join(timeout=1)
+        assert not thread.is_alive()
@@ -0,0 +1,73 @@
+import asyncio
+import time
+
+import pytest
+
+from block_detect import detect_block
+from circuit_breaker import CLOSED, OPEN, BreakerRegistry
+
+PRODUCT_PAGE = (
+    "<html><head><title>4 in. Swivel Caster</title>"
+    '<script src="/_Incapsula_Resource?SWJIYLWA=719d34d31c8e3a6e6fffd425f7e032f3"></script>'
+    '<script src="/cdn-cgi/challenge-platform/h/b/scripts/jsd/main.js"></script>'
+    "</head><body>" + "<p>Heavy duty caster.</p>" * 2000 + '<span class="price">$12.99</span>'
+    "</body></html>"
+)
+
+
+def test_injected_cdn_scripts_on_a_product_page_are_not_a_block():
+    assert detect_block(200, {}, PRODUCT_PAGE) is None
+
+
+@pytest.mark.parametrize(
+    "status, html",
+    [
+        (403, PRODUCT_PAGE),
+        (200, '<html><script src="/_Incapsula_Resource?x=1"></script></html>'),
+        (200, PRODUCT_PAGE.replace("4 in. Swivel Caster", "Access Denied")),
+    ],
+)
+def test_injected_scripts_count_on_challenge_pages(status, html):
+    assert detect_block(status, {}, html) in ("imperva", "cloudflare")
+
+
+def test_challenge_only_markers_match_anywhere():
+    page = PRODUCT_PAGE.replace("</head>", "<script>window._cf_chl_opt={}</script></head>")
+    assert detect_block(200, {}, page) == "cloudflare"
+    assert detect_block(200, {"cf-mitigated": "challenge"}, PRODUCT_PAGE) == "cloudflare"
+
+
+class FlakyPage:
+    """Playwright page whose first navigation times out."""
+
+    def __init__(self, timeout_error):
+        self.timeout_error = timeout_error
+        self.navigations = 0
+
+    async def goto(self, url, timeout=None):
+        self.navigations += 1
+        if self.navigations == 1:
+            raise self.timeout_error(f"Timeout {timeout}ms exceeded.")
+        return type("Response", (), {"status": 200, "headers": {}})()
+
+    async def title(self):
+        return "4 in. Swivel Caster"
+
+
+def test_timed_out_half_open_probe_lets_the_tier_recover(scraper, monkeypatch):
+    breakers = BreakerRegistry(min_calls=1, cooldown=0.01)
+    monkeypatch.setattr(scraper, "BREAKERS", breakers)
+    url = "https://shop.test/caster"
+    breakers.record("shop.test", "browser", False)
+    time.sleep(0.02)
+    page = FlakyPage(scraper.PlaywrightTimeoutError)
+
+    with pytest.raises(scraper.PlaywrightTimeoutError):
+        asyncio.run(scraper.goto_checked(page, url, 1000))
+    breaker = breakers.get("shop.test", "browser")
+    assert breaker.probes_in_flight == 0
+    assert breaker.state == OPEN
+
+    time.sleep(0.05)  # the doubled cooldown
+    asyncio.run(scraper.goto_checked(page, url, 1000))
+    assert breaker.state == CLOSED
@@ -0,0 +1,55 @@
+import csv
+import json
+
+import pytest
+
+from bulk_io import RESULT_FIELDS, ResultWriter, read_rows
+
+
+def test_plain_lines_with_comments_and_tabs(tmp_path):
+    path = tmp_path / "urls.txt"
+    path.write_text(
+        "# casters to check\n"
+        "https://www.shop.test/a\tspan.price\tbulk\n"
+        "\n"
+        "https://other.test/b\n",
+        encoding="utf-8",
+    )
+
+    assert read_rows(str(path)) == [
+        ["www.shop.test", "https://www.shop.test/a", "span.price", "bulk"],
+        ["other.test", "https://other.test/b", "", ""],
+    ]
+
+
+def test_header_columns_in_any_order(tmp_path):
+    path = tmp_path / "urls.csv"
+    path.write_text("notes,url,vendor\nred,https://shop.test/a,Shop\n", encoding="utf-8")
+
+    assert read_rows(str(path)) == [["Shop", "https://shop.test/a", "", "red"]]
+
+
+RECORDS = [
+    {"row": 2, "url": "https://shop.test/a", "price": "$12.34", "method": "static", "attempts": 1},
+    {"row": 3, "url": "https://shop.test/b", "price": "", "error": "Timeout, retried", "attempts": 2},
+]
+
+
+@pytest.mark.parametrize("name", ["out.jsonl", "out.csv"])
+def test_results_round_trip(tmp_path, name):
+    path = tmp_path / name
+    with ResultWriter(str(path)) as writer:
+        for record in RECORDS:
+            writer.write(record)
+    assert writer.count == 2
+
+    with open(path, newline="", encoding="utf-8") as fh:
+        if name.endswith(".csv"):
+            rows = list(csv.DictReader(fh))
+            assert list(rows[0]) == RESULT_FIELDS
+            assert [(r["row"], r["price"], r["error"]) for r in rows] == [
+                ("2", "$12.34", ""),
+                ("3", "", "Timeout, retried"),
+            ]
+        else:
+            assert [json.loads(line) for line in fh] == RECORDS
@@ -0,0 +1,107 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from caster_city_scraper import STORE_API_PATH, bulk_prices_for_urls
+
+PRODUCTS = 250
+
+
+def product(n):
+    return {
+        "id": 1000 + n,
+        "slug": f"caster-{n}",
+        "permalink": f"https://castercity.com/product/caster-{n}/",
+        # Every tenth product is priced in whole yen to exercise minor units
+        "prices": (
+            {"price": str(500 + n), "currency_minor_unit": 0, "currency_prefix": "¥"}
+            if n % 10 == 0
+            else {"price": str(1000 + n), "currency_minor_unit": 2, "currency_prefix": "$"}
+        ),
+    }
+
+
+class StoreApiStub(BaseHTTPRequestHandler):
+    failing_pages = set()
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        per_page = int(query.get("per_page", ["10"])[0])
+        page = int(query.get("page", ["1"])[0])
+        if parsed.path != STORE_API_PATH:
+            self.send_error(404)
+            return
+        if page in self.failing_pages:
+            self.send_error(500)
+            return
+        start = (page - 1) * per_page
+        items = [product(n) for n in range(start, min(start + per_page, PRODUCTS))]
+        body = json.dumps(items).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("X-WP-Total", str(PRODUCTS))
+        self.send_header("X-WP-TotalPages", str(-(-PRODUCTS // per_page)))
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def store_api():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StoreApiStub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    StoreApiStub.failing_pages = set()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session():
+    session = requests.Session()
+    session.trust_env = False  # never route the stub through a configured proxy
+    return session
+
+
+URLS = [
+    "https://castercity.com/product/caster-1/",
+    "https://www.castercity.com/product/caster-20/?utm_source=x",
+    "https://castercity.com/?p=1151",
+    "https://castercity.com/product/caster-249/",
+    "https://castercity.com/product/not-in-catalog/",
+]
+
+
+def test_pages_through_the_whole_catalog(store_api, session):
+    prices = bulk_prices_for_urls(URLS, store_api, per_page=100, session=session)
+
+    assert prices == {
+        URLS[0]: "$10.01",
+        URLS[1]: "¥520",
+        URLS[2]: "$11.51",
+        URLS[3]: "$12.49",  # on page 3 of 3
+    }
+
+
+def test_failed_page_keeps_the_others(store_api, session):
+    StoreApiStub.failing_pages = {2}
+
+    prices = bulk_prices_for_urls(URLS, store_api, per_page=100, session=session)
+
+    assert prices == {URLS[0]: "$10.01", URLS[1]: "¥520", URLS[3]: "$12.49"}
+
+
+def test_failed_first_page_raises(store_api, session):
+    StoreApiStub.failing_pages = {1}
+
+    with pytest.raises(requests.HTTPError):
+        bulk_prices_for_urls(URLS, store_api, per_page=100, session=session)
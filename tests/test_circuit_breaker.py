@@ -0,0 +1,95 @@
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, BreakerRegistry, CircuitBreaker
+
+
+def tripped_breaker(**options):
+    breaker = CircuitBreaker(min_calls=2, window=4, cooldown=60, **options)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record(False)
+    assert breaker.state == OPEN
+    return breaker
+
+
+def cool_down(breaker):
+    breaker.opened_at -= breaker.cooldown + 1
+
+
+def test_opens_at_the_failure_rate_and_rejects_calls():
+    breaker = CircuitBreaker(min_calls=3, window=4, failure_rate=0.5)
+    breaker.record(True)
+    breaker.record(False)
+    assert breaker.state == CLOSED  # too few calls to judge
+    breaker.record(False)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    assert breaker.skipped == 1
+
+
+def test_successful_probe_closes_and_resets_the_cooldown():
+    breaker = tripped_breaker()
+    cool_down(breaker)
+
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # one probe at a time
+    breaker.record(True)
+
+    assert breaker.state == CLOSED
+    assert breaker.cooldown == 60
+    assert breaker.allow()
+
+
+def test_failed_probe_reopens_with_a_doubled_capped_cooldown():
+    breaker = tripped_breaker(max_cooldown=100)
+    for expected in (100, 100):
+        cool_down(breaker)
+        assert breaker.allow()
+        breaker.record(False)
+        assert breaker.state == OPEN
+        assert breaker.cooldown == expected
+        assert not breaker.allow()
+
+
+def test_recording_a_probe_frees_its_slot():
+    breaker = tripped_breaker(probes=2)
+    cool_down(breaker)
+    assert breaker.allow() and breaker.allow()
+    assert breaker.probes_in_flight == 2
+    assert not breaker.allow()
+
+    breaker.record(False)
+
+    assert breaker.probes_in_flight == 1
+    assert breaker.state == OPEN
+
+
+def test_registry_keys_breakers_by_domain_and_tier():
+    registry = BreakerRegistry(min_calls=1, cooldown=60)
+    registry.record("a.test", "browser", False)
+
+    assert not registry.allow("a.test", "browser")
+    assert registry.allow("a.test", "static")
+    assert registry.allow("b.test", "browser")
+    assert [(d, t) for d, t, _ in registry.tripped()] == [("a.test", "browser")]
+
+
+def test_release_frees_a_probe_without_an_outcome():
+    breaker = tripped_breaker()
+    cool_down(breaker)
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.release()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.probes_in_flight == 0
+    assert breaker.allow()
+    assert (breaker.successes, breaker.failures) == (0, 2)
+
+
+def test_retry_in_counts_down_the_cooldown():
+    breaker = tripped_breaker()
+    assert 59 < breaker.retry_in() <= 60
+    cool_down(breaker)
+    assert breaker.retry_in() == 0
+    assert CircuitBreaker().retry_in() == 0
@@ -0,0 +1,92 @@
+import asyncio
+import datetime
+import json
+
+from daemon_api import ApiServer, Metrics, next_run_time, parse_times
+
+NOW = datetime.datetime(2026, 10, 19, 12, 0)
+
+
+def test_parse_times_sorts_clock_times():
+    assert parse_times("18:30, 6") == [datetime.time(6, 0), datetime.time(18, 30)]
+    assert parse_times("") == []
+
+
+def test_next_run_picks_the_earliest_candidate():
+    every = datetime.timedelta(hours=3)
+    times = parse_times("06:00,13:00")
+
+    assert next_run_time(NOW) is None
+    assert next_run_time(NOW, every, last_run=NOW) == NOW + every
+    assert next_run_time(NOW, every, times, last_run=NOW) == NOW.replace(hour=13)
+    # A clock time that already passed moves to tomorrow
+    assert next_run_time(NOW, times=parse_times("06:00")) == datetime.datetime(2026, 10, 20, 6, 0)
+
+
+def test_metrics_render_prometheus_text():
+    metrics = Metrics()
+    metrics.inc("runs_total", help_text="Sheet runs started")
+    metrics.inc("runs_total")
+    metrics.set("last_run_seconds", 1.5)
+
+    assert metrics.render().splitlines() == [
+        "# HELP scraper_runs_total Sheet runs started",
+        "# TYPE scraper_runs_total counter",
+        "scraper_runs_total 2",
+        "# TYPE scraper_last_run_seconds gauge",
+        "scraper_last_run_seconds 1.5",
+    ]
+
+
+async def request(port, line, token=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    auth = f"Authorization: Bearer {token}\r\n" if token else ""
+    writer.write(f"{line} HTTP/1.1\r\nHost: x\r\n{auth}\r\n".encode())
+    await writer.drain()
+    head, _, body = (await reader.read()).partition(b"\r\n\r\n")
+    writer.close()
+    return int(head.split()[1]), json.loads(body)
+
+
+def test_api_routes_and_bearer_token():
+    async def status(query, body):
+        return 200, {"running": False, "query": query}
+
+    async def run():
+        server = ApiServer({("GET", "/status"): status}, port=0, token="secret")
+        await server.start()
+        try:
+            return [
+                await request(server.port, "GET /status?x=1", "secret"),
+                await request(server.port, "GET /status", "wrong"),
+                await request(server.port, "POST /status", "secret"),
+                await request(server.port, "GET /nope", "secret"),
+            ]
+        finally:
+            await server.close()
+
+    ok, unauthorized, wrong_method, missing = asyncio.run(run())
+    assert ok == (200, {"running": False, "query": {"x": "1"}})
+    assert [unauthorized[0], wrong_method[0], missing[0]] == [401, 405, 404]
+
+
+def test_scrape_rejects_urls_that_are_not_a_list_of_strings(scraper, monkeypatch):
+    scraped = []
+
+    async def fake_scrape_one(url, selector):
+        scraped.append(url)
+        return {"url": url}
+
+    async def run(body):
+        daemon = scraper.ScraperDaemon(port=0)
+        monkeypatch.setattr(daemon, "_scrape_one", fake_scrape_one)
+        return await daemon.scrape({}, body)
+
+    assert asyncio.run(run({"urls": "https://shop.test/a"}))[0] == 400
+    assert asyncio.run(run({"urls": ["https://shop.test/a", 7]}))[0] == 400
+    assert asyncio.run(run({"url": ["https://shop.test/a"]}))[0] == 400
+    assert asyncio.run(run({"urls": ["https://shop.test/a", " "]})) == (
+        200,
+        {"results": [{"url": "https://shop.test/a"}]},
+    )
+    assert scraped == ["https://shop.test/a"]
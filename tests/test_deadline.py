@@ -0,0 +1,83 @@
+import asyncio
+import time
+
+import pytest
+
+from circuit_breaker import BreakerRegistry
+from retry_queue import RETRYABLE, classify_failure
+from strategy_memo import StrategyMemo
+
+URL = "https://shop.test/products/caster"
+
+
+class SlowPage:
+    """Playwright page whose navigation always runs into its timeout."""
+
+    def __init__(self, timeout_error):
+        self.timeout_error = timeout_error
+        self.timeouts = []
+
+    async def goto(self, url, timeout=None):
+        self.timeouts.append(timeout)
+        raise self.timeout_error(f"Timeout {timeout}ms exceeded.")
+
+    async def content(self):
+        return ""
+
+    async def title(self):
+        return ""
+
+    def is_closed(self):
+        return False
+
+
+@pytest.fixture
+def offline(scraper, monkeypatch):
+    monkeypatch.setattr(scraper, "STATIC_FIRST", False)
+    monkeypatch.setattr(scraper, "ARCHIVE", None)
+    monkeypatch.setattr(scraper, "STRATEGY_MEMO", StrategyMemo())
+    monkeypatch.setattr(scraper, "BREAKERS", BreakerRegistry())
+    monkeypatch.setattr(
+        scraper, "node_fallback_price", lambda url, deadline=None: "node-error: node not found"
+    )
+    return scraper
+
+
+def test_child_deadline_never_outlives_its_parent(scraper):
+    parent = scraper.Deadline(1)
+    assert parent.child(60).expires == parent.expires
+    assert parent.child(0.5).expires < parent.expires
+    assert scraper.NO_DEADLINE.child(5).expires is not None
+    assert scraper.NO_DEADLINE.child().remaining() is None
+
+
+def test_timeouts_are_capped_but_never_zero(scraper):
+    deadline = scraper.Deadline(0.01)
+    time.sleep(0.02)
+
+    assert deadline.expired()
+    assert deadline.timeout(30) == 0.001
+    assert deadline.timeout_ms(30000) == 1  # 0 means "no timeout" to Playwright
+    with pytest.raises(scraper.DeadlineExceeded):
+        deadline.check()
+    assert scraper.NO_DEADLINE.timeout(30) == 30
+
+
+def test_playwright_timeout_at_the_row_budget_maps_to_deadline(offline):
+    page = SlowPage(offline.PlaywrightTimeoutError)
+    deadline = offline.Deadline(0.05)
+
+    async def run():
+        await asyncio.sleep(0.06)
+        return await offline.fetch_price_from_page(page, URL, deadline=deadline)
+
+    result, status, _, method = asyncio.run(run())
+
+    assert (result, method) == ("Timeout: row time budget exhausted", "deadline")
+    assert all(timeout == 1 for timeout in page.timeouts)
+    assert classify_failure(status, method, result) == "deadline"
+    assert "deadline" not in RETRYABLE
+
+
+def test_run_budget_skips_are_not_retried():
+    assert classify_failure(None, "run-budget", "") == "deadline"
@@ -0,0 +1,55 @@
+import pytest
+
+import selenium_scrapy_grainger
+from selenium_scrapy_grainger import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def drivers(monkeypatch):
+    started = []
+
+    def new_driver(headless=True):
+        started.append(FakeDriver())
+        return started[-1]
+
+    monkeypatch.setattr(selenium_scrapy_grainger, "new_driver", new_driver)
+    return started
+
+
+def test_drivers_are_reused_then_recycled_after_max_pages(drivers):
+    pool = DriverPool(size=1, max_pages=2)
+    for _ in range(3):
+        with pool.driver(timeout=1):
+            pass
+
+    assert len(drivers) == 2
+    assert drivers[0].quit_called and not drivers[1].quit_called
+    pool.close()
+    assert drivers[1].quit_called
+
+
+def test_a_driver_that_raised_is_replaced(drivers):
+    pool = DriverPool(size=1, max_pages=0)
+    with pytest.raises(RuntimeError):
+        with pool.driver(timeout=1):
+            raise RuntimeError("chrome not reachable")
+    with pool.driver(timeout=1) as driver:
+        assert driver is drivers[1]
+
+    assert drivers[0].quit_called
+
+
+def test_busy_pool_times_out(drivers):
+    pool = DriverPool(size=1)
+    with pool.driver(timeout=1):
+        with pytest.raises(TimeoutError):
+            with pool.driver(timeout=0.1):
+                pass
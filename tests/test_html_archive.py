@@ -0,0 +1,84 @@
+import os
+
+from html_archive import HtmlArchive
+
+
+def page(n, size=20000):
+    # Hex noise compresses only about 2:1, so each object has a known weight
+    return f"<html><body><p>{n}</p>{os.urandom(size).hex()}</body></html>"
+
+
+def test_identical_pages_are_stored_once(tmp_path):
+    archive = HtmlArchive(str(tmp_path), codec="gzip")
+    html = page(1)
+
+    assert archive.put(html) == archive.put(html)
+    assert len(list(archive._objects())) == 1
+    assert archive.get(archive.put(html)) == html
+
+
+def test_least_recently_used_pages_are_evicted(tmp_path):
+    archive = HtmlArchive(str(tmp_path), max_bytes=100_000, codec="gzip")
+    digests = []
+    for n in range(4):
+        digests.append(archive.put(page(n)))
+        os.utime(archive._find(digests[-1]), (1000 + n, 1000 + n))
+    archive.get(digests[0])  # a read counts as a use
+
+    archive.put(page(4))
+
+    assert archive._scan_size() <= 100_000
+    assert archive.get(digests[0]) is not None
+    assert archive.get(digests[1]) is None
+
+
+def test_run_manifests_list_pages_newest_first(tmp_path):
+    archive = HtmlArchive(str(tmp_path), codec="gzip")
+    url = "https://shop.test/caster"
+    first = archive.begin_run()
+    archive.record_page(url, page(1), "static", 200)
+    archive.record_result(url, "$1.00", "static")
+    second = archive.begin_run()
+    digest = archive.record_page(url, page(2), "static", 200)
+    listing = archive.put(page(3))
+    archive.note_page(url, listing, "listing", page_url="https://shop.test/casters.html")
+    archive.record_result(url, "$2.00", "casterdepot-listing")
+    with open(archive._manifest(second), "a", encoding="utf-8") as fh:
+        fh.write('{"type": "page", "url": ')  # torn by an interrupted run
+
+    assert archive.runs() == sorted([first, second])
+    latest = archive.load_run()[url]
+    assert [p["digest"] for p in latest["pages"]] == [listing, digest]
+    assert latest["pages"][0]["page_url"] == "https://shop.test/casters.html"
+    assert latest["result"]["price"] == "$2.00"
+    assert archive.load_run(first)[url]["result"]["price"] == "$1.00"
+
+
+def test_reextract_treats_a_sheet_selector_as_authoritative(scraper, tmp_path):
+    archive = HtmlArchive(str(tmp_path), codec="gzip")
+    url = "https://shop.test/caster"
+    html = "<html><body><span class='old'>Was $24.99</span></body></html>"
+    digest = archive.put(html)
+    pages = [{"digest": digest, "source": "static"}]
+
+    assert scraper.reextract_row((str(tmp_path), url, "span.now", pages)) == (None, None)
+    assert scraper.reextract_row((str(tmp_path), url, None, pages)) == ("$24.99", "reextract:static")
+
+
+def test_reextract_reads_only_the_rows_listing_tile(scraper, tmp_path):
+    archive = HtmlArchive(str(tmp_path), codec="gzip")
+    listing = (
+        '<html><body><ol><li class="product-item">'
+        '<a class="product-item-link" href="/first.html">First</a>'
+        '<div class="price-box"><span class="price">$10.00</span></div></li>'
+        '<li class="product-item"><a class="product-item-link" href="/second.html">Second</a>'
+        '<div class="price-box"><span class="price">$20.00</span></div></li></ol></body></html>'
+    )
+    page_url = "https://www.casterdepot.com/casters.html"
+    pages = [{"digest": archive.put(listing), "source": "listing", "page_url": page_url}]
+
+    price, method = scraper.reextract_row(
+        (str(tmp_path), "https://www.casterdepot.com/second.html", None, pages)
+    )
+
+    assert (price, method) == ("$20.00", "reextract:listing")
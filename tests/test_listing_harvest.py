@@ -0,0 +1,71 @@
+import asyncio
+
+from html_archive import HtmlArchive
+from listing_harvest import harvest_listing_page, listing_judge, VENDORS
+
+LISTING_URL = "https://www.casterdepot.com/casters.html"
+
+
+def tile(slug, price_box="", text=""):
+    return (
+        f'<li class="product-item"><a class="product-item-link" href="/{slug}.html">{slug}</a>'
+        f"{price_box}<p>{text}</p></li>"
+    )
+
+
+def price_box(amount):
+    return f'<div class="price-box"><span class="price">${amount}</span></div>'
+
+
+LISTING = (
+    '<html><body><ol class="products">'
+    + tile("priced-caster", price_box("42.10"), "Save $5.00 today")
+    + tile("promo-caster", text="Was $30.00 Save $8.00")
+    + "</ol></body></html>"
+)
+PRODUCT_URL = "casterdepot.com/priced-caster.html"
+
+
+def test_tiles_without_structured_price_are_skipped(scraper):
+    tile_price = lambda html: scraper.caster_depot_price_from_html(html, fuzzy=False)
+
+    found = harvest_listing_page(LISTING, LISTING_URL, VENDORS["casterdepot.com"], tile_price)
+
+    assert found == {PRODUCT_URL: "$42.10"}
+
+
+def test_listing_judge_accepts_priced_tiles_only(scraper):
+    judge = listing_judge(
+        "casterdepot.com", lambda html: scraper.caster_depot_price_from_html(html, fuzzy=False)
+    )
+
+    assert judge(LISTING)
+    assert not judge("<html><body><p>Loading products... $0.00</p></body></html>")
+
+
+def test_service_fetch_of_a_parsed_listing_is_not_rendered(scraper, monkeypatch, tmp_path):
+    archive = HtmlArchive(str(tmp_path), codec="gzip")
+    monkeypatch.setattr(scraper, "ARCHIVE", archive)
+    monkeypatch.setattr(scraper, "HARVEST_LISTINGS_FILE", "listings.json")
+    monkeypatch.setattr(
+        scraper, "load_listings", lambda path: {"casterdepot.com": {"urls": [LISTING_URL], "max_pages": 1}}
+    )
+    monkeypatch.setattr(scraper, "fetch_static_html", lambda url, deadline=None: (403, None))
+    judged = []
+
+    def fake_services(url, deadline=None, extractor=None):
+        # The real function renders when ``extractor`` finds nothing in a plain fetch
+        judged.append(bool(extractor(LISTING)))
+        return LISTING
+
+    monkeypatch.setattr(scraper, "fetch_with_scraping_services", fake_services)
+    rows = [["Caster Depot", "https://www.casterdepot.com/priced-caster.html", "", ""]]
+
+    bulk = asyncio.run(scraper.harvest_listing_prices(rows))
+
+    assert judged == [True]
+    assert bulk == {rows[0][1]: ("$42.10", "casterdepot-listing")}
+    # The listing is archived under the row so --reextract can price it again
+    [entry] = archive.load_run()[rows[0][1]]["pages"]
+    assert (entry["source"], entry["page_url"]) == ("listing", LISTING_URL)
+    assert scraper.reextract_row((archive.root, rows[0][1], None, [entry]))[0] == "$42.10"
@@ -0,0 +1,212 @@
+import asyncio
+
+import pytest
+
+import page_artifacts
+from circuit_breaker import BreakerRegistry
+from page_artifacts import PageArtifacts
+from strategy_memo import StrategyMemo
+
+URL = "https://shop.test/products/caster"
+PAGE = (
+    "<html><head><title>Caster</title>"
+    '<script type="application/ld+json">'
+    '{"@type": "Product", "offers": {"price": "19.45", "priceCurrency": "USD"}}</script>'
+    '<script>var x = 1;</script></head>'
+    '<body><span class="was">$24.99</span><span class="now">$21.00</span></body></html>'
+)
+BLOCK_PAGE = "<html><head><title>Just a moment...</title></head><body>cf-browser-verification</body></html>"
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Count the BeautifulSoup parses and JSON decodes PageArtifacts makes."""
+    counts = {"soup": 0, "json": 0}
+    real_soup, real_loads = page_artifacts.BeautifulSoup, page_artifacts.json.loads
+
+    def soup(*args, **kwargs):
+        counts["soup"] += 1
+        return real_soup(*args, **kwargs)
+
+    def loads(*args, **kwargs):
+        counts["json"] += 1
+        return real_loads(*args, **kwargs)
+
+    monkeypatch.setattr(page_artifacts, "BeautifulSoup", soup)
+    monkeypatch.setattr(page_artifacts.json, "loads", loads)
+    return counts
+
+
+class Response:
+    def __init__(self, status=200):
+        self.status = status
+        self.headers = {"content-type": "text/html"}
+
+
+class Element:
+    def __init__(self, text):
+        self.text = text
+
+    async def inner_text(self):
+        return self.text
+
+    async def get_attribute(self, name):
+        return None
+
+    async def evaluate(self, script):
+        return "span.now"
+
+
+class FakePage:
+    """Playwright page serving ``html``; ``elements`` maps selectors to text."""
+
+    def __init__(self, html=PAGE, elements=None, status=200, title="Caster", delay=0.0):
+        self.html = html
+        self.elements = elements or {}
+        self.status = status
+        self._title = title
+        self.delay = delay
+        self.serialized = 0
+
+    async def goto(self, url, timeout=None):
+        return Response(self.status)
+
+    async def title(self):
+        return self._title
+
+    async def content(self):
+        self.serialized += 1
+        await asyncio.sleep(self.delay)
+        return self.html
+
+    async def wait_for_timeout(self, ms):
+        await asyncio.sleep(ms / 1000)
+
+    async def wait_for_selector(self, selector, **kwargs):
+        if selector not in self.elements:
+            raise TimeoutError(selector)
+        return Element(self.elements[selector])
+
+    async def query_selector(self, selector):
+        text = self.elements.get(selector)
+        return Element(text) if text is not None else None
+
+    async def query_selector_all(self, selector):
+        text = self.elements.get(selector)
+        return [Element(text)] if text is not None else []
+
+    def is_closed(self):
+        return False
+
+
+@pytest.fixture
+def offline(scraper, monkeypatch):
+    monkeypatch.setattr(scraper, "STATIC_FIRST", False)
+    monkeypatch.setattr(scraper, "ARCHIVE", None)
+    monkeypatch.setattr(scraper, "STRATEGY_MEMO", StrategyMemo())
+    monkeypatch.setattr(scraper, "BREAKERS", BreakerRegistry())
+    monkeypatch.setattr(
+        scraper, "node_fallback_price", lambda url, deadline=None: "node-error: node not found"
+    )
+    return scraper
+
+
+def test_views_are_built_once_and_only_when_used(parses):
+    doc = PageArtifacts(PAGE)
+    assert parses == {"soup": 0, "json": 0}
+
+    assert "$21.00" in doc.strings
+    assert doc.script_json[0]["offers"]["price"] == "19.45"
+    assert doc.script_json[1] is None  # not JSON-LD, so never decoded
+    for view in ("soup", "strings", "scripts", "script_json"):
+        getattr(doc, view)  # reused, not rebuilt
+
+    assert parses == {"soup": 1, "json": 1}
+    assert PageArtifacts.of(doc) is doc
+
+
+def test_extractor_chain_shares_one_parse(offline, parses):
+    doc = PageArtifacts(PAGE)
+
+    assert offline.embedded_price_scan(doc) == "$19.45"
+    assert offline.bs_price_scan(doc)
+    offline.msc_price_from_html(doc)
+
+    assert parses["soup"] == 1
+
+
+def test_live_page_is_not_serialized_until_loaded():
+    page = FakePage()
+    doc = PageArtifacts(page=page, response=Response())
+
+    assert not doc.loaded and doc.html == "" and doc.status == 200
+    asyncio.run(doc.load())
+    asyncio.run(doc.load())
+
+    assert doc.html == PAGE
+    assert page.serialized == 1
+
+
+@pytest.mark.parametrize(
+    "selector, elements, method",
+    [
+        ("span.now", {"span.now": "$21.00"}, "selector"),
+        (None, {'[class*="price"]': "$21.00"}, "semantic"),
+    ],
+)
+def test_selector_and_semantic_hits_never_touch_the_markup(offline, parses, selector, elements, method):
+    page = FakePage(elements=elements)
+    page.wait_for_timeout = lambda ms: asyncio.sleep(0)
+
+    result, status, _, found_by = asyncio.run(offline.fetch_price_from_page(page, URL, selector))
+
+    assert (result, status, found_by) == ("$21.00", 200, method)
+    assert page.serialized == 0
+    assert parses == {"soup": 0, "json": 0}
+
+
+def test_load_rendered_matches_the_eager_path(offline, monkeypatch):
+    archived = []
+    monkeypatch.setattr(offline, "archive_page", lambda *args: archived.append(args))
+    page = FakePage()
+    doc = PageArtifacts(page=page, response=Response())
+
+    asyncio.run(offline.load_rendered(URL, doc))
+
+    # What the tiers used to compute from ``html = await page.content()``
+    assert doc.html == PAGE
+    assert offline.script_price_scan(doc) == offline.script_price_scan(PAGE)
+    assert offline.bs_price_scan(doc) == offline.bs_price_scan(PAGE)
+    assert offline.extract_price(doc.html) == offline.extract_price(PAGE)
+    assert archived == [(URL, PAGE, "rendered", 200)]
+
+
+def test_failure_snippet_loads_the_page_it_needs(offline):
+    doc = PageArtifacts(page=FakePage(), response=Response())
+    assert asyncio.run(offline.failure_snippet(URL, doc)) == PAGE[:300]
+
+    stuck = PageArtifacts(page=FakePage(delay=1))
+    assert asyncio.run(offline.failure_snippet(URL, stuck, timeout=0.01)) == ""
+
+
+def test_deadline_row_reports_a_snippet(offline):
+    page = FakePage()
+    # Waits run until the row budget is gone (asyncio may wake a little early)
+    page.wait_for_timeout = lambda ms: asyncio.sleep(ms / 1000 + 0.05)
+    deadline = offline.Deadline(0.05)
+
+    result, _, snippet, method = asyncio.run(
+        offline.fetch_price_from_page(page, URL, deadline=deadline)
+    )
+
+    assert method == "deadline"
+    assert snippet == PAGE[:300]
+
+
+def test_blocked_row_reports_the_block_page(offline):
+    page = FakePage(BLOCK_PAGE, status=403, title="Just a moment...")
+
+    result, status, snippet, method = asyncio.run(offline.fetch_price_from_page(page, URL))
+
+    assert (method, status) == ("blocked:cloudflare", 403)
+    assert snippet == BLOCK_PAGE[:300]
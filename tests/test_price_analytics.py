@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+
+import price_analytics
+from price_analytics import analyze, build_report, history_from_values, parse_prices
+
+HEADER = ["Notes", "Vendor", "URL"] + [f"Price 2026-10-{day:02d} 06:00" for day in (1, 8, 15)]
+VALUES = [
+    HEADER,
+    ["", "Shop", "https://shop.test/steady", "$10.00", "$10.00", "$10.50"],
+    ["", "Shop", "https://shop.test/misread", "$12.00", "$12.00", "$1,200.00"],
+    ["", "Shop", "https://shop.test/doubled", "$10.00", "$10.00", "$20.00"],
+    ["", "Shop", "https://shop.test/lost", "$5.00", "$5.00", "No price found"],
+    ["", "Shop", "https://shop.test/new", "Blocked: cloudflare", "", "1.234,56 EUR"],
+]
+
+
+def test_parse_prices_needs_a_currency_marker():
+    cells = pd.DataFrame([["$1,234.56", "1.234,56 EUR", "Error: 404", None, "¥500"]])
+
+    parsed = parse_prices(cells).iloc[0].tolist()
+
+    assert parsed[:2] == [1234.56, 1234.56]
+    assert np.isnan(parsed[2]) and np.isnan(parsed[3])
+    assert parsed[4] == 500
+
+
+def test_parse_prices_reads_dollar_amounts():
+    cells = pd.DataFrame([["$7", "$1,234", "$1234.5", "$0.99", "$12,345,678.90", "Was $1,200.00"]])
+
+    assert parse_prices(cells).iloc[0].tolist() == [7, 1234, 1234.5, 0.99, 12345678.9, 1200]
+
+
+def test_dollar_amounts_group_thousands_with_commas():
+    cells = pd.DataFrame([["$12.345", "$1.234.567", "12.345 EUR"]])
+
+    parsed = parse_prices(cells).iloc[0].tolist()
+
+    assert np.isnan(parsed[0]) and np.isnan(parsed[1])
+    assert parsed[2] == 12345
+
+
+def test_only_unusual_cells_reach_the_regex(monkeypatch):
+    seen = []
+    real = price_analytics.parse_with_regex
+
+    def counting(text):
+        seen.extend(text)
+        return real(text)
+
+    monkeypatch.setattr(price_analytics, "parse_with_regex", counting)
+    values = np.random.default_rng(0).uniform(0, 100_000, (200, 50))
+    cells = pd.DataFrame([[f"${v:,.2f}" for v in row] for row in values])
+    cells.iloc[0, :3] = ["€5", "$12.345", "Error: 404"]
+
+    parsed = parse_prices(cells)
+
+    assert sorted(seen) == sorted(["€5", "$12.345", "Error: 404"])
+    assert np.allclose(parsed.iloc[1:], values[1:].round(2))
+
+
+def test_analyze_flags_a_small_matrix():
+    info, cells = history_from_values(VALUES)
+    stats = analyze(parse_prices(cells), window=2, jump=10, change=0.5)
+
+    assert info["row"].tolist() == [2, 3, 4, 5, 6]
+    assert stats["flags"].tolist() == ["", "jump,change", "change", "lost", "new"]
+    assert stats["ratio"].iloc[1] == 100
+    assert stats["pct_change"].iloc[2] == 1.0
+    assert stats["known_runs"].tolist() == [3, 3, 3, 2, 1]
+
+
+def test_history_outliers_count_earlier_jumps():
+    prices = pd.DataFrame([[10.0, 10.0, 1000.0, 10.0, 10.0]])
+
+    stats = analyze(prices, window=3, jump=10)
+
+    # Only the 1000 jumped; the median keeps the cells after it in line
+    assert stats["history_outliers"].iloc[0] == 1
+    assert stats["flags"].iloc[0] == ""
+
+
+def test_report_lists_jumps_first():
+    info, cells = history_from_values(VALUES)
+
+    summary, flagged = build_report(info, cells, window=2)
+
+    assert flagged["url"].iloc[0] == "https://shop.test/misread"
+    assert summary["flags"] == {"jump": 1, "change": 2, "lost": 1, "new": 1}
+    assert (summary["rows"], summary["runs"], summary["priced"]) == (5, 3, 4)
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ({"offers": {"price": 390.7}}, "390.70"),
+        ({"offers": {"price": 12.0}}, "12.00"),
+        ({"offers": [{"price": "19.45"}]}, "19.45"),
+        ({"price": 25}, "25"),
+    ],
+)
+def test_json_price_keeps_trailing_zero(scraper, data, expected):
+    assert scraper._json_price_search(data) == expected
+
+
+def test_json_ld_float_price_reads_whole(scraper):
+    html = (
+        '<script type="application/ld+json">'
+        + json.dumps({"@type": "Product", "offers": {"price": 390.7}})
+        + "</script>"
+    )
+    assert scraper.script_price_scan(html) == "$390.70"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("89.99", "$89.99"),
+        ("89.9", "$89.90"),
+        (1234.5, "$1,234.50"),
+        ("$89.99", "$89.99"),
+        ("89.99 USD", "89.99 USD"),
+        ("N/A", "N/A"),
+    ],
+)
+def test_with_currency(scraper, value, expected):
+    assert scraper.with_currency(value) == expected
+
+
+@pytest.mark.parametrize("wcs_price, expected", [("89.99", "$89.99"), ("89.9", "$89.90")])
+def test_northern_tool_bare_price_gets_currency(scraper, monkeypatch, wcs_price, expected):
+    async def price_from_page(page, url, json_fallback=True, timeout=None):
+        return wcs_price
+
+    monkeypatch.setattr(scraper, "nt_price_from_page", price_from_page)
+
+    result, _, _, method = asyncio.run(
+        scraper.fetch_price_from_page(None, "https://www.northerntool.com/products/caster-4863671")
+    )
+
+    assert (result, method) == (expected, "northerntool")
+    assert scraper.extract_price(result) == expected
+
+
+def test_northern_tool_json_price(scraper):
+    body = json.dumps({"EntitledPrice": [{"UnitPrice": [{"price": {"value": 89.9}}]}]})
+    assert scraper.northern_tool_price_from_json(body) == "$89.90"
@@ -0,0 +1,231 @@
+import asyncio
+import email.utils
+import json
+import time
+
+import pytest
+
+from circuit_breaker import HALF_OPEN, BreakerRegistry
+from provider_governor import DEFAULT_BACKOFF, ProviderGovernor, TokenBucket, parse_retry_after
+from render_policy import RenderStats
+from strategy_memo import StrategyMemo
+
+
+def test_parse_retry_after_seconds_and_http_date():
+    now = 1_800_000_000.0
+    date = email.utils.formatdate(now + 90, usegmt=True)
+
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(date, now=now) == 90
+    assert parse_retry_after(email.utils.formatdate(now - 5, usegmt=True), now=now) == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_429_rests_the_provider_for_its_retry_after():
+    governor = ProviderGovernor({"scraperapi": {"concurrency": 2}})
+    assert governor.acquire("scraperapi")
+
+    assert governor.release("scraperapi", 429, {"Retry-After": "30"}) == 30
+    assert not governor.acquire("scraperapi")
+    assert 29 < governor.delay("scraperapi") <= 30
+    assert governor.provider("scraperapi").credits == 0  # throttled calls are not billed
+
+
+def test_429_without_retry_after_backs_off_exponentially():
+    governor = ProviderGovernor()
+    assert governor.release("zyte", 429) == DEFAULT_BACKOFF
+    assert governor.release("zyte", 429) == DEFAULT_BACKOFF * 2
+    assert governor.release("zyte", 503) is None  # a 503 alone is the site, not a throttle
+    governor.release("zyte", 200)
+    assert governor.provider("zyte").backoff == DEFAULT_BACKOFF
+
+
+def test_budget_counts_billed_responses_only():
+    governor = ProviderGovernor({"apify": {"monthly_credits": 10}})
+    for status in (200, 500, None, 404):
+        assert governor.acquire("apify", cost=4)
+        governor.release("apify", status, cost=4)
+
+    assert governor.remaining("apify") == 2
+    assert not governor.acquire("apify", cost=4)
+    assert governor.delay("apify", cost=4) is None
+    assert not asyncio.run(governor.wait_for_capacity(["apify"], cost=4, timeout=5))
+
+
+def test_credits_persist_and_roll_over_each_month(tmp_path, monkeypatch):
+    path = tmp_path / "credits.json"
+    governor = ProviderGovernor({"zyte": {"monthly_credits": 100}}, str(path))
+    governor.acquire("zyte", cost=30)
+    governor.release("zyte", 200, cost=30)
+    governor.save()
+    assert json.loads(path.read_text())["used"] == {"zyte": 30.0}
+    assert ProviderGovernor({"zyte": {"monthly_credits": 100}}, str(path)).remaining("zyte") == 70
+
+    # A file from another month is ignored on load...
+    path.write_text(json.dumps({"month": "1999-12", "used": {"zyte": 100}}))
+    assert ProviderGovernor({"zyte": {"monthly_credits": 100}}, str(path)).remaining("zyte") == 100
+
+    # ...and a running daemon starts over when the month changes
+    monkeypatch.setattr(ProviderGovernor, "_current_month", staticmethod(lambda: "2999-01"))
+    assert governor.remaining("zyte") == 100
+    governor.save()
+    assert json.loads(path.read_text()) == {"month": "2999-01", "used": {}}
+
+
+def test_provider_short_of_the_projected_need_is_skipped_if_another_can_cover_it():
+    limits = {"scraperapi": {"monthly_credits": 30}, "zyte": {"monthly_credits": 1000}}
+    governor = ProviderGovernor(limits)
+    governor.begin_run(rows=12)
+    for _ in range(2):
+        assert governor.acquire("scraperapi", cost=5)
+        governor.release("scraperapi", 200, cost=5)
+        governor.row_done()
+
+    # 5 credits per row so far, 10 rows left: 50 needed, 20 left on scraperapi
+    assert governor.projected_need() == 50
+    assert not governor.acquire("scraperapi", cost=5, alternatives=["scraperapi", "zyte"])
+    assert governor.acquire("zyte", cost=5, alternatives=["scraperapi", "zyte"])
+    # With nowhere better to go, the provider is still used
+    assert governor.acquire("scraperapi", cost=5, alternatives=["scraperapi"])
+
+
+def test_acquire_never_waits_for_a_busy_provider():
+    governor = ProviderGovernor({"scrape.do": {"concurrency": 1}})
+    assert governor.acquire("scrape.do")
+
+    started = time.monotonic()
+    assert not governor.acquire("scrape.do")
+    assert time.monotonic() - started < 0.01
+
+    governor.release("scrape.do", 200)
+    assert governor.acquire("scrape.do")
+
+
+def test_waiting_for_a_slot_happens_on_the_event_loop():
+    governor = ProviderGovernor({"scrape.do": {"concurrency": 1}})
+    governor.acquire("scrape.do")
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.1, governor.release, "scrape.do", 200)
+        waited = asyncio.create_task(governor.wait_for_capacity(["scrape.do"], timeout=5))
+        await ticker()
+        return await waited
+
+    assert asyncio.run(run())
+    assert len(ticks) == 5  # the loop kept running while the row waited
+    assert governor.provider("scrape.do").waited >= 0.09
+
+    governor.acquire("scrape.do")
+    assert not asyncio.run(governor.wait_for_capacity(["scrape.do"], timeout=0.05))
+
+
+def test_token_bucket_reports_its_delay():
+    bucket = TokenBucket(rate=10, burst=1)
+    assert bucket.take()
+    assert not bucket.take()
+    assert 0.05 < bucket.delay() <= 0.1
+
+
+@pytest.fixture
+def proxied(scraper, monkeypatch):
+    monkeypatch.setattr(scraper, "SCRAPERAPI_KEY", "key")
+    for name in ("SCRAPINGBEE_KEY", "SCRAPEDO_KEY", "APIFY_TOKEN", "ZYTE_API_KEY"):
+        monkeypatch.setattr(scraper, name, None)
+    monkeypatch.setattr(scraper, "ARCHIVE", None)
+    monkeypatch.setattr(scraper, "PROXY_PLAIN_FIRST", False)
+    breakers = BreakerRegistry(min_calls=1, cooldown=0.01)
+    monkeypatch.setattr(scraper, "BREAKERS", breakers)
+    breakers.record("shop.test", "proxy:scraperapi", False)
+    time.sleep(0.02)  # the tier is half-open from here on
+    return scraper
+
+
+def test_provider_throttling_does_not_wedge_a_half_open_proxy_tier(proxied, monkeypatch):
+    class Throttled:
+        status_code = 429
+        headers = {"Retry-After": "0"}
+        text = ""
+
+    monkeypatch.setattr(proxied, "GOVERNOR", ProviderGovernor())
+    monkeypatch.setattr(proxied.requests, "get", lambda *args, **kwargs: Throttled())
+
+    assert proxied.fetch_with_scraping_services("https://shop.test/caster") is None
+
+    breaker = proxied.BREAKERS.get("shop.test", "proxy:scraperapi")
+    assert (breaker.state, breaker.probes_in_flight) == (HALF_OPEN, 0)
+    assert breaker.allow()
+
+
+def test_governor_refusal_does_not_take_the_probe(proxied, monkeypatch):
+    governor = ProviderGovernor({"scraperapi": {"monthly_credits": 0}})
+    monkeypatch.setattr(proxied, "GOVERNOR", governor)
+
+    assert proxied.fetch_with_scraping_services("https://shop.test/caster") is None
+
+    breaker = proxied.BREAKERS.get("shop.test", "proxy:scraperapi")
+    assert breaker.probes_in_flight == 0
+    assert breaker.allow()
+
+
+def test_waiting_checks_each_providers_own_cost():
+    governor = ProviderGovernor({"scraperapi": {"monthly_credits": 8}, "zyte": {"monthly_credits": 8}})
+
+    assert not asyncio.run(governor.wait_for_capacity(["scraperapi"], {"scraperapi": 10}, timeout=5))
+    assert asyncio.run(governor.wait_for_capacity(["scraperapi", "zyte"], {"scraperapi": 10, "zyte": 5}))
+    assert not governor.wait_in_thread(["zyte"], {"zyte": 10}, timeout=5)
+
+
+@pytest.fixture
+def escalating(scraper, monkeypatch):
+    """ScraperAPI alone, plain first, answering plain with a shell page."""
+    monkeypatch.setattr(scraper, "SCRAPERAPI_KEY", "key")
+    for name in ("SCRAPINGBEE_KEY", "SCRAPEDO_KEY", "APIFY_TOKEN", "ZYTE_API_KEY"):
+        monkeypatch.setattr(scraper, name, None)
+    monkeypatch.setattr(scraper, "ARCHIVE", None)
+    monkeypatch.setattr(scraper, "PROXY_PLAIN_FIRST", True)
+    monkeypatch.setattr(scraper, "STRATEGY_MEMO", StrategyMemo())
+    monkeypatch.setattr(scraper, "BREAKERS", BreakerRegistry())
+    monkeypatch.setattr(scraper, "RENDER_STATS", RenderStats())
+
+    class Response:
+        status_code = 200
+        headers = {}
+
+        def __init__(self, url):
+            self.text = "rendered" if url.endswith("&render=true") else "shell"
+
+    monkeypatch.setattr(scraper.requests, "get", lambda url, **kwargs: Response(url))
+    return scraper
+
+
+def test_first_request_is_queued_at_its_real_cost(escalating):
+    fetch = escalating.fetch_with_scraping_services
+    url = "https://shop.test/caster"
+
+    assert escalating.provider_costs(fetch, url) == {"scraperapi": 1}
+    escalating.STRATEGY_MEMO.set_render_required(url, True)
+    assert escalating.provider_costs(fetch, url) == {"scraperapi": 10}
+    assert escalating.provider_costs(escalating.fetch_with_brightdata_browser, url) == {}
+
+
+def test_render_after_a_plain_miss_waits_for_the_provider(escalating, monkeypatch):
+    # One request per 50ms: the render right after the plain fetch has to queue
+    governor = ProviderGovernor({"scraperapi": {"rate": 20, "burst": 1}})
+    monkeypatch.setattr(escalating, "GOVERNOR", governor)
+
+    html = escalating.fetch_with_scraping_services(
+        "https://shop.test/caster", extractor=lambda html: html == "rendered"
+    )
+
+    assert html == "rendered"
+    provider = governor.provider("scraperapi")
+    assert (provider.requests, provider.skipped) == (2, 0)
+    assert provider.credits == 11
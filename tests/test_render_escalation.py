@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from circuit_breaker import BreakerRegistry
+from provider_governor import ProviderGovernor
+from render_policy import RenderStats
+from strategy_memo import StrategyMemo
+
+MENARDS = "https://www.menards.com/main/caster-p-1.htm"
+MSC = "https://www.mscdirect.com/product/details/1"
+# A shell page: the only amount on it is a banner, which only a text scan finds
+SHELL = "<html><body><div class='promo'>Free shipping on orders over $49.00</div></body></html>"
+RENDERED = "<html><body><div id='itemFinalPrice' data-final-price='24.99'></div></body></html>"
+JSON_LD = (
+    '<html><head><script type="application/ld+json">'
+    '{"@type": "Product", "offers": {"price": "19.99", "priceCurrency": "USD"}}'
+    "</script></head><body>Save $5.00</body></html>"
+)
+
+
+class Response:
+    status_code = 200
+    headers = {"content-type": "text/html"}
+
+    def __init__(self, text):
+        self.text = text
+
+
+@pytest.fixture
+def provider(scraper, monkeypatch):
+    """One mocked scraping service; returns the list of modes it was asked for."""
+    monkeypatch.setattr(scraper, "SCRAPERAPI_KEY", "key")
+    for name in ("SCRAPINGBEE_KEY", "SCRAPEDO_KEY", "APIFY_TOKEN", "ZYTE_API_KEY"):
+        monkeypatch.setattr(scraper, name, None)
+    monkeypatch.setattr(scraper, "PROXY_PLAIN_FIRST", True)
+    monkeypatch.setattr(scraper, "ARCHIVE", None)
+    monkeypatch.setattr(scraper, "STRATEGY_MEMO", StrategyMemo())
+    monkeypatch.setattr(scraper, "BREAKERS", BreakerRegistry())
+    monkeypatch.setattr(scraper, "GOVERNOR", ProviderGovernor())
+    monkeypatch.setattr(scraper, "RENDER_STATS", RenderStats())
+    requests = []
+    pages = {}
+
+    def fake_get(url, headers=None, timeout=None):
+        mode = "render" if url.endswith("&render=true") else "plain"
+        requests.append(mode)
+        return Response(pages[mode])
+
+    monkeypatch.setattr(scraper.requests, "get", fake_get)
+    return scraper, pages, requests
+
+
+async def no_browser(page, url, deadline):
+    raise AssertionError("the proxy tier should have priced the row")
+
+
+def scan(scraper, url, extractor):
+    return asyncio.run(
+        scraper.vendor_price_scan(
+            None,
+            url,
+            [("proxy", scraper.fetch_with_scraping_services, extractor)],
+            no_browser,
+        )
+    )
+
+
+def test_shell_page_escalates_to_render_and_uses_the_rendered_price(provider):
+    scraper, pages, requests = provider
+    pages.update(plain=SHELL, render=RENDERED)
+    # The fuzzy extractor alone would have settled for the banner amount
+    assert scraper.menards_price_from_html(SHELL) == "$49.00"
+
+    price, method, _ = scan(scraper, MENARDS, scraper.menards_price_from_html)
+
+    assert (price, method) == ("$24.99", "proxy")
+    assert requests == ["plain", "render"]
+    assert scraper.STRATEGY_MEMO.render_required(MENARDS, recheck_after=3600)
+    stats = scraper.RENDER_STATS.summary()
+    assert (stats["plain_hits"], stats["escalations"], stats["rendered"]) == (0, 1, 1)
+
+
+def test_render_required_domain_skips_the_plain_fetch(provider):
+    scraper, pages, requests = provider
+    pages.update(plain=SHELL, render=RENDERED)
+    scraper.STRATEGY_MEMO.set_render_required(MENARDS, True)
+
+    price, _, _ = scan(scraper, "https://www.menards.com/main/caster-p-2.htm",
+                       scraper.menards_price_from_html)
+
+    assert price == "$24.99"
+    assert requests == ["render"]
+
+
+def test_structured_price_on_the_plain_page_does_not_escalate(provider):
+    scraper, pages, requests = provider
+    pages.update(plain=JSON_LD, render=RENDERED)
+
+    price, method, _ = scan(scraper, MSC, scraper.msc_price_from_html)
+
+    assert (price, method) == ("$19.99", "proxy")
+    assert requests == ["plain"]
+    assert not scraper.STRATEGY_MEMO.render_required(MSC, recheck_after=3600)
+    stats = scraper.RENDER_STATS.summary()
+    assert (stats["plain_hits"], stats["escalations"], stats["rendered"]) == (1, 0, 0)
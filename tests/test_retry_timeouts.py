@@ -0,0 +1,140 @@
+import asyncio
+
+import pytest
+
+from circuit_breaker import BreakerRegistry
+from retry_queue import classify_failure
+from strategy_memo import StrategyMemo
+
+URL = "https://shop.test/products/caster"
+PRODUCT_PAGE = "<html><head><title>Caster</title></head><body><p>Now $12.34</p></body></html>"
+
+
+class FakeResponse:
+    status = 200
+    headers = {"content-type": "text/html"}
+
+
+class FakePage:
+    """Playwright page whose first ``timeouts`` navigations time out."""
+
+    def __init__(self, timeout_error, timeouts=1):
+        self.timeout_error = timeout_error
+        self.timeouts = timeouts
+        self.navigations = 0
+
+    async def goto(self, url, timeout=None):
+        self.navigations += 1
+        if self.navigations <= self.timeouts:
+            raise self.timeout_error(f"Timeout {timeout}ms exceeded.")
+        return FakeResponse()
+
+    async def title(self):
+        return "Caster"
+
+    async def content(self):
+        return PRODUCT_PAGE if self.navigations > self.timeouts else ""
+
+    async def wait_for_timeout(self, ms):
+        pass
+
+    async def query_selector_all(self, selector):
+        return []
+
+    def is_closed(self):
+        return False
+
+
+class FakeSession:
+    browser = None
+
+    def __init__(self, page):
+        self.page = page
+
+    async def ensure(self):
+        pass
+
+    async def take_pages(self, count):
+        return [self.page]
+
+    async def return_pages(self, pages):
+        pass
+
+
+@pytest.fixture
+def offline(scraper, monkeypatch):
+    """Keep every tier but the browser quiet and the run state in memory."""
+    monkeypatch.setattr(scraper, "STATIC_FIRST", False)
+    monkeypatch.setattr(scraper, "ARCHIVE", None)
+    monkeypatch.setattr(scraper, "HARVEST_LISTINGS_FILE", "")
+    monkeypatch.setattr(scraper, "STRATEGY_MEMO", StrategyMemo())
+    monkeypatch.setattr(scraper, "BREAKERS", BreakerRegistry())
+    monkeypatch.setattr(scraper.GOVERNOR, "path", None)
+    monkeypatch.setattr(scraper, "RETRY_BASE_DELAY", 0.01)
+    monkeypatch.setattr(
+        scraper, "node_fallback_price", lambda url, deadline=None: "node-error: node not found"
+    )
+    return scraper
+
+
+def test_navigation_timeout_is_classified_as_timeout(offline):
+    page = FakePage(offline.PlaywrightTimeoutError, timeouts=1)
+
+    result, status, _, method = asyncio.run(offline.fetch_price_from_page(page, URL))
+
+    assert (result, method) == ("Timeout", "timeout")
+    assert classify_failure(status, method, result) == "timeout"
+
+
+def test_timed_out_row_is_retried(offline):
+    page = FakePage(offline.PlaywrightTimeoutError, timeouts=1)
+    records = []
+
+    asyncio.run(
+        offline.scrape_all(
+            [["Shop", URL, "", ""]],
+            concurrency=1,
+            row_budget=0,
+            run_budget=0,
+            on_result=records.append,
+            session=FakeSession(page),
+        )
+    )
+
+    assert page.navigations == 2
+    assert [(r["price"], r["method"], r["attempts"]) for r in records] == [("$12.34", "fuzzy", 2)]
+
+
+def test_node_fallback_price_still_wins(offline, monkeypatch):
+    monkeypatch.setattr(offline, "node_fallback_price", lambda url, deadline=None: "$9.99")
+    page = FakePage(offline.PlaywrightTimeoutError, timeouts=1)
+
+    result, _, _, method = asyncio.run(offline.fetch_price_from_page(page, URL))
+
+    assert (result, method) == ("$9.99", "node-fallback")
+
+
+def test_open_browser_breaker_fails_the_row_once_without_blocking(offline, monkeypatch):
+    breakers = BreakerRegistry(min_calls=1, cooldown=60)
+    breakers.record("shop.test", "browser", False)
+    monkeypatch.setattr(offline, "BREAKERS", breakers)
+    monkeypatch.setitem(offline.BROWSER_BLOCKS, "shop.test", "cloudflare")
+    page = FakePage(offline.PlaywrightTimeoutError, timeouts=0)
+    records = []
+
+    asyncio.run(
+        offline.scrape_all(
+            [["Shop", URL, "", ""]],
+            concurrency=1,
+            row_budget=0,
+            run_budget=0,
+            on_result=records.append,
+            session=FakeSession(page),
+        )
+    )
+
+    assert page.navigations == 0
+    [record] = records
+    assert (record["method"], record["attempts"]) == ("circuit-open", 1)
+    assert "after cloudflare blocks" in record["error"]
+    assert classify_failure(None, "circuit-open", record["error"]) == "circuit-open"
@@ -0,0 +1,76 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import scrapy_engine
+from html_archive import HtmlArchive
+
+
+class PriceStub(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/caster":
+            self.send_error(404)
+            return
+        body = b"  $12.34  "
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), PriceStub)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+
+
+def test_crawl_runs_in_a_spawned_child(server, monkeypatch):
+    contexts = []
+    get_context = scrapy_engine.multiprocessing.get_context
+    monkeypatch.setattr(
+        scrapy_engine.multiprocessing,
+        "get_context",
+        lambda method=None: contexts.append(method) or get_context(method),
+    )
+    jobs = [
+        {"idx": idx, "url": url, "fetch_url": url, "parse": str.strip, "method": "static-scrapy"}
+        for idx, url in enumerate((f"{server}/caster", f"{server}/gone"))
+    ]
+
+    results = scrapy_engine.crawl(jobs, {"RETRY_ENABLED": False})
+
+    assert contexts == ["spawn"]
+    assert results[0] == ("$12.34", 200, None, "static-scrapy")
+    assert results[1][:2] == ("HTTP 404", 404)
+
+
+def test_http_cache_is_off_by_default(scraper):
+    assert scrapy_engine.DEFAULT_SETTINGS["HTTPCACHE_ENABLED"] is False
+    assert scraper.scrapy_settings()["HTTPCACHE_ENABLED"] is False
+
+
+def test_html_pages_are_added_to_the_archive_run(server, tmp_path):
+    archive = HtmlArchive(str(tmp_path), codec="gzip")
+    run_id = archive.begin_run()
+    url = f"{server}/caster"
+    jobs = [
+        {"idx": 0, "url": url, "fetch_url": url, "parse": str.strip, "method": "static-scrapy", "html": True}
+    ]
+
+    scrapy_engine.crawl(
+        jobs,
+        {"RETRY_ENABLED": False},
+        {"root": archive.root, "max_bytes": archive.max_bytes, "codec": "gzip", "run_id": run_id},
+    )
+
+    [entry] = archive.load_run(run_id)[url]["pages"]
+    assert (entry["source"], entry["status"]) == ("scrapy", 200)
+    assert archive.get(entry["digest"]) == "  $12.34  "
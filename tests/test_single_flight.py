@@ -0,0 +1,118 @@
+import asyncio
+
+import pytest
+
+from circuit_breaker import BreakerRegistry
+from strategy_memo import StrategyMemo
+from url_canon import canonical_url, product_key
+
+
+@pytest.mark.parametrize(
+    "a, b",
+    [
+        (
+            "http://www.shop.test//casters/4-in/?utm_source=mail&color=red&size=4#reviews",
+            "https://shop.test/casters/4-in?size=4&color=red&gclid=abc",
+        ),
+        (
+            "https://www.northerntool.com/shop/tools/product_7166221",
+            "https://www.northerntool.com/products/swivel-caster-7166221?cm_mmc=x",
+        ),
+        (
+            "https://www.harborfreight.com/4-in-swivel-caster-61792.html",
+            "https://www.harborfreight.com/casters/4-inch-caster-61792.html?cmpid=x",
+        ),
+    ],
+)
+def test_same_product_urls_share_a_key(a, b):
+    assert product_key(a) == product_key(b)
+
+
+def test_path_case_and_real_parameters_still_differ():
+    assert canonical_url("https://shop.test/Caster") != canonical_url("https://shop.test/caster")
+    assert product_key("https://shop.test/c?size=4") != product_key("https://shop.test/c?size=5")
+
+
+class FakeSession:
+    browser = None
+
+    async def ensure(self):
+        pass
+
+    async def take_pages(self, count):
+        return [object() for _ in range(count)]
+
+    async def return_pages(self, pages):
+        pass
+
+
+@pytest.fixture
+def offline(scraper, monkeypatch):
+    monkeypatch.setattr(scraper, "ARCHIVE", None)
+    monkeypatch.setattr(scraper, "HARVEST_LISTINGS_FILE", "")
+    monkeypatch.setattr(scraper, "STRATEGY_MEMO", StrategyMemo())
+    monkeypatch.setattr(scraper, "BREAKERS", BreakerRegistry())
+    monkeypatch.setattr(scraper.GOVERNOR, "path", None)
+    return scraper
+
+
+def run_rows(scraper, rows, concurrency):
+    records = []
+    asyncio.run(
+        scraper.scrape_all(
+            rows,
+            concurrency=concurrency,
+            row_budget=0,
+            run_budget=0,
+            on_result=records.append,
+            session=FakeSession(),
+        )
+    )
+    return sorted(records, key=lambda r: r["row"])
+
+
+def test_identical_products_are_fetched_once(offline, monkeypatch):
+    fetched = []
+
+    async def fake_fetch(page, url, selector=None, force_selector_only=False,
+                         force_node_fallback=False, deadline=None):
+        fetched.append(url)
+        await asyncio.sleep(0.01)
+        return "$12.34", 200, "<html>snippet</html>", "fuzzy"
+
+    monkeypatch.setattr(offline, "fetch_price_from_page", fake_fetch)
+    rows = [
+        ["Shop", "https://shop.test/caster?utm_source=a", "", ""],
+        ["Shop", "https://www.shop.test/caster/", "", ""],
+        ["Shop", "https://shop.test/caster", "span.price", ""],
+        ["Shop", "https://shop.test/wheel", "", ""],
+    ]
+
+    records = run_rows(offline, rows, concurrency=1)
+
+    # The selector is part of the key, so only row 1 shares row 0's fetch
+    assert len(fetched) == 3
+    assert [r["price"] for r in records] == ["$12.34"] * 4
+
+
+def test_late_duplicates_get_the_outcome_without_the_snippet(offline, monkeypatch):
+    fetched = []
+
+    async def fake_fetch(page, url, selector=None, force_selector_only=False,
+                         force_node_fallback=False, deadline=None):
+        fetched.append(url)
+        return "No price found", 200, "<html>big snippet</html>", "fuzzy"
+
+    monkeypatch.setattr(offline, "fetch_price_from_page", fake_fetch)
+    monkeypatch.setattr(offline, "RETRY_ATTEMPTS", 0)
+    url = "https://shop.test/caster"
+    # The first row finishes before the last one starts, on a single page
+    rows = [["Shop", url, "", ""], ["Shop", "https://shop.test/other", "", ""], ["Shop", url, "", ""]]
+
+    records = run_rows(offline, rows, concurrency=1)
+
+    assert fetched.count(url) == 1
+    leader, _, late = records
+    assert leader["snippet"] and leader["error"]
+    assert (late["price"], late["status"], late["error"]) == (leader["price"], 200, leader["error"])
+    assert late["snippet"] is None
@@ -0,0 +1,18 @@
+PAGE = (
+    '<html><head><meta property="product:price:amount" content="19.45"></head>'
+    '<body><span class="was">$24.99</span><span class="now">$21.00</span></body></html>'
+)
+
+
+def test_sheet_selector_is_authoritative(scraper):
+    assert scraper.static_price_from_html(PAGE, "span.now") == "$21.00"
+    # A selector miss means no price, not the next best amount on the page
+    assert scraper.static_price_from_html(PAGE, "span.sale") is None
+
+
+def test_structured_price_without_selector(scraper):
+    assert scraper.static_price_from_html(PAGE) == "$19.45"
+
+
+def test_plain_text_price_is_not_taken_without_structure(scraper):
+    assert scraper.static_price_from_html("<html><body><p>Now $12.34</p></body></html>") is None
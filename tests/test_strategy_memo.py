@@ -0,0 +1,60 @@
+from strategy_memo import StrategyMemo, memo_domain
+
+URL = "https://www.shop.test/products/caster-1"
+SIBLING = "https://shop.test/products/caster-2"
+
+
+def test_url_entry_wins_over_domain_entry():
+    memo = StrategyMemo()
+    memo.remember(URL, "semantic", "span.price-now")
+    memo.remember(SIBLING, "json-ld")
+
+    # The domain entry now holds the sibling's method; URL keeps its own
+    assert memo.lookup(URL)["method"] == "semantic"
+    assert memo.lookup(URL)["selector"] == "span.price-now"
+    assert memo.lookup("https://shop.test/products/caster-3")["method"] == "json-ld"
+
+
+def test_unseen_product_borrows_the_domain_selector():
+    memo = StrategyMemo()
+    memo.stage_selector(URL, "span.price-now")
+    memo.remember(URL, "semantic")
+
+    entry = memo.lookup(SIBLING)
+    assert (entry["method"], entry["selector"]) == ("semantic", "span.price-now")
+    assert memo.lookup("https://other.test/p") == {}
+
+
+def test_slow_methods_are_not_lent_to_other_products():
+    memo = StrategyMemo()
+    memo.remember(SIBLING, "json-ld")
+    memo.remember(URL, "node-fallback")
+
+    assert memo.lookup(URL)["method"] == "node-fallback"
+    assert memo.lookup("https://shop.test/products/caster-3")["method"] == "json-ld"
+
+    # A domain entry from an older memo file is ignored too
+    memo.domains[memo_domain(URL)]["method"] = "node-fallback"
+    assert memo.lookup("https://shop.test/products/caster-3") == {}
+
+
+def test_changing_method_drops_the_stale_selector():
+    memo = StrategyMemo()
+    memo.remember(URL, "semantic", "span.price-now")
+    memo.remember(URL, "json-ld")
+
+    assert "selector" not in memo.lookup(URL)
+    assert memo.lookup(URL)["hits"] == 2
+
+
+def test_round_trips_through_the_file(tmp_path):
+    path = tmp_path / "memo.json"
+    memo = StrategyMemo(str(path))
+    memo.remember(URL, "semantic", "span.price-now")
+    memo.set_render_required(URL, True)
+    memo.save()
+
+    loaded = StrategyMemo(str(path))
+    assert loaded.lookup(URL)["selector"] == "span.price-now"
+    assert loaded.render_required(SIBLING, recheck_after=3600)
+    assert not loaded.render_required(SIBLING, recheck_after=-1)
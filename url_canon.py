@@ -0,0 +1,80 @@
+import re
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from caster_city_scraper import product_key as caster_city_product_key
+from harbor_freight_scraper import product_id_from_url
+from northern_tool_scraper import extract_part_number
+
+# Query parameters that only track the visit and never change the product
+TRACKING_PARAMS = {
+    "_ga",
+    "_gl",
+    "cm_mmc",
+    "cmpid",
+    "dclid",
+    "fbclid",
+    "gbraid",
+    "gclid",
+    "gclsrc",
+    "igshid",
+    "mc_cid",
+    "mc_eid",
+    "msclkid",
+    "ref",
+    "ref_",
+    "srsltid",
+    "wbraid",
+    "yclid",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_", "trk_")
+
+
+def is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonical_url(url: str) -> str:
+    """Normalize ``url`` so trivially different links compare equal.
+
+    The scheme becomes https, the host is lowercased without ``www.`` or a
+    default port, duplicate and trailing slashes are dropped, tracking
+    parameters are removed and the remaining query is sorted. The fragment
+    is discarded; path case is kept since some shops treat it as significant.
+    """
+    parsed = urlparse(url.strip())
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+    path = re.sub(r"/{2,}", "/", parsed.path).rstrip("/") or "/"
+    query = sorted(
+        (k, v)
+        for k, v in parse_qsl(parsed.query, keep_blank_values=True)
+        if not is_tracking_param(k)
+    )
+    return urlunparse(("https", host, path, "", urlencode(query), ""))
+
+
+def product_key(url: str) -> str:
+    """Return a key shared by every URL that points at the same product.
+
+    Vendors with a known product ID in the URL are keyed by that ID, so
+    different slugs for one Northern Tool part or Harbor Freight item match;
+    everything else falls back to :func:`canonical_url`.
+    """
+    host = (urlparse(url.strip()).hostname or "").lower()
+    if host.endswith("northerntool.com"):
+        part = extract_part_number(url)
+        if part:
+            return f"northerntool:{part}"
+    if host.endswith("harborfreight.com"):
+        product_id = product_id_from_url(url)
+        if product_id:
+            return f"harborfreight:{product_id}"
+    if host.endswith("castercity.com"):
+        slug = caster_city_product_key(url)
+        if slug:
+            return f"castercity:{slug}"
+    return canonical_url(url)